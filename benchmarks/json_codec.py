@@ -0,0 +1,83 @@
+"""Micro-benchmark of decoding the getMarketBook, getOrders, getPayments, getPrices and nodes responses and encoding
+request bodies
+
+The responses are the fixtures the client tests use, as they are and with their lists repeated to 1000 items.
+Compares the path the clients used before the JSON codecs, decoding the response bytes to a str and then parsing it
+with the standard library json module, with each installed JSONCodec. The default json codec keeps the old path, since
+letting json.loads detect the encoding of the bytes was slower; orjson is opt-in with pip install buycoins_sdk[fast].
+Run it with:
+
+    $ python -m benchmarks.json_codec
+"""
+
+import copy
+import json
+import timeit
+from buycoins_sdk.client import codecs
+from buycoins_sdk.tests.client import fixtures
+
+NUMBER = 50
+PAGE_SIZE = 1000
+RESPONSES = (
+    ('getMarketBook', fixtures.get_market_book_success, ('getMarketBook', 'orders', 'edges')),
+    ('getOrders', fixtures.get_orders_success, None),
+    ('getPayments', fixtures.get_payments_success, ('getPayments', 'edges')),
+    ('getPrices', fixtures.get_prices_success, ('getPrices',)),
+    ('nodes', fixtures.nodes_success, ('nodes',))
+)
+
+
+def page(response: dict, path: tuple, size: int) -> dict:
+    """Returns a copy of a response with the list at path in its data repeated to size items
+
+    """
+    response = copy.deepcopy(response)
+    parent = response['data']
+    for field in path[:-1]:
+        parent = parent[field]
+    items = parent[path[-1]]
+    parent[path[-1]] = [items[i % len(items)] for i in range(size)]
+    return response
+
+
+def payloads():
+    for label, response, path in RESPONSES:
+        yield label, json.dumps(response).encode()
+        if path is not None:
+            yield f"{label} x{PAGE_SIZE}", json.dumps(page(response, path, PAGE_SIZE)).encode()
+
+
+def installed_codecs():
+    for name in ('json', 'orjson', 'ujson'):
+        try:
+            yield codecs.get_codec(name)
+        except Exception:
+            continue
+
+
+def best(function, number: int) -> float:
+    return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+
+def main():
+    for label, payload in payloads():
+        number = NUMBER if len(payload) > 10000 else NUMBER * 200
+        print(f"{label} response, {len(payload) / 1024:.1f} KiB")
+        baseline = best(lambda: json.loads(payload.decode()), number)
+        print(f"  str + json.loads:  {baseline * 1e6:10.2f} us")
+        for codec in installed_codecs():
+            took = best(lambda: codec.loads(payload), number)
+            print(f"  {codec.name + ' codec:':18} {took * 1e6:10.2f} us ({baseline / took:.2f}x)")
+
+    request_body = {'query': 'query getPayments($first:Int){getPayments(first:$first){edges{node{id}}}}',
+                    'variables': {'first': PAGE_SIZE}}
+    baseline = best(lambda: json.dumps(request_body).encode(), NUMBER * 200)
+    print("request body encoding")
+    print(f"  json.dumps:        {baseline * 1e6:10.2f} us")
+    for codec in installed_codecs():
+        took = best(lambda: codec.dumps(request_body), NUMBER * 200)
+        print(f"  {codec.name + ' codec:':18} {took * 1e6:10.2f} us ({baseline / took:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
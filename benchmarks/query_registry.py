@@ -0,0 +1,53 @@
+"""Micro-benchmark of building the getMarketBook, getOrders, getPayments and nodes queries
+
+Compares building the query string and variables on every call, as BuycoinsGraphqlClient did before the query registry,
+with looking the query up in the registry and only building the variables. Run it with:
+
+    $ python -m benchmarks.query_registry
+"""
+
+import timeit
+from buycoins_sdk.client.queries import QueryRegistry, _prepare_graphql_args, _pagination_shape, \
+    _pagination_variables, _get_market_book_query, _get_orders_query, _get_payments_query, _nodes_query
+from buycoins_sdk.commons.enums import BuycoinsType
+
+NUMBER = 20000
+NODE_TYPES = (BuycoinsType.PAYMENT, BuycoinsType.ORDER, BuycoinsType.ONCHAIN_TRANSFER_REQUEST)
+
+
+def build_every_call():
+    _get_market_book_query(*_pagination_shape(first=50, after='MQ'))
+    _prepare_graphql_args({'cryptocurrency': 'bitcoin'}, first=50, after='MQ')
+    _get_orders_query(*_pagination_shape(first=50), True)
+    _prepare_graphql_args({'cryptocurrency': 'bitcoin', 'status': 'open', 'side': 'buy'}, first=50)
+    _get_payments_query(*_pagination_shape(first=100, after='MQ'))
+    _prepare_graphql_args({}, first=100, after='MQ')
+    _nodes_query(*NODE_TYPES)
+
+
+def use_registry(registry: QueryRegistry):
+    registry.get('getMarketBook', _get_market_book_query, *_pagination_shape(first=50, after='MQ'))
+    _pagination_variables({'cryptocurrency': 'bitcoin'}, first=50, after='MQ')
+    registry.get('getOrders', _get_orders_query, *_pagination_shape(first=50), True)
+    _pagination_variables({'cryptocurrency': 'bitcoin', 'status': 'open', 'side': 'buy'}, first=50)
+    registry.get('getPayments', _get_payments_query, *_pagination_shape(first=100, after='MQ'))
+    _pagination_variables({}, first=100, after='MQ')
+    registry.get('nodes', _nodes_query, *NODE_TYPES)
+
+
+def main():
+    registry = QueryRegistry()
+    before = min(timeit.repeat(build_every_call, number=NUMBER, repeat=5)) / NUMBER
+    after = min(timeit.repeat(lambda: use_registry(registry), number=NUMBER, repeat=5)) / NUMBER
+
+    raw = len(_get_market_book_query(True, False, True, False))
+    minified = len(registry.get('getMarketBook', _get_market_book_query, True, False, True, False))
+
+    print(f"build every call: {before * 1e6:8.2f} us per 4 queries")
+    print(f"query registry:   {after * 1e6:8.2f} us per 4 queries")
+    print(f"saved:            {(before - after) * 1e6:8.2f} us per 4 queries ({before / after:.1f}x faster)")
+    print(f"getMarketBook query size: {raw} bytes -> {minified} bytes minified")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,3 @@
 from .commons import utils, errors, enums
-from .core import types, BuycoinsSDK
-from .client import BuycoinsGraphqlClient
+from .core import types, BuycoinsSDK, AsyncBuycoinsSDK
+from .client import BuycoinsGraphqlClient, AsyncBuycoinsGraphqlClient
@@ -1 +1,10 @@
 from .client import BuycoinsGraphqlClient, _prepare_graphql_args, _wrap_graphql_call
+from .async_client import AsyncBuycoinsGraphqlClient
+from .batch import BatchGraphqlClient, BatchResult
+from .breaker import CircuitBreaker
+from .cache import CacheBackend, MemoryCacheBackend, ResponseCache
+from .codecs import JSONCodec
+from .ratelimit import FileTokenBucket, RateLimiter, TokenBucket
+from .retry import RetryBudget, RetryPolicy
+from .singleflight import SingleFlight
+from .transport import PooledGraphqlClient, AsyncPooledGraphqlClient
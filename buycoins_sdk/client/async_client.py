@@ -0,0 +1,169 @@
+"""
+This module contains and exports the AsyncBuycoinsGraphqlClient class, the asyncio version of BuycoinsGraphqlClient,
+and a helper function
+"""
+
+import base64
+from buycoins_sdk.client.codecs import JSONCodec
+from buycoins_sdk.client.client import BuycoinsGraphqlClient, _raise_for_graphql_errors
+from buycoins_sdk.client.breaker import CircuitBreaker
+from buycoins_sdk.client.cache import ResponseCache
+from buycoins_sdk.client.ratelimit import RateLimiter
+from buycoins_sdk.client.retry import RetryPolicy, _is_mutation
+from buycoins_sdk.client.singleflight import SingleFlight, _call_key
+from buycoins_sdk.client.transport import AsyncPooledGraphqlClient, DEFAULT_TIMEOUT
+from buycoins_sdk.commons import errors
+from typing import Any, Callable, Tuple, Union
+
+__all__ = [
+    'AsyncBuycoinsGraphqlClient',
+    '_wrap_graphql_call_async'
+]
+
+
+async def _wrap_graphql_call_async(client: AsyncPooledGraphqlClient, query: str, variables: dict,
+                                   **options: Any) -> Any:
+    """This function wraps asynchronous calls to the GraphQL API and raises the appropriate exceptions
+
+    Args:
+        client: The AsyncPooledGraphqlClient
+        query: The GraphQL query string
+        variables: The variables used within the GraphQL query
+        **options: per-call options passed to the client, such as timeout and retry
+
+    Returns:
+        The GraphQL response is returned
+
+    """
+    try:
+        data = await client.execute_async(query=query, variables=variables, **options)
+    except errors.BuycoinsException:
+        raise
+    except Exception as err:
+        raise errors.BuycoinsException(str(err))
+    else:
+        return _raise_for_graphql_errors(data, variables)
+
+
+class AsyncBuycoinsGraphqlClient(BuycoinsGraphqlClient):
+    """The AsyncBuycoinsGraphqlClient is the asyncio version of BuycoinsGraphqlClient.
+
+    It has every method of BuycoinsGraphqlClient, with the same arguments, but each method is a coroutine which has to
+    be awaited. Requests are made with aiohttp over a shared pool of keep-alive connections, so many calls can be in
+    flight at once on a single event loop.
+
+    Attributes:
+        client: An AsyncPooledGraphqlClient used to make queries and mutations directly.
+    """
+
+    def __init__(self, public_key: str, secret_key: str, limit: int = 100, limit_per_host: int = 0,
+                 keepalive_timeout: float = 15.0, persisted_queries: bool = False,
+                 json_codec: Union[str, JSONCodec] = 'json',
+                 timeout: Union[None, float, Tuple[float, float]] = DEFAULT_TIMEOUT, retry: RetryPolicy = None,
+                 rate_limiter: RateLimiter = None, circuit_breaker: CircuitBreaker = None,
+                 coalesce_reads: bool = False, cache: ResponseCache = None):
+        """Initialise an AsyncBuycoinsGraphqlClient
+
+        Args:
+            public_key: your BuyCoins public key as a string
+            secret_key: your BuyCoins secret key as a string
+            limit: the maximum number of simultaneous connections
+            limit_per_host: the maximum number of simultaneous connections to one host. 0 means no limit
+            keepalive_timeout: the number of seconds an idle connection is kept alive
+            persisted_queries: whether to send only the SHA-256 hash of each query once the server knows it
+                    (automatic persisted queries) instead of the full query text
+            json_codec: the JSON library used to encode requests and decode responses: a JSONCodec, or json,
+                    orjson, ujson or auto for the fastest one which is installed
+            timeout: the timeout of every request, in seconds or as a (connect, read) tuple. None means no timeout
+            retry: the RetryPolicy deciding which failed requests are retried. RetryPolicy(max_retries=0) turns
+                    retries off
+            rate_limiter: a RateLimiter which paces queries and mutations before they are sent. Pass the same
+                    RateLimiter to several clients to give them a common budget
+            circuit_breaker: a CircuitBreaker which makes calls fail fast with a CircuitOpenException while the
+                    Buycoins API is failing. Its state can be read from circuit_breaker.state and stats()
+            coalesce_reads: whether identical queries awaited at the same time share one request. The result is
+                    shared by every caller, so it must not be modified
+            cache: a ResponseCache which caches the responses of queries such as getBalances for a while. Cached
+                    responses are shared by every caller, so they must not be modified
+        """
+        b64_key = base64.b64encode(f"{public_key}:{secret_key}".encode()).decode()
+        self.client = AsyncPooledGraphqlClient("https://backend.buycoins.tech/api/graphql", headers={
+            'authorization': f"Basic {b64_key}"
+        }, limit=limit, limit_per_host=limit_per_host, keepalive_timeout=keepalive_timeout,
+            persisted_queries=persisted_queries, codec=json_codec, timeout=timeout, retry=retry,
+            rate_limiter=rate_limiter, circuit_breaker=circuit_breaker)
+        self._singleflight = SingleFlight() if coalesce_reads else None
+        self._cache = cache
+
+    async def close(self):
+        """Close the pooled connections to the Buycoins API
+
+        """
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def __enter__(self):
+        raise TypeError("AsyncBuycoinsGraphqlClient must be used with 'async with', not 'with'")
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def batch(self):
+        """BatchGraphqlClient sends its requests synchronously, so it can't be used with AsyncBuycoinsGraphqlClient.
+        Use asyncio.gather to make calls concurrently instead
+
+        Raises:
+            TypeError: always
+        """
+        raise TypeError("AsyncBuycoinsGraphqlClient has no batch(). Use asyncio.gather to make concurrent calls")
+
+    async def _execute(self, query: str, variables: dict, field: str, check: Callable[[Any], None] = None) -> dict:
+        """Executes a query or mutation without blocking and returns the requested field of the response
+
+        Args:
+            query: The GraphQL query string
+            variables: The variables used within the GraphQL query
+            field: The top-level field of the query or mutation whose value is returned
+            check: An optional function which is called with the value of the field and raises an exception if the
+                value is invalid
+
+        Returns:
+            A dict representing the GraphQL response
+        """
+        data = await self._fetch(query, variables, field)
+        result = data['data'][field]
+        if check is not None:
+            check(result)
+        return {'data': result}
+
+    async def _fetch(self, query: str, variables: dict, field: str) -> dict:
+        """Returns the GraphQL response of a query or mutation without blocking. Queries are read through the response
+        cache and coalesced when the client is set up to
+
+        """
+        if _is_mutation(query):
+            try:
+                return await _wrap_graphql_call_async(self.client, query=query, variables=variables,
+                                                      **self._call_options)
+            finally:
+                if self._cache is not None:
+                    self._cache.invalidate_for_mutation(field)
+        if self._cache is not None and self._cache.caches(field):
+            return await self._cache.get_or_fetch_async(field, ResponseCache.key(field, query, variables),
+                                                        lambda: self._read(query, variables))
+        return await self._read(query, variables)
+
+    async def _read(self, query: str, variables: dict) -> dict:
+        """Sends a query without blocking, sharing the request with identical concurrent queries if reads are coalesced
+
+        """
+        if self._singleflight is not None:
+            key = _call_key(query, variables, self._call_options)
+            return await self._singleflight.do_async(key, lambda: _wrap_graphql_call_async(
+                self.client, query=query, variables=variables, **self._call_options))
+        return await _wrap_graphql_call_async(self.client, query=query, variables=variables, **self._call_options)
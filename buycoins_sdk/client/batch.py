@@ -0,0 +1,221 @@
+"""
+This module contains and exports the BatchGraphqlClient class, which sends several queries to the Buycoins API in a
+single request
+"""
+
+import re
+from buycoins_sdk.client.client import BuycoinsGraphqlClient, _raise_for_graphql_errors, _send_graphql_call
+from buycoins_sdk.commons import errors
+from typing import Any, Callable, List, Tuple
+
+__all__ = [
+    'BatchGraphqlClient',
+    'BatchResult'
+]
+
+_HEADER = re.compile(r'^\s*(query|mutation)\s+\w+\s*(?:\((?P<args>[^)]*)\))?\s*{', re.S)
+_VARIABLE = re.compile(r'\$(\w+)')
+_FIELD = re.compile(r'^(\s*)(\w+)')
+
+
+def _alias_query(query: str, variables: dict, alias: str) -> Tuple[str, str, dict]:
+    """This function rewrites a single-field query so that it can be merged with other queries into one document. The
+    top-level field is given the alias and every variable is prefixed with the alias.
+
+    Args:
+        query: The GraphQL query string
+        variables: The variables used within the GraphQL query
+        alias: The alias of the query within the merged document
+
+    Returns:
+        A tuple of the variable definitions, the aliased selection and the renamed variables
+    """
+    match = _HEADER.match(query)
+    if match is None:
+        raise errors.BuycoinsException("This query can not be batched")
+    if match.group(1) != 'query':
+        raise errors.BuycoinsException("Only queries can be batched. Mutations must be sent on their own")
+
+    def rename(variable):
+        return f"${alias}_{variable.group(1)}"
+
+    args = _VARIABLE.sub(rename, match.group('args') or '').strip(' ,\n')
+    selection = _VARIABLE.sub(rename, query[match.end():query.rindex('}')])
+    selection = _FIELD.sub(lambda field: f"{field.group(1)}{alias}:{field.group(2)}", selection, count=1)
+    return args, selection, {f"{alias}_{name}": value for name, value in variables.items()}
+
+
+class BatchResult:
+    """BatchResult holds the result of a single query sent as part of a batch. The result is available once the batch
+    has been executed.
+
+    """
+
+    def __init__(self, field: str, variables: dict, check: Callable[[Any], None] = None):
+        """Create a new BatchResult
+
+        Args:
+            field: The top-level field of the query
+            variables: The variables used within the query
+            check: An optional function which is called with the value of the field and raises an exception if the
+                value is invalid
+        """
+        self._field = field
+        self._variables = variables
+        self._check = check
+        self._conversions = []
+        self._done = False
+        self._value = None
+        self._exception = None
+
+    def done(self) -> bool:
+        """Returns whether the batch containing this query has been executed
+
+        """
+        return self._done
+
+    def result(self) -> Any:
+        """Returns the result of the query
+
+        Raises:
+            BuycoinsException: The query failed or the batch has not been executed yet
+        """
+        if not self._done:
+            raise errors.BuycoinsException("The batch has not been executed yet")
+        if self._exception is not None:
+            raise self._exception
+        return self._value
+
+    def exception(self) -> Exception:
+        """Returns the exception raised by the query or None if the query succeeded
+
+        """
+        if not self._done:
+            raise errors.BuycoinsException("The batch has not been executed yet")
+        return self._exception
+
+    def _then(self, convert: Callable[[Any], Any]):
+        """Adds a function which is applied to the result of the query once it is available
+
+        """
+        self._conversions.append(convert)
+        return self
+
+    def _resolve(self, value: Any, graphql_errors: List[dict]):
+        """Sets the result of the query from the value of its field and the errors which belong to it
+
+        """
+        try:
+            if graphql_errors:
+                _raise_for_graphql_errors({'data': {self._field: value}, 'errors': graphql_errors}, self._variables)
+            if self._check is not None:
+                self._check(value)
+            result = {'data': value}
+            for convert in self._conversions:
+                result = convert(result)
+        except Exception as err:
+            self._exception = err
+        else:
+            self._value = result
+        self._done = True
+
+    def _fail(self, exception: Exception):
+        """Sets the exception of the query
+
+        """
+        self._exception = exception
+        self._done = True
+
+
+class BatchGraphqlClient(BuycoinsGraphqlClient):
+    """BatchGraphqlClient queues the queries made with it and sends them to the Buycoins API as a single GraphQL
+    document, with one aliased field per query.
+
+    It has every query method of BuycoinsGraphqlClient, but each method returns a BatchResult instead of the response.
+    The results are available once the batch has been executed, which happens when the with block exits::
+
+        >>> with bc_client.batch() as batch:
+        ...     balances = batch.get_balances()
+        ...     prices = batch.get_prices()
+        >>> prices.result()
+
+    Errors are isolated per query: a query that fails only raises when its own result is accessed. Mutations can not
+    be batched.
+    """
+
+    def __init__(self, bc_client: BuycoinsGraphqlClient):
+        """Create a new BatchGraphqlClient
+
+        Args:
+            bc_client: the BuycoinsGraphqlClient whose connections are used to send the batch
+        """
+        self.client = bc_client.client
+        self._call_options = bc_client._call_options
+        self._operations = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.execute()
+
+    def close(self):
+        """A batch does not own any connections, so there is nothing to close
+
+        """
+
+    def _execute(self, query: str, variables: dict, field: str, check: Callable[[Any], None] = None) -> BatchResult:
+        """Queues a query
+
+        Args:
+            query: The GraphQL query string
+            variables: The variables used within the GraphQL query
+            field: The top-level field of the query
+            check: An optional function which is called with the value of the field and raises an exception if the
+                value is invalid
+
+        Returns:
+            A BatchResult which holds the result once the batch is executed
+        """
+        alias = f"op{len(self._operations)}"
+        args, selection, aliased_variables = _alias_query(query, variables, alias)
+        result = BatchResult(field=field, variables=variables, check=check)
+        self._operations.append((alias, args, selection, aliased_variables, result))
+        return result
+
+    def execute(self):
+        """Sends every queued query in a single request and sets the result of each BatchResult
+
+        Raises:
+            BuycoinsHTTPException: The request failed with an HTTP error
+            BuycoinsException: The request failed
+        """
+        operations, self._operations = self._operations, []
+        if not operations:
+            return
+
+        args = ','.join(operation[1] for operation in operations if operation[1])
+        query = "query batch" + (f"({args})" if args else "") + "{" + "".join(
+            operation[2] for operation in operations) + "}"
+        variables = {}
+        for operation in operations:
+            variables.update(operation[3])
+
+        try:
+            data = _send_graphql_call(self.client, query=query, variables=variables, **self._call_options)
+        except Exception as err:
+            for operation in operations:
+                operation[4]._fail(err)
+            raise
+
+        values = data.get('data') or {}
+        errors_by_alias = {}
+        for error in data.get('errors', []):
+            path = error.get('path') or []
+            aliases = [path[0]] if path else [operation[0] for operation in operations]
+            for alias in aliases:
+                errors_by_alias.setdefault(alias, []).append(error)
+
+        for alias, _, _, _, result in operations:
+            result._resolve(values.get(alias), errors_by_alias.get(alias))
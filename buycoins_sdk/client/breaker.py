@@ -0,0 +1,196 @@
+"""
+This module contains the circuit breaker used by the transports to fail fast while the Buycoins API is failing
+"""
+
+import threading
+import time
+from buycoins_sdk.client.retry import _is_connection_error, _status_code
+from buycoins_sdk.commons import errors
+from buycoins_sdk.commons.enums import CircuitState
+from typing import Callable, Optional
+
+__all__ = [
+    'CircuitBreaker'
+]
+
+
+class CircuitBreaker:
+    """CircuitBreaker stops a client from sending requests while the Buycoins API is failing, so that callers fail fast
+    with a CircuitOpenException instead of tying up threads waiting on timeouts.
+
+    The breaker starts CLOSED and lets every request through. After failure_threshold consecutive failures it opens,
+    and every request raises CircuitOpenException without being sent. After recovery_timeout seconds the breaker is
+    HALF_OPEN: up to half_open_max_calls probe requests are let through, and it closes again once success_threshold
+    probes succeed or opens again if a probe fails. before_call() gives every probe a token which is passed back to
+    record(), so that requests sent before the breaker opened don't count as probes.
+
+    Connection errors, timeouts, 5xx responses and 429 responses are failures. With slow_call_threshold, a request
+    which succeeds but takes longer than slow_call_threshold seconds is a failure too, so that the breaker also trips
+    when the API breaches its latency objective. Other errors, such as 4xx responses, mean the API is answering and
+    are counted as successes.
+
+    A CircuitBreaker is safe to share between threads and clients.
+
+    Attributes:
+        failure_threshold: the number of consecutive failures which opens the breaker
+        recovery_timeout: the number of seconds the breaker stays open before it lets probe requests through
+        half_open_max_calls: the maximum number of probe requests in flight while the breaker is half open
+        success_threshold: the number of successful probes which closes the breaker
+        slow_call_threshold: the number of seconds after which a successful request counts as a failure, or None
+        on_state_change: a function called with the old and the new CircuitState whenever the state changes
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0, half_open_max_calls: int = 1,
+                 success_threshold: int = 1, slow_call_threshold: float = None,
+                 on_state_change: Callable[[CircuitState, CircuitState], None] = None):
+        """Create a new CircuitBreaker
+
+        Args:
+            failure_threshold: the number of consecutive failures which opens the breaker
+            recovery_timeout: the number of seconds the breaker stays open before it lets probe requests through
+            half_open_max_calls: the maximum number of probe requests in flight while the breaker is half open
+            success_threshold: the number of successful probes which closes the breaker
+            slow_call_threshold: the number of seconds after which a successful request counts as a failure. None
+                    means slow requests are not failures
+            on_state_change: a function called with the old and the new CircuitState whenever the state changes,
+                    for example to export the state as a metric
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.success_threshold = success_threshold
+        self.slow_call_threshold = slow_call_threshold
+        self.on_state_change = on_state_change
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._successes = 0
+        self._probes = 0
+        self._half_opens = 0
+        self._opened_at = 0.0
+        self._times_opened = 0
+        self._rejected = 0
+        self._lock = threading.RLock()
+
+    @property
+    def state(self) -> CircuitState:
+        """The CircuitState of the breaker
+
+        """
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def stats(self) -> dict:
+        """Returns the state of the breaker and its counters, for exporting as metrics
+
+        Returns:
+            A dict with the state, the number of consecutive failures, the number of times the breaker opened and the
+            number of requests rejected while it was open
+        """
+        with self._lock:
+            self._refresh()
+            return {
+                'state': self._state.value,
+                'consecutive_failures': self._failures,
+                'times_opened': self._times_opened,
+                'rejected': self._rejected
+            }
+
+    def is_failure(self, error: Optional[BaseException], latency: float = 0.0) -> bool:
+        """Returns whether a request which raised error, or succeeded if error is None, after latency seconds counts
+        as a failure
+
+        """
+        if error is None:
+            return self.slow_call_threshold is not None and latency > self.slow_call_threshold
+        status_code = _status_code(error)
+        if status_code is not None:
+            return status_code >= 500 or status_code == 429
+        return _is_connection_error(error)
+
+    def before_call(self) -> Optional[int]:
+        """Lets a request through, or raises CircuitOpenException if the breaker is open or has enough probes in flight
+
+        Returns:
+            A probe token if the request is a probe of a half open breaker, or None. Pass it to record()
+        Raises:
+            CircuitOpenException: the request must not be sent
+        """
+        with self._lock:
+            self._refresh()
+            if self._state is CircuitState.CLOSED:
+                return None
+            if self._state is CircuitState.HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return self._half_opens
+            self._rejected += 1
+            retry_after = max(0.0, self._opened_at + self.recovery_timeout - time.monotonic())
+            raise errors.CircuitOpenException(state=self._state, retry_after=retry_after)
+
+    def record(self, error: Optional[BaseException] = None, latency: float = 0.0, probe: Optional[int] = None):
+        """Records the outcome of a request which before_call let through
+
+        Args:
+            error: the exception raised by the request, or None if it succeeded
+            latency: the number of seconds the request took
+            probe: the probe token before_call returned for the request
+        """
+        failed = self.is_failure(error, latency)
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN:
+                # only the probes of the current half open period count. A request let through while the breaker was
+                # closed, or a probe of an earlier half open period, was never counted in _probes
+                if probe is None or probe != self._half_opens:
+                    return
+                self._probes -= 1
+            if error is not None and not isinstance(error, Exception):
+                # the request was cancelled or interrupted, so it says nothing about the API
+                return
+            if self._state is CircuitState.HALF_OPEN:
+                if failed:
+                    self._open()
+                else:
+                    self._successes += 1
+                    if self._successes >= self.success_threshold:
+                        self._set_state(CircuitState.CLOSED)
+            elif failed:
+                self._failures += 1
+                if self._state is CircuitState.CLOSED and self._failures >= self.failure_threshold:
+                    self._open()
+            else:
+                self._failures = 0
+
+    def reset(self):
+        """Closes the breaker and clears its consecutive failures
+
+        """
+        with self._lock:
+            self._set_state(CircuitState.CLOSED)
+
+    def _refresh(self):
+        """Moves an open breaker to HALF_OPEN once recovery_timeout has passed. Must be called with the lock held
+
+        """
+        if self._state is CircuitState.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._set_state(CircuitState.HALF_OPEN)
+
+    def _open(self):
+        """Opens the breaker. Must be called with the lock held
+
+        """
+        self._opened_at = time.monotonic()
+        self._times_opened += 1
+        self._set_state(CircuitState.OPEN)
+
+    def _set_state(self, state: CircuitState):
+        """Changes the state of the breaker and resets its counters. Must be called with the lock held
+
+        """
+        old_state, self._state = self._state, state
+        if state is CircuitState.HALF_OPEN:
+            self._half_opens += 1
+        self._failures = 0
+        self._successes = 0
+        self._probes = 0
+        if old_state is not state and self.on_state_change is not None:
+            self.on_state_change(old_state, state)
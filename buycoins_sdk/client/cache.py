@@ -0,0 +1,367 @@
+"""
+This module contains the read-through response cache of BuycoinsGraphqlClient and its storage backends
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from buycoins_sdk.client.singleflight import _request_key
+from buycoins_sdk.commons.enums import EventType
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+
+__all__ = [
+    'CacheBackend',
+    'CacheEntry',
+    'MemoryCacheBackend',
+    'ResponseCache',
+    'DEFAULT_TTLS',
+    'MUTATION_INVALIDATIONS',
+    'EVENT_INVALIDATIONS'
+]
+
+DEFAULT_TTLS = {
+    'getBalances': 5.0,
+    'getBankAccounts': 60.0,
+    'getEstimatedNetworkFee': 10.0,
+    'getMarketBook': 1.0
+}
+
+MUTATION_INVALIDATIONS = {
+    'buy': ('getBalances',),
+    'sell': ('getBalances',),
+    'postLimitOrder': ('getBalances', 'getMarketBook', 'getOrders'),
+    'postMarketOrder': ('getBalances', 'getMarketBook', 'getOrders'),
+    'send': ('getBalances',),
+    'sendOffchain': ('getBalances',),
+    'createWithdrawal': ('getBalances', 'getPayments'),
+    'cancelWithdrawal': ('getBalances', 'getPayments'),
+    'createDepositAccount': ('getBankAccounts',),
+    'createAddress': ()
+}
+
+EVENT_INVALIDATIONS = {
+    EventType.COINS_INCOMING: ('getBalances',),
+    EventType.BANK_DEPOSIT_INCOMING: ('getBalances', 'getPayments'),
+    EventType.ORDER_SUCCEEDED: ('getBalances', 'getMarketBook', 'getOrders'),
+    EventType.ORDER_FAILED: ('getBalances', 'getMarketBook', 'getOrders')
+}
+
+
+class CacheEntry(NamedTuple):
+    """CacheEntry is a cached response and the Unix time at which it expires
+
+    """
+    value: Any
+    expires_at: float
+
+
+class CacheBackend:
+    """CacheBackend is the interface of the stores a ResponseCache keeps its entries in. Subclass it to keep the cache
+    in an external store such as Redis or memcached, so that several processes share it. Keys are strings and entries
+    are CacheEntry tuples whose value is a JSON-serializable GraphQL response.
+
+    A ResponseCache counts the invalidations of every operation in the process it runs in, and only uses the count to
+    drop responses fetched before an invalidation. With a backend shared between processes, a response fetched by one
+    process can be written after another process has invalidated its operation, and is then served until its TTL.
+
+    Attributes:
+        evictions: the number of entries removed to make room for new ones
+    """
+
+    evictions = 0
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Returns the entry stored under key, or None
+
+        """
+        raise NotImplementedError
+
+    def set(self, key: str, entry: CacheEntry, ttl: float):
+        """Stores an entry under key. The backend may drop the entry after ttl seconds
+
+        """
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        """Removes the entry stored under key, if there is one
+
+        """
+        raise NotImplementedError
+
+    def clear(self):
+        """Removes every entry
+
+        """
+        raise NotImplementedError
+
+    def delete_prefix(self, prefix: str):
+        """Removes every entry whose key starts with prefix. Cache keys start with the operation name, so this removes
+        every cached response of an operation
+
+        """
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """MemoryCacheBackend keeps at most maxsize entries in memory, evicting the least recently used entry when it is
+    full. It is safe to share between threads.
+
+    Attributes:
+        maxsize: the maximum number of entries
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """Create a new MemoryCacheBackend
+
+        Args:
+            maxsize: the maximum number of entries
+        """
+        self.maxsize = maxsize
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry, ttl: float):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def delete_prefix(self, prefix: str):
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+
+class ResponseCache:
+    """ResponseCache is a read-through cache of query responses, keyed by operation and variables.
+
+    Only the operations given a TTL are cached. A cached response is fresh for the TTL of its operation, and is then
+    stale for stale_while_revalidate more seconds: a stale response is returned straight away while a single
+    background request refreshes it. After that the response is fetched again before it is returned.
+
+    Mutations and webhook events make some cached responses out of date, e.g a buy changes the balances. The client
+    invalidates the operations listed for a mutation in mutation_invalidations once the mutation is sent, and
+    BuycoinsSDK.handle_event invalidates the operations listed for an event in event_invalidations, so long TTLs can be
+    used safely. A response fetched before an invalidation is never cached after it.
+
+    Responses are shared by every caller, so they must not be modified. A ResponseCache is safe to share between
+    threads and clients.
+
+    Attributes:
+        backend: the CacheBackend the entries are stored in
+        ttls: the number of seconds a response stays fresh, by operation name e.g getBalances
+        stale_while_revalidate: the number of seconds a response may be served stale while it is refreshed
+        hits: the number of fresh responses returned from the cache
+        stale_hits: the number of stale responses returned from the cache
+        misses: the number of responses which had to be fetched before they were returned
+        mutation_invalidations: the operations invalidated by each mutation. Defaults to MUTATION_INVALIDATIONS
+        event_invalidations: the operations invalidated by each EventType. Defaults to EVENT_INVALIDATIONS
+    """
+
+    def __init__(self, backend: CacheBackend = None, ttls: Dict[str, float] = None,
+                 stale_while_revalidate: float = 0.0, clock: Callable[[], float] = time.time):
+        """Create a new ResponseCache
+
+        Args:
+            backend: the CacheBackend to store the entries in. Defaults to a MemoryCacheBackend
+            ttls: the number of seconds a response stays fresh, by operation name. Operations without a TTL are not
+                    cached. Defaults to DEFAULT_TTLS
+            stale_while_revalidate: the number of seconds after its TTL a response may be served while it is refreshed
+            clock: a function returning the current Unix time
+        """
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.ttls = dict(ttls if ttls is not None else DEFAULT_TTLS)
+        self.stale_while_revalidate = stale_while_revalidate
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.mutation_invalidations = dict(MUTATION_INVALIDATIONS)
+        self.event_invalidations = dict(EVENT_INVALIDATIONS)
+        self._generations = {}
+        self._clock = clock
+        self._refreshing = set()
+        self._refresh_tasks = set()
+        self._lock = threading.Lock()
+
+    def caches(self, operation: str) -> bool:
+        """Returns whether responses of an operation are cached
+
+        """
+        return self.ttls.get(operation) is not None
+
+    @staticmethod
+    def key(operation: str, query: str, variables: dict) -> str:
+        """Returns the cache key of a request. Keys start with the operation name, followed by a hash of the query and
+        its variables in a canonical form
+
+        """
+        digest = hashlib.sha256('\n'.join(_request_key(query, variables or {})).encode()).hexdigest()
+        return f"{operation}:{digest}"
+
+    def stats(self) -> dict:
+        """Returns the counters of the cache, for exporting as metrics
+
+        """
+        return {
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'evictions': self.backend.evictions
+        }
+
+    def clear(self):
+        """Removes every cached response
+
+        """
+        self.backend.clear()
+
+    def invalidate(self, *operations: str):
+        """Removes every cached response of the given operations
+
+        Args:
+            *operations: the operation names e.g getBalances
+        """
+        for operation in operations:
+            with self._lock:
+                self._generations[operation] = self._generations.get(operation, 0) + 1
+                self.backend.delete_prefix(f"{operation}:")
+
+    def invalidate_for_mutation(self, mutation: str):
+        """Removes the cached responses made out of date by a mutation
+
+        Args:
+            mutation: the name of the mutation e.g buy
+        """
+        self.invalidate(*self.mutation_invalidations.get(mutation, ()))
+
+    def invalidate_for_event(self, event_type: EventType):
+        """Removes the cached responses made out of date by a webhook event
+
+        Args:
+            event_type: the EventType of the event
+        """
+        self.invalidate(*self.event_invalidations.get(event_type, ()))
+
+    def get_or_fetch(self, operation: str, key: str, fetch: Callable[[], Any]) -> Any:
+        """Returns the cached response stored under key, or fetches and caches it
+
+        Args:
+            operation: the operation name of the request
+            key: the cache key of the request
+            fetch: a function which sends the request and returns the response
+
+        Returns:
+            The response
+        """
+        entry, fresh = self._lookup(key)
+        if entry is not None:
+            if not fresh and self._start_refresh(key):
+                threading.Thread(target=self._refresh, args=(operation, key, fetch), daemon=True).start()
+            return entry.value
+        generation = self._generation(operation)
+        return self._store(operation, key, fetch(), generation)
+
+    async def get_or_fetch_async(self, operation: str, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """The asyncio version of get_or_fetch, which fetches responses with a coroutine function
+
+        """
+        entry, fresh = self._lookup(key)
+        if entry is not None:
+            if not fresh and self._start_refresh(key):
+                # the event loop only keeps a weak reference to a task, so it is kept until it is done
+                task = asyncio.ensure_future(self._refresh_async(operation, key, fetch))
+                self._refresh_tasks.add(task)
+                task.add_done_callback(self._refresh_tasks.discard)
+            return entry.value
+        generation = self._generation(operation)
+        return self._store(operation, key, await fetch(), generation)
+
+    def _lookup(self, key: str) -> Tuple[Optional[CacheEntry], bool]:
+        """Returns the usable entry stored under key, or None, and whether it is fresh. Updates the counters
+
+        """
+        entry = self.backend.get(key)
+        now = self._clock()
+        with self._lock:
+            if entry is not None and now < entry.expires_at:
+                self.hits += 1
+                return entry, True
+            if entry is not None and now < entry.expires_at + self.stale_while_revalidate:
+                self.stale_hits += 1
+                return entry, False
+            self.misses += 1
+            return None, False
+
+    def _generation(self, operation: str) -> int:
+        """Returns the number of times an operation has been invalidated
+
+        """
+        with self._lock:
+            return self._generations.get(operation, 0)
+
+    def _store(self, operation: str, key: str, value: Any, generation: int) -> Any:
+        """Caches a response for the TTL of its operation and returns it. The response is not cached if the operation
+        was invalidated since generation, when the response was requested
+
+        """
+        ttl = self.ttls[operation]
+        with self._lock:
+            # checked and written under the lock, so that an invalidation can't happen between the two
+            if self._generations.get(operation, 0) == generation:
+                self.backend.set(key, CacheEntry(value=value, expires_at=self._clock() + ttl),
+                                 ttl + self.stale_while_revalidate)
+        return value
+
+    def _start_refresh(self, key: str) -> bool:
+        """Returns True if no refresh of key is running, and marks it as running
+
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def _refresh(self, operation: str, key: str, fetch: Callable[[], Any]):
+        generation = self._generation(operation)
+        try:
+            self._store(operation, key, fetch(), generation)
+        except Exception:
+            # the stale response is kept until it is too old, then the next caller fetches it and gets the error
+            pass
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    async def _refresh_async(self, operation: str, key: str, fetch: Callable[[], Awaitable[Any]]):
+        generation = self._generation(operation)
+        try:
+            self._store(operation, key, await fetch(), generation)
+        except Exception:
+            pass
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
@@ -4,11 +4,25 @@ This module contains and exports the BuycoinsGraphqlClient class  and a helper f
 
 from python_graphql_client import GraphqlClient
 import base64
+import copy
 from requests import exceptions
-from buycoins_sdk.commons import errors, type_to_field
+from buycoins_sdk.client.queries import query_registry, _prepare_graphql_args, _pagination_shape, \
+    _pagination_variables, _get_balances_query, _get_bank_accounts_query, _get_estimated_network_fee_query, \
+    _get_market_book_query, _get_orders_query, _get_payments_query, _get_prices_query, _node_query, _nodes_query, \
+    _buy_query, _cancel_withdrawal_query, _create_address_query, _create_deposit_account_query, \
+    _create_withdrawal_query, _post_limit_order_query, _post_market_order_query, _sell_query, _send_query, \
+    _send_offchain_query
+from buycoins_sdk.client.codecs import JSONCodec
+from buycoins_sdk.client.breaker import CircuitBreaker
+from buycoins_sdk.client.cache import ResponseCache
+from buycoins_sdk.client.ratelimit import RateLimiter
+from buycoins_sdk.client.retry import RetryPolicy, _is_mutation
+from buycoins_sdk.client.singleflight import SingleFlight, _call_key
+from buycoins_sdk.client.transport import PooledGraphqlClient, DEFAULT_TIMEOUT
+from buycoins_sdk.commons import errors
 from buycoins_sdk.commons.enums import Cryptocurrency, GetOrdersStatus, BuycoinsType, OrderSide, \
     PriceType
-from typing import Any, Dict, List
+from typing import Any, Callable, List, Tuple, Union
 
 __all__ = [
     'BuycoinsGraphqlClient',
@@ -17,120 +31,256 @@ __all__ = [
 ]
 
 
-def _prepare_graphql_args(variables: Dict[str, Any], first: int = None, last: int = None, after: str = None,
-                          before: str = None) -> Dict[str, Any]:
-    """This function takes in common pagination args for the Connection and prepares them into two variables
-    to be used in GraphQL queries
+def _raise_for_graphql_errors(data: dict, variables: dict) -> dict:
+    """This function maps the errors in a GraphQL response to the appropriate exceptions
 
     Args:
-        variables: The map of GraphQL variables to be passed to GraphQLClient
-        first: For pagination. Returns the first n elements in a list.
-        last: For pagination. Returns the last n elements in a list.
-        after: A string representing a cursor. Returns the elements in the list that come after the specified
-                    cursor.
-        before: A string representing a cursor. Returns the elements in the list that come before the specified
-                    cursor.
+        data: The GraphQL response
+        variables: The variables used within the GraphQL query
 
-    Returns: A dictionary with keys: connection_arg and arg, which represents the arguments for the Connection and the
-            GraphQL query.
-    """
+    Returns:
+        The GraphQL response if it contains no errors
 
-    var = variables
-    connection_arg = ''
-    arg_map = {'first': first, 'last': last, 'after': after, 'before': before}
-    arg = ','
-    for i in arg_map:
-        if arg_map[i] is not None:
-            connection_arg = connection_arg + f"{i}:${i},"
-            if i == 'first' or i == 'last':
-                arg = arg + f"${i}: Int,"
-            elif i == 'after' or i == 'before':
-                arg = arg + f"${i}: String,"
-            var[i] = arg_map[i]
-    if connection_arg != '':
-        connection_arg = connection_arg[:-1]
-        connection_arg = f"({connection_arg})"
-
-    if arg == ',':
-        arg = ''
+    """
+    if 'errors' in data:
+        # for the buy query
+        if data['errors'][0]['message'] == 'Your balance is insufficient for this purchase' and 'buy' in data['data']:
+            raise errors.InsufficientBalanceToBuyException(cryptocurrency=variables['cryptocurrency'],
+                                                           amount_to_buy=variables['coin_amount'])
+        # for the cancelWithdrawal mutation
+        elif data['errors'][0]['message'] == "This payment has been processed and can not be canceled" \
+                and 'cancelWithdrawal' in data['data']:
+            raise errors.WithdrawalCannotBeCanceledException()
+
+        # for the createWithdrawal mutation
+        elif data['errors'][0]['message'] == 'Balance is insufficient for this withdrawal' \
+                and 'createWithdrawal' in data['data']:
+            raise errors.InsufficientBalanceToWithdrawException(amount_to_withdraw=variables['amount'])
+
+        # for the sell mutation
+        elif data['errors'][0]['message'] == 'Your balance is insufficient for this sale' \
+                and 'sell' in data['data']:
+            raise errors.InsufficientAmountToSellException(cryptocurrency=variables['cryptocurrency'],
+                                                           amount_to_sell=variables['coin_amount'])
+        else:
+            raise errors.BuycoinsException(data['errors'][0]['message'])
     else:
-        arg = arg[:-1]
+        return data
 
-    return {
-        "connection_arg": connection_arg,
-        "arg": arg,
-        'variables': var
-    }
 
-
-def _wrap_graphql_call(client: GraphqlClient, query: str, variables: dict) -> Any:
-    """This function wraps calls to the GraphQL API and raises the appropriate exceptions
+def _send_graphql_call(client: GraphqlClient, query: str, variables: dict, **options: Any) -> dict:
+    """This function sends a query to the GraphQL API and raises the appropriate exceptions for transport errors. Errors
+    in the GraphQL response are left in the returned response.
 
     Args:
         client: The GraphqlClient
         query: The GraphQL query string
         variables: The variables used within the GraphQL query
+        **options: per-call options passed to the client, such as timeout and retry
 
     Returns:
         The GraphQL response is returned
 
     """
     try:
-        data = client.execute(query=query, variables=variables)
+        return client.execute(query=query, variables=variables, **options)
     except exceptions.HTTPError as err:
         raise errors.BuycoinsHTTPException(
             response=err.response,
             message=str(err)
         )
+    except errors.BuycoinsException:
+        raise
     except Exception as err:
         raise errors.BuycoinsException(str(err))
-    else:
-        if 'errors' in data:
-            # for the buy query
-            if data['errors'][0]['message'] == 'Your balance is insufficient for this purchase' and 'buy' in data['data']:
-                raise errors.InsufficientBalanceToBuyException(cryptocurrency=variables['cryptocurrency'],
-                                                               amount_to_buy=variables['coin_amount'])
-            # for the cancelWithdrawal mutation
-            elif data['errors'][0]['message'] == "This payment has been processed and can not be canceled" \
-                    and 'cancelWithdrawal' in data['data']:
-                raise errors.WithdrawalCannotBeCanceledException()
-
-            # for the createWithdrawal mutation
-            elif data['errors'][0]['message'] == 'Balance is insufficient for this withdrawal' \
-                    and 'createWithdrawal' in data['data']:
-                raise errors.InsufficientBalanceToWithdrawException(amount_to_withdraw=variables['amount'])
-
-            # for the sell mutation
-            elif data['errors'][0]['message'] == 'Your balance is insufficient for this sale' \
-                    and 'sell' in data['data']:
-                raise errors.InsufficientAmountToSellException(cryptocurrency=variables['cryptocurrency'],
-                                                               amount_to_sell=variables['coin_amount'])
-            else:
-                raise errors.BuycoinsException(data['errors'][0]['message'])
-        else:
-            return data
+
+
+def _wrap_graphql_call(client: GraphqlClient, query: str, variables: dict, **options: Any) -> Any:
+    """This function wraps calls to the GraphQL API and raises the appropriate exceptions
+
+    Args:
+        client: The GraphqlClient
+        query: The GraphQL query string
+        variables: The variables used within the GraphQL query
+        **options: per-call options passed to the client, such as timeout and retry
+
+    Returns:
+        The GraphQL response is returned
+
+    """
+    data = _send_graphql_call(client, query=query, variables=variables, **options)
+    return _raise_for_graphql_errors(data, variables)
+
+
+def _check_nodes(nodes: List[dict]):
+    """This function raises an InvalidGraphQLNodeIDException if any of the nodes returned by the nodes query could
+    not be looked up
+
+    Args:
+        nodes: the nodes field of the GraphQL response
+    """
+    if {} in nodes:
+        raise errors.InvalidGraphQLNodeIDException(message="One of your nodes could not looked up. Please "
+                                                           "check your Node IDs or GraphQL types")
 
 
 class BuycoinsGraphqlClient:
     """The BuycoinsGraphqlClient is a wrapper around GraphqlClient which takes in the user's public and secret keys
     for making GraphQL queries.
 
+    All queries and mutations are sent over a pool of keep-alive connections which is shared by every thread using
+    the BuycoinsGraphqlClient. Call close() (or use the client as a context manager) to release the connections.
+
+    Requests time out after 5 seconds without a connection or 30 seconds without a response by default. Queries which
+    fail with a connection error, a timeout or a 5xx response are retried with exponential backoff and jitter;
+    mutations are only retried when you opt in. Use with_options() to change the timeout or retries of some calls.
+
     Attributes:
         client: A GraphqlClient used to make queries and mutations directly. Only use this when you want to write your
                     own queries and mutations. Most times, you won't need to do that yourself.
     """
 
-    def __init__(self, public_key: str, secret_key: str):
+    _call_options = {}
+    _singleflight = None
+    _cache = None
+
+    def __init__(self, public_key: str, secret_key: str, pool_connections: int = 10, pool_maxsize: int = 10,
+                 pool_block: bool = False, persisted_queries: bool = False,
+                 json_codec: Union[str, JSONCodec] = 'json',
+                 timeout: Union[None, float, Tuple[float, float]] = DEFAULT_TIMEOUT, retry: RetryPolicy = None,
+                 rate_limiter: RateLimiter = None, circuit_breaker: CircuitBreaker = None,
+                 coalesce_reads: bool = False, cache: ResponseCache = None):
         """Initialise a BuycoinsGraphqlClient
 
         Args:
             public_key: your BuyCoins public key as a string
             secret_key: your BuyCoins secret key as a string
+            pool_connections: the number of hosts to keep a connection pool for
+            pool_maxsize: the maximum number of keep-alive connections kept open to the Buycoins API
+            pool_block: whether to wait for a free connection once pool_maxsize connections are in use instead of
+                    opening a connection which is discarded after the request
+            persisted_queries: whether to send only the SHA-256 hash of each query once the server knows it
+                    (automatic persisted queries) instead of the full query text
+            json_codec: the JSON library used to encode requests and decode responses: a JSONCodec, or json,
+                    orjson, ujson or auto for the fastest one which is installed
+            timeout: the timeout of every request, in seconds or as a (connect, read) tuple. None means no timeout
+            retry: the RetryPolicy deciding which failed requests are retried. RetryPolicy(max_retries=0) turns
+                    retries off
+            rate_limiter: a RateLimiter which paces queries and mutations before they are sent. Pass the same
+                    RateLimiter to several clients to give them a common budget
+            circuit_breaker: a CircuitBreaker which makes calls fail fast with a CircuitOpenException while the
+                    Buycoins API is failing. Its state can be read from circuit_breaker.state and stats()
+            coalesce_reads: whether identical queries made at the same time by different threads share one request.
+                    The result is shared by every caller, so it must not be modified
+            cache: a ResponseCache which caches the responses of queries such as getBalances for a while. Cached
+                    responses are shared by every caller, so they must not be modified
         """
         b64_key = base64.b64encode(f"{public_key}:{secret_key}".encode()).decode()
-        self.client = GraphqlClient("https://backend.buycoins.tech/api/graphql", headers={
+        self.client = PooledGraphqlClient("https://backend.buycoins.tech/api/graphql", headers={
             'authorization': f"Basic {b64_key}"
-        })
+        }, pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block,
+            persisted_queries=persisted_queries, codec=json_codec, timeout=timeout, retry=retry,
+            rate_limiter=rate_limiter, circuit_breaker=circuit_breaker)
+        self._singleflight = SingleFlight() if coalesce_reads else None
+        self._cache = cache
+
+    @property
+    def cache(self) -> ResponseCache:
+        """The ResponseCache of the client, or None
+
+        """
+        return self._cache
+
+    def close(self):
+        """Close the pooled connections to the Buycoins API
+
+        """
+        close = getattr(self.client, 'close', None)
+        if close is not None:
+            close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def with_options(self, timeout: Union[float, Tuple[float, float]] = None, retry: RetryPolicy = None,
+                     retry_mutations: bool = None):
+        """Returns a copy of the client which makes its calls with different options. The copy shares the connection
+        pool of the client, so only close one of them.
+
+        Example:
+            client.with_options(timeout=2).get_prices()
+            client.with_options(retry_mutations=True).send_offchain(...)
+
+        Args:
+            timeout: the timeout of each call, in seconds or as a (connect, read) tuple
+            retry: the RetryPolicy of each call
+            retry_mutations: whether mutations may be retried. Only set this if retrying your mutations is safe
+
+        Returns:
+            A copy of the client
+        """
+        options = {'timeout': timeout, 'retry': retry, 'retry_mutations': retry_mutations}
+        clone = copy.copy(self)
+        clone._call_options = {**self._call_options, **{k: v for k, v in options.items() if v is not None}}
+        return clone
+
+    def batch(self):
+        """Returns a BatchGraphqlClient which queues queries and sends them to the Buycoins API in a single request.
+        See BatchGraphqlClient for more details
+
+        """
+        from buycoins_sdk.client.batch import BatchGraphqlClient
+        return BatchGraphqlClient(self)
+
+    def _execute(self, query: str, variables: dict, field: str, check: Callable[[Any], None] = None) -> dict:
+        """Executes a query or mutation and returns the requested field of the response. Every method of
+        BuycoinsGraphqlClient goes through this method.
+
+        Args:
+            query: The GraphQL query string
+            variables: The variables used within the GraphQL query
+            field: The top-level field of the query or mutation whose value is returned
+            check: An optional function which is called with the value of the field and raises an exception if the
+                value is invalid
+
+        Returns:
+            A dict representing the GraphQL response
+        """
+        data = self._fetch(query, variables, field)
+        result = data['data'][field]
+        if check is not None:
+            check(result)
+        return {'data': result}
+
+    def _fetch(self, query: str, variables: dict, field: str) -> dict:
+        """Returns the GraphQL response of a query or mutation. Queries are read through the response cache and
+        coalesced when the client is set up to
+
+        """
+        if _is_mutation(query):
+            try:
+                return _wrap_graphql_call(self.client, query=query, variables=variables, **self._call_options)
+            finally:
+                # a mutation which failed may still have been carried out
+                if self._cache is not None:
+                    self._cache.invalidate_for_mutation(field)
+        if self._cache is not None and self._cache.caches(field):
+            return self._cache.get_or_fetch(field, ResponseCache.key(field, query, variables),
+                                            lambda: self._read(query, variables))
+        return self._read(query, variables)
+
+    def _read(self, query: str, variables: dict) -> dict:
+        """Sends a query, sharing the request with identical concurrent queries if reads are coalesced
+
+        """
+        if self._singleflight is not None:
+            key = _call_key(query, variables, self._call_options)
+            return self._singleflight.do(key, lambda: _wrap_graphql_call(
+                self.client, query=query, variables=variables, **self._call_options))
+        return _wrap_graphql_call(self.client, query=query, variables=variables, **self._call_options)
 
     def get_balances(self, cryptocurrency: Cryptocurrency) -> dict:
         """Executes the getBalances query
@@ -144,26 +294,11 @@ class BuycoinsGraphqlClient:
             BuycoinsException: An error occurred
         """
         if cryptocurrency is None:
-            query = """
-                query getBalances{
-                    getBalances{
-                        """ + type_to_field[BuycoinsType.ACCOUNT] + """
-                    }
-                }
-            """
             variables = {}
         else:
-            query = """
-                query getBalances($cryptocurrency: Cryptocurrency){
-                    getBalances(cryptocurrency: $cryptocurrency){
-                        """ + type_to_field[BuycoinsType.ACCOUNT] + """
-                    }
-                }
-            """
             variables = {'cryptocurrency': cryptocurrency.value}
-
-        data = _wrap_graphql_call(self.client, query=query, variables=variables)
-        return {'data': data['data']['getBalances']}
+        query = query_registry.get('getBalances', _get_balances_query, cryptocurrency is not None)
+        return self._execute(query=query, variables=variables, field='getBalances')
 
     def get_bank_accounts(self, account_number=None) -> dict:
         """Executes the getBankAccounts query
@@ -176,25 +311,11 @@ class BuycoinsGraphqlClient:
             BuycoinsException: An error occurred
         """
         if account_number is None:
-            query = """
-                query getBankAccounts{
-                    getBankAccounts{
-                        """ + type_to_field[BuycoinsType.BANK_ACCOUNT] + """
-                    }
-                }
-            """
             variables = {}
         else:
-            query = """
-                query getBankAccounts($accountNumber: String){
-                    getBankAccounts(accountNumber: $accountNumber){
-                        """ + type_to_field[BuycoinsType.BANK_ACCOUNT] + """
-                    }
-                }
-            """
             variables = {'accountNumber': account_number}
-        data = _wrap_graphql_call(self.client, query=query, variables=variables)
-        return {'data': data['data']['getBankAccounts']}
+        query = query_registry.get('getBankAccounts', _get_bank_accounts_query, account_number is not None)
+        return self._execute(query=query, variables=variables, field='getBankAccounts')
 
     def get_estimated_network_fee(self, amount: str, cryptocurrency: Cryptocurrency = Cryptocurrency.BITCOIN) -> dict:
         """Executes the getEstimatedNetworkFee query
@@ -207,17 +328,9 @@ class BuycoinsGraphqlClient:
         Raises:
             BuycoinsException: An error occurred
         """
-        query = """
-            query getEstimatedNetworkFee($cryptocurrency: Cryptocurrency, $amount: BigDecimal!){
-                getEstimatedNetworkFee(cryptocurrency: $cryptocurrency, amount: $amount){
-                    estimatedFee
-                    total
-                }
-            }
-        """
+        query = query_registry.get('getEstimatedNetworkFee', _get_estimated_network_fee_query)
         variables = {'cryptocurrency': cryptocurrency.value, 'amount': amount}
-        data = _wrap_graphql_call(self.client, query=query, variables=variables)
-        return {'data': data['data']['getEstimatedNetworkFee']}
+        return self._execute(query=query, variables=variables, field='getEstimatedNetworkFee')
 
     def get_market_book(self, first: int = None, last: int = None, after: str = None, before: str = None,
                         cryptocurrency: Cryptocurrency = Cryptocurrency.BITCOIN) -> dict:
@@ -236,37 +349,10 @@ class BuycoinsGraphqlClient:
             Raises:
                 BuycoinsException: An error occurred
         """
-        variables = {'cryptocurrency': cryptocurrency.value}
-
-        # get arguments for the GraphQL query and that of the orders query
-        arg_and_order_arg = _prepare_graphql_args(variables, first, last, after, before)
-        connection_arg = arg_and_order_arg['connection_arg']
-        arg = arg_and_order_arg['arg']
-        variables = arg_and_order_arg['variables']
-
-        query = """
-            query getMarketBook($cryptocurrency: Cryptocurrency""" + arg + """){                           
-              getMarketBook(cryptocurrency: $cryptocurrency){
-                dynamicPriceExpiry
-                orders""" + connection_arg + """{
-                  pageInfo{
-                    endCursor
-                    hasNextPage
-                    hasPreviousPage
-                    startCursor
-                  }
-                  edges{
-                    cursor
-                    node{
-                      """ + type_to_field[BuycoinsType.POST_ORDER] + """
-                    }
-                  }
-                }  
-              }
-            }
-        """
-        data = _wrap_graphql_call(self.client, query=query, variables=variables)
-        return {'data': data['data']['getMarketBook']}
+        query = query_registry.get('getMarketBook', _get_market_book_query,
+                                   *_pagination_shape(first, last, after, before))
+        variables = _pagination_variables({'cryptocurrency': cryptocurrency.value}, first, last, after, before)
+        return self._execute(query=query, variables=variables, field='getMarketBook')
 
     def get_orders(self, status: GetOrdersStatus, side: OrderSide = None, first: int = None, last: int = None,
                    after: str = None,
@@ -288,43 +374,13 @@ class BuycoinsGraphqlClient:
             Raises:
                 BuycoinsException: An error occurred
         """
-        variables = {'cryptocurrency': cryptocurrency.value, 'status': status.value}
-
-        # get arguments for the GraphQL query and that of the orders query
-        arg_and_order_arg = _prepare_graphql_args(variables, first, last, after, before)
-        connection_arg = arg_and_order_arg['connection_arg']
-        arg = arg_and_order_arg['arg']
-        variables = arg_and_order_arg['variables']
-
-        # get the arguments for the getOrders query
-        get_orders_args = ""
+        query = query_registry.get('getOrders', _get_orders_query, *_pagination_shape(first, last, after, before),
+                                   side is not None)
+        variables = _pagination_variables({'cryptocurrency': cryptocurrency.value, 'status': status.value}, first,
+                                          last, after, before)
         if side is not None:
-            get_orders_args = "side: $side"
-            arg = arg + ", $side: OrderSide"
             variables['side'] = side.value
-        query = """
-            query getOrders($cryptocurrency: Cryptocurrency, $status: GetOrdersStatus!""" + arg + """){                           
-              getOrders(cryptocurrency: $cryptocurrency, status: $status, """ + get_orders_args + """ ){
-                dynamicPriceExpiry
-                orders""" + connection_arg + """{
-                  pageInfo{
-                    endCursor
-                    hasNextPage
-                    hasPreviousPage
-                    startCursor
-                  }
-                  edges{
-                    cursor
-                    node{
-                      """ + type_to_field[BuycoinsType.POST_ORDER] + """
-                    }
-                  }
-                }  
-              }
-            }
-        """
-        data = _wrap_graphql_call(self.client, query=query, variables=variables)
-        return {'data': data['data']['getOrders']}
+        return self._execute(query=query, variables=variables, field='getOrders')
 
     def get_payments(self, after: str = None, before: str = None, first: int = None, last: int = None) -> dict:
         """Executes the getPayments GraphQL query
@@ -342,36 +398,9 @@ class BuycoinsGraphqlClient:
             BuycoinsException: An error occurred
 
         """
-        variables = {}
-        args_and_get_payments_args = _prepare_graphql_args(variables, first, last, after, before)
-        arg = args_and_get_payments_args['arg']
-        connection_arg = args_and_get_payments_args['connection_arg']
-        variables = args_and_get_payments_args['variables']
-
-        if arg != "":
-            arg = arg[1:]
-            arg = f"({arg})"
-
-        query = """
-            query getPayments""" + arg + """{                           
-              getPayments""" + connection_arg + """{
-                pageInfo{
-                    endCursor
-                    hasNextPage
-                    hasPreviousPage
-                    startCursor
-                }
-                edges{
-                    cursor
-                    node{
-                      """ + type_to_field[BuycoinsType.PAYMENT] + """
-                    }
-                }
-              }
-            }
-        """
-        data = _wrap_graphql_call(self.client, query=query, variables=variables)
-        return {'data': data['data']['getPayments']}
+        query = query_registry.get('getPayments', _get_payments_query, *_pagination_shape(first, last, after, before))
+        variables = _pagination_variables({}, first, last, after, before)
+        return self._execute(query=query, variables=variables, field='getPayments')
 
     def get_prices(self, cryptocurrency: Cryptocurrency = None) -> dict:
         """Executes the getPrices query
@@ -386,26 +415,11 @@ class BuycoinsGraphqlClient:
 
         """
         if cryptocurrency is None:
-            query = """
-                        query getPrices{
-                          getPrices{
-                            """ + type_to_field[BuycoinsType.BUYCOINS_PRICE] + """ 
-                          }
-                        }
-                    """
             variables = {}
         else:
-            query = """
-                query getPrices($cryptocurrency: Cryptocurrency){
-                  getPrices(cryptocurrency: $cryptocurrency){
-                    """ + type_to_field[BuycoinsType.BUYCOINS_PRICE] + """ 
-                  }
-                }
-            """
             variables = {'cryptocurrency': cryptocurrency.value}
-
-        data = _wrap_graphql_call(self.client, query=query, variables=variables)
-        return {'data': data['data']['getPrices']}
+        query = query_registry.get('getPrices', _get_prices_query, cryptocurrency is not None)
+        return self._execute(query=query, variables=variables, field='getPrices')
 
     def node(self, node_id: str, gql_type: BuycoinsType) -> dict:
         """Executes the node Graphql query
@@ -421,33 +435,23 @@ class BuycoinsGraphqlClient:
             BuycoinsException: An unspecified error occurred
 
         """
-
-        fields = type_to_field[gql_type]
-
-        query = """
-            query node($id: ID!){
-                node(id: $id){
-                     ... on """ + gql_type.value + """ {
-                        """ + fields + """
-                    }
-                }
-            }
-        """
-
+        query = query_registry.get('node', _node_query, gql_type)
         variables = {'id': node_id}
 
-        data = _wrap_graphql_call(self.client, query=query, variables=variables)
-        if data['data']['node'] == {}:
-            raise errors.InvalidGraphQLNodeIDException(gql_type=gql_type, node_id=node_id)
-        else:
-            return {'data': data['data']['node']}
+        def check(node):
+            if node == {}:
+                raise errors.InvalidGraphQLNodeIDException(gql_type=gql_type, node_id=node_id)
 
-    def nodes(self, ids: List[str], gql_types: List[BuycoinsType]) -> dict:
-        """Executes the nodes GraphQL query
+        return self._execute(query=query, variables=variables, field='node', check=check)
+
+    def nodes(self, ids: List[str], gql_types: List[BuycoinsType], partial: bool = False) -> dict:
+        """Executes the nodes GraphQL query. The query has one fragment for every distinct type in gql_types, whatever
+        their order
 
         Args:
             ids: the list of node IDs
             gql_types: the list of node types
+            partial: if True, the nodes which could not be looked up are returned as empty dicts instead of raising
 
         Returns:
             A dict representing the GraphQL response
@@ -456,29 +460,9 @@ class BuycoinsGraphqlClient:
             BuycoinsException: An unspecified error occurred
 
         """
-        on_part_of_query = """"""
-        for i in gql_types:
-            on_part_of_query = on_part_of_query + "\n" + """
-                ... on """ + i.value + """{
-                    """ + type_to_field[i] + """
-                }
-            """
-        query = """
-            query nodes($ids: [ID!]!){
-                nodes(ids: $ids){
-                    """ + on_part_of_query + """
-                }
-            }
-        """
-
+        query = query_registry.get('nodes', _nodes_query, *sorted(set(gql_types), key=lambda gql_type: gql_type.value))
         variables = {'ids': ids}
-
-        data = _wrap_graphql_call(self.client, query=query, variables=variables)
-        if {} in data['data']['nodes']:
-            raise errors.InvalidGraphQLNodeIDException(message="One of your nodes could not looked up. Please "
-                                                               "check your Node IDs or GraphQL types")
-        else:
-            return {'data': data['data']['nodes']}
+        return self._execute(query=query, variables=variables, field='nodes', check=None if partial else _check_nodes)
 
     def buy(self, price_id: str, coin_amount: str, cryptocurrency: Cryptocurrency = Cryptocurrency.BITCOIN) -> dict:
         """Execute the buy mutation
@@ -496,18 +480,9 @@ class BuycoinsGraphqlClient:
             BuycoinsException: An error occurred
 
         """
-
-        query = """
-            mutation buy($cryptocurrency: Cryptocurrency, $price: ID!, $coin_amount: BigDecimal!){
-                buy(cryptocurrency: $cryptocurrency, price: $price, coin_amount: $coin_amount){
-                   """ + type_to_field[BuycoinsType.ORDER] + """
-                }
-            }
-        """
+        query = query_registry.get('buy', _buy_query)
         variables = {'cryptocurrency': cryptocurrency.value, 'price': price_id, 'coin_amount': coin_amount}
-
-        data = _wrap_graphql_call(self.client, query=query, variables=variables)
-        return {'data': data['data']['buy']}
+        return self._execute(query=query, variables=variables, field='buy')
 
     def cancel_withdrawal(self, payment_id: str) -> dict:
         """Executes the cancelWithdrawal mutation
@@ -523,17 +498,9 @@ class BuycoinsGraphqlClient:
              withdrawal
             BuycoinsException: An error occurred
         """
-        query = """
-            mutation cancelWithdrawal($payment: ID!){
-                cancelWithdrawal(payment: $payment){
-                   """ + type_to_field[BuycoinsType.PAYMENT] + """
-                }
-            }
-        """
+        query = query_registry.get('cancelWithdrawal', _cancel_withdrawal_query)
         variables = {'payment': payment_id}
-
-        data = _wrap_graphql_call(self.client, query=query, variables=variables)
-        return {'data': data['data']['cancelWithdrawal']}
+        return self._execute(query=query, variables=variables, field='cancelWithdrawal')
 
     def create_address(self, cryptocurrency: Cryptocurrency = Cryptocurrency.BITCOIN) -> dict:
         """Executes the createAddress mutation
@@ -547,17 +514,9 @@ class BuycoinsGraphqlClient:
         Raises:
             BuycoinsException: An error occurred
         """
-        query = """
-            mutation createAddress($cryptocurrency: Cryptocurrency){
-                createAddress(cryptocurrency: $cryptocurrency){
-                    """ + type_to_field[BuycoinsType.ADDRESS] + """
-                }
-            }
-        """
+        query = query_registry.get('createAddress', _create_address_query)
         variables = {'cryptocurrency': cryptocurrency.value}
-
-        data = _wrap_graphql_call(self.client, query=query, variables=variables)
-        return {'data': data['data']['createAddress']}
+        return self._execute(query=query, variables=variables, field='createAddress')
 
     def create_deposit_account(self, account_name: str) -> dict:
         """Executes the createDepositAccount mutation
@@ -571,17 +530,9 @@ class BuycoinsGraphqlClient:
         Raises:
             BuycoinsException: An error occurred
         """
-        query = """
-            mutation createDepositAccount($account_name: String!){
-                createDepositAccount(accountName: $account_name){
-                   """ + type_to_field[BuycoinsType.DEPOSIT_ACCOUNT] + """
-                }
-            }
-        """
+        query = query_registry.get('createDepositAccount', _create_deposit_account_query)
         variables = {'account_name': account_name}
-
-        data = _wrap_graphql_call(self.client, query=query, variables=variables)
-        return {'data': data['data']['createDepositAccount']}
+        return self._execute(query=query, variables=variables, field='createDepositAccount')
 
     def create_withdrawal(self, bank_account_id: str, amount: str):
         """Executes the createWithdrawal mutation
@@ -597,17 +548,9 @@ class BuycoinsGraphqlClient:
             InsufficientBalanceToWithdrawException: This is raised when a user tries withdrawing more naira than they have
             BuycoinsException: An error occurred
         """
-        query = """
-            mutation createWithdrawal($bank_account: ID!, $amount: BigDecimal!){
-                createWithdrawal(bankAccount: $bank_account, amount: $amount){
-                   """ + type_to_field[BuycoinsType.PAYMENT] + """
-                }
-            }
-        """
+        query = query_registry.get('createWithdrawal', _create_withdrawal_query)
         variables = {'bank_account': bank_account_id, 'amount': amount}
-
-        data = _wrap_graphql_call(self.client, query=query, variables=variables)
-        return {'data': data['data']['createWithdrawal']}
+        return self._execute(query=query, variables=variables, field='createWithdrawal')
 
     def post_limit_order(self, order_side: OrderSide, coin_amount: str, static_price: str, price_type: PriceType,
                          dynamic_exchange_rate: str = None,
@@ -629,29 +572,11 @@ class BuycoinsGraphqlClient:
             BuycoinsException: An error occurred
 
         """
-        dynamic_exchange_rate_query_slices = ["", ""]
-        if dynamic_exchange_rate is not None:
-            dynamic_exchange_rate_query_slices = [", $dynamic_exchange_rate: BigDecimal", ", dynamicExchangeRate: "
-                                                                                          "$dynamic_exchange_rate"]
-        static_price_query_slices = ["", ""]
-        if static_price_query_slices is not None:
-            static_price_query_slices = [", $static_price: BigDecimal", ", staticPrice: $static_price"]
-        query = """
-            mutation postLimitOrder($cryptocurrency: Cryptocurrency, $order_side: OrderSide!, $coin_amount: BigDecimal!,
-            $price_type: PriceType!""" + dynamic_exchange_rate_query_slices[0] + static_price_query_slices[0] + """){
-                postLimitOrder(cryptocurrency: $cryptocurrency, orderSide: $order_side, coinAmount: $coin_amount, 
-                priceType: $price_type""" + dynamic_exchange_rate_query_slices[1] + \
-                static_price_query_slices[1] + """){
-                   """ + type_to_field[BuycoinsType.POST_ORDER] + """
-                }
-            }
-        """
+        query = query_registry.get('postLimitOrder', _post_limit_order_query, dynamic_exchange_rate is not None)
         variables = {'cryptocurrency': cryptocurrency.value, 'order_side': order_side.value, 'coin_amount': coin_amount,
                      'static_price': static_price, 'price_type': price_type.value,
                      'dynamic_exchange_rate': dynamic_exchange_rate}
-
-        data = _wrap_graphql_call(self.client, query=query, variables=variables)
-        return {'data': data['data']['postLimitOrder']}
+        return self._execute(query=query, variables=variables, field='postLimitOrder')
 
     def post_market_order(self, order_side: OrderSide, coin_amount: str,
                           cryptocurrency: Cryptocurrency = Cryptocurrency.BITCOIN) -> dict:
@@ -669,19 +594,9 @@ class BuycoinsGraphqlClient:
             BuycoinsException: An error occurred
 
         """
-
-        query = """
-            mutation postMarketOrder($cryptocurrency: Cryptocurrency, $order_side: OrderSide!, $coin_amount: BigDecimal!){
-                postMarketOrder(cryptocurrency: $cryptocurrency, orderSide: $order_side, coinAmount: $coin_amount){
-                   """ + type_to_field[BuycoinsType.POST_ORDER] + """
-                }
-            }
-        """
-
+        query = query_registry.get('postMarketOrder', _post_market_order_query)
         variables = {'cryptocurrency': cryptocurrency.value, 'order_side': order_side.value, 'coin_amount': coin_amount}
-
-        data = _wrap_graphql_call(self.client, query=query, variables=variables)
-        return {'data': data['data']['postMarketOrder']}
+        return self._execute(query=query, variables=variables, field='postMarketOrder')
 
     def sell(self, price_id: str, coin_amount: str, cryptocurrency: Cryptocurrency = Cryptocurrency.BITCOIN) -> dict:
         """Execute the sell mutation
@@ -699,19 +614,9 @@ class BuycoinsGraphqlClient:
             BuycoinsException: An error occurred
 
         """
-
-        query = """
-            mutation sell($cryptocurrency: Cryptocurrency, $price: ID!, $coin_amount: BigDecimal!){
-                sell(cryptocurrency: $cryptocurrency, price: $price, coin_amount: $coin_amount){
-                   """ + type_to_field[BuycoinsType.ORDER] + """
-                }
-            }
-        """
-
+        query = query_registry.get('sell', _sell_query)
         variables = {'cryptocurrency': cryptocurrency.value, 'price': price_id, 'coin_amount': coin_amount}
-
-        data = _wrap_graphql_call(self.client, query=query, variables=variables)
-        return {'data': data['data']['sell']}
+        return self._execute(query=query, variables=variables, field='sell')
 
     def send(self, address: str, amount: str, cryptocurrency: Cryptocurrency = Cryptocurrency.BITCOIN) -> dict:
         """Executes the send mutation
@@ -727,17 +632,9 @@ class BuycoinsGraphqlClient:
         Raises:
             BuycoinsException: An error occurred
         """
-        query = """
-            mutation send($cryptocurrency: Cryptocurrency, $address: String!, $amount: BigDecimal!){
-                send(cryptocurrency: $cryptocurrency, address: $address, amount: $amount){
-                   """ + type_to_field[BuycoinsType.ONCHAIN_TRANSFER_REQUEST] + """
-                }
-            }
-        """
+        query = query_registry.get('send', _send_query)
         variables = {'cryptocurrency': cryptocurrency.value, 'address': address, 'amount': amount}
-
-        data = _wrap_graphql_call(self.client, query=query, variables=variables)
-        return {'data': data['data']['send']}
+        return self._execute(query=query, variables=variables, field='send')
 
     def send_offchain(self, recipient: str, amount: str,
                       cryptocurrency: Cryptocurrency = Cryptocurrency.BITCOIN) -> dict:
@@ -754,14 +651,6 @@ class BuycoinsGraphqlClient:
         Raises:
             BuycoinsException: An error occurred
         """
-        query = """
-            mutation sendOffchain($cryptocurrency: Cryptocurrency, $recipient: String!, $amount: BigDecimal!){
-                sendOffchain(cryptocurrency: $cryptocurrency, recipient: $recipient, amount: $amount){
-                   initiated
-                }
-            }
-        """
+        query = query_registry.get('sendOffchain', _send_offchain_query)
         variables = {'cryptocurrency': cryptocurrency.value, 'recipient': recipient, 'amount': amount}
-
-        data = _wrap_graphql_call(self.client, query=query, variables=variables)
-        return {'data': data['data']['sendOffchain']}
+        return self._execute(query=query, variables=variables, field='sendOffchain')
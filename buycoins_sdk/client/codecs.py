@@ -0,0 +1,113 @@
+"""
+This module contains the JSON codecs which the transports use to encode requests and decode responses
+"""
+
+import json
+from buycoins_sdk.commons import errors
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+__all__ = [
+    'JSONCodec',
+    'OrjsonCodec',
+    'UjsonCodec',
+    'get_codec'
+]
+
+
+_ENCODER = json.JSONEncoder(separators=(',', ':'))
+
+
+class JSONCodec:
+    """JSONCodec encodes request bodies to bytes and decodes response bodies from bytes with the standard library json
+    module. Subclass it to plug in another JSON library.
+
+    Responses are decoded from UTF-8 to a str before they are parsed, as requests and aiohttp do, since that is faster
+    than letting json.loads detect the encoding of the bytes. See benchmarks/json_codec.py
+
+    """
+    name = 'json'
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encode an object to JSON bytes
+
+        """
+        return _ENCODER.encode(obj).encode()
+
+    def loads(self, data: bytes) -> Any:
+        """Decode JSON bytes to an object
+
+        """
+        return json.loads(data.decode('utf-8'))
+
+
+class OrjsonCodec(JSONCodec):
+    """OrjsonCodec encodes and decodes JSON with orjson, which works on bytes directly. Install it with
+    pip install buycoins_sdk[fast]
+
+    """
+    name = 'orjson'
+
+    def __init__(self):
+        if orjson is None:
+            raise errors.BuycoinsException("orjson is not installed. Install it with pip install buycoins_sdk[fast]")
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class UjsonCodec(JSONCodec):
+    """UjsonCodec encodes and decodes JSON with ujson
+
+    """
+    name = 'ujson'
+
+    def __init__(self):
+        if ujson is None:
+            raise errors.BuycoinsException("ujson is not installed. Install it with pip install ujson")
+
+    def dumps(self, obj: Any) -> bytes:
+        return ujson.dumps(obj, ensure_ascii=False).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return ujson.loads(data)
+
+
+_CODECS = {
+    'json': JSONCodec,
+    'orjson': OrjsonCodec,
+    'ujson': UjsonCodec
+}
+
+
+def get_codec(codec: Union[str, JSONCodec] = 'json') -> JSONCodec:
+    """Returns a JSON codec
+
+    Args:
+        codec: a JSONCodec, or the name of one: json, orjson, ujson, or auto for the fastest one which is installed
+
+    Returns:
+        The JSONCodec
+
+    Raises:
+        BuycoinsException: the codec is unknown or its library is not installed
+    """
+    if isinstance(codec, JSONCodec):
+        return codec
+    if codec == 'auto':
+        codec = 'orjson' if orjson is not None else 'ujson' if ujson is not None else 'json'
+    if codec not in _CODECS:
+        raise errors.BuycoinsException(f"Unknown JSON codec: {codec}")
+    return _CODECS[codec]()
@@ -0,0 +1,451 @@
+"""
+This module contains the GraphQL queries and mutations used by BuycoinsGraphqlClient and the registry which builds and
+minifies each distinct query once
+"""
+
+import re
+import threading
+from buycoins_sdk.commons import type_to_field
+from buycoins_sdk.commons.enums import BuycoinsType
+from typing import Any, Callable, Dict, Tuple
+
+__all__ = [
+    'QueryRegistry',
+    'minify_query',
+    'query_registry'
+]
+
+_WHITESPACE = re.compile(r'\s+')
+_PUNCTUATOR = re.compile(r' ?([{}():,!=\[\]$]) ?')
+
+
+def minify_query(query: str) -> str:
+    """This function strips the whitespace which GraphQL ignores from a query
+
+    Args:
+        query: The GraphQL query string
+
+    Returns:
+        The minified query string
+    """
+    return _PUNCTUATOR.sub(r'\1', _WHITESPACE.sub(' ', query).strip())
+
+
+class QueryRegistry:
+    """QueryRegistry builds each distinct query once, minifies it, and caches it by its shape.
+
+    The shape of a query is its operation name and the flags that change its text, e.g. which pagination arguments are
+    present. Every later call with the same shape gets the cached string, so only the variables have to be built on
+    each call. QueryRegistry is safe to share between threads.
+    """
+
+    def __init__(self):
+        """Create a new, empty QueryRegistry
+
+        """
+        self._queries = {}
+        self._lock = threading.Lock()
+
+    def get(self, operation: str, build: Callable[..., str], *shape: Any) -> str:
+        """Returns the minified query for the shape, building it with build(*shape) on the first call
+
+        Args:
+            operation: The name of the GraphQL operation
+            build: A function which takes the shape and returns the query string
+            *shape: The flags which change the text of the query. They must be hashable
+
+        Returns:
+            The minified query string
+        """
+        key = (operation,) + shape
+        query = self._queries.get(key)
+        if query is None:
+            query = minify_query(build(*shape))
+            with self._lock:
+                query = self._queries.setdefault(key, query)
+        return query
+
+    def __len__(self):
+        return len(self._queries)
+
+    def clear(self):
+        """Remove every cached query
+
+        """
+        with self._lock:
+            self._queries.clear()
+
+
+query_registry = QueryRegistry()
+
+
+def _prepare_graphql_args(variables: Dict[str, Any], first: int = None, last: int = None, after: str = None,
+                          before: str = None) -> Dict[str, Any]:
+    """This function takes in common pagination args for the Connection and prepares them into two variables
+    to be used in GraphQL queries
+
+    Args:
+        variables: The map of GraphQL variables to be passed to GraphQLClient
+        first: For pagination. Returns the first n elements in a list.
+        last: For pagination. Returns the last n elements in a list.
+        after: A string representing a cursor. Returns the elements in the list that come after the specified
+                    cursor.
+        before: A string representing a cursor. Returns the elements in the list that come before the specified
+                    cursor.
+
+    Returns: A dictionary with keys: connection_arg and arg, which represents the arguments for the Connection and the
+            GraphQL query.
+    """
+
+    var = variables
+    connection_arg = ''
+    arg_map = {'first': first, 'last': last, 'after': after, 'before': before}
+    arg = ','
+    for i in arg_map:
+        if arg_map[i] is not None:
+            connection_arg = connection_arg + f"{i}:${i},"
+            if i == 'first' or i == 'last':
+                arg = arg + f"${i}: Int,"
+            elif i == 'after' or i == 'before':
+                arg = arg + f"${i}: String,"
+            var[i] = arg_map[i]
+    if connection_arg != '':
+        connection_arg = connection_arg[:-1]
+        connection_arg = f"({connection_arg})"
+
+    if arg == ',':
+        arg = ''
+    else:
+        arg = arg[:-1]
+
+    return {
+        "connection_arg": connection_arg,
+        "arg": arg,
+        'variables': var
+    }
+
+
+def _pagination_shape(first: int = None, last: int = None, after: str = None,
+                      before: str = None) -> Tuple[bool, bool, bool, bool]:
+    """Returns which of the pagination arguments are present
+
+    """
+    return first is not None, last is not None, after is not None, before is not None
+
+
+def _pagination_variables(variables: Dict[str, Any], first: int = None, last: int = None, after: str = None,
+                          before: str = None) -> Dict[str, Any]:
+    """Adds the pagination arguments which are present to the variables
+
+    Args:
+        variables: The map of GraphQL variables to be passed to GraphQLClient
+        first: For pagination. Returns the first n elements in a list.
+        last: For pagination. Returns the last n elements in a list.
+        after: A cursor. Returns the elements in the list that come after the specified cursor.
+        before: A cursor. Returns the elements in the list that come before the specified cursor.
+
+    Returns:
+        The variables
+    """
+    if first is not None:
+        variables['first'] = first
+    if last is not None:
+        variables['last'] = last
+    if after is not None:
+        variables['after'] = after
+    if before is not None:
+        variables['before'] = before
+    return variables
+
+
+def _pagination_args(has_first: bool, has_last: bool, has_after: bool, has_before: bool) -> Dict[str, Any]:
+    """Returns the connection_arg and arg of _prepare_graphql_args for a pagination shape
+
+    """
+    return _prepare_graphql_args({}, 0 if has_first else None, 0 if has_last else None, '' if has_after else None,
+                                 '' if has_before else None)
+
+
+def _get_balances_query(has_cryptocurrency: bool) -> str:
+    if not has_cryptocurrency:
+        return """
+            query getBalances{
+                getBalances{
+                    """ + type_to_field[BuycoinsType.ACCOUNT] + """
+                }
+            }
+        """
+    return """
+        query getBalances($cryptocurrency: Cryptocurrency){
+            getBalances(cryptocurrency: $cryptocurrency){
+                """ + type_to_field[BuycoinsType.ACCOUNT] + """
+            }
+        }
+    """
+
+
+def _get_bank_accounts_query(has_account_number: bool) -> str:
+    if not has_account_number:
+        return """
+            query getBankAccounts{
+                getBankAccounts{
+                    """ + type_to_field[BuycoinsType.BANK_ACCOUNT] + """
+                }
+            }
+        """
+    return """
+        query getBankAccounts($accountNumber: String){
+            getBankAccounts(accountNumber: $accountNumber){
+                """ + type_to_field[BuycoinsType.BANK_ACCOUNT] + """
+            }
+        }
+    """
+
+
+def _get_estimated_network_fee_query() -> str:
+    return """
+        query getEstimatedNetworkFee($cryptocurrency: Cryptocurrency, $amount: BigDecimal!){
+            getEstimatedNetworkFee(cryptocurrency: $cryptocurrency, amount: $amount){
+                estimatedFee
+                total
+            }
+        }
+    """
+
+
+def _get_market_book_query(*pagination: bool) -> str:
+    args = _pagination_args(*pagination)
+    return """
+        query getMarketBook($cryptocurrency: Cryptocurrency""" + args['arg'] + """){
+          getMarketBook(cryptocurrency: $cryptocurrency){
+            dynamicPriceExpiry
+            orders""" + args['connection_arg'] + """{
+              pageInfo{
+                endCursor
+                hasNextPage
+                hasPreviousPage
+                startCursor
+              }
+              edges{
+                cursor
+                node{
+                  """ + type_to_field[BuycoinsType.POST_ORDER] + """
+                }
+              }
+            }
+          }
+        }
+    """
+
+
+def _get_orders_query(has_first: bool, has_last: bool, has_after: bool, has_before: bool, has_side: bool) -> str:
+    args = _pagination_args(has_first, has_last, has_after, has_before)
+    arg = args['arg']
+
+    # get the arguments for the getOrders query
+    get_orders_args = ""
+    if has_side:
+        get_orders_args = "side: $side"
+        arg = arg + ", $side: OrderSide"
+    return """
+        query getOrders($cryptocurrency: Cryptocurrency, $status: GetOrdersStatus!""" + arg + """){
+          getOrders(cryptocurrency: $cryptocurrency, status: $status, """ + get_orders_args + """ ){
+            dynamicPriceExpiry
+            orders""" + args['connection_arg'] + """{
+              pageInfo{
+                endCursor
+                hasNextPage
+                hasPreviousPage
+                startCursor
+              }
+              edges{
+                cursor
+                node{
+                  """ + type_to_field[BuycoinsType.POST_ORDER] + """
+                }
+              }
+            }
+          }
+        }
+    """
+
+
+def _get_payments_query(*pagination: bool) -> str:
+    args = _pagination_args(*pagination)
+    arg = args['arg']
+    if arg != "":
+        arg = arg[1:]
+        arg = f"({arg})"
+    return """
+        query getPayments""" + arg + """{
+          getPayments""" + args['connection_arg'] + """{
+            pageInfo{
+                endCursor
+                hasNextPage
+                hasPreviousPage
+                startCursor
+            }
+            edges{
+                cursor
+                node{
+                  """ + type_to_field[BuycoinsType.PAYMENT] + """
+                }
+            }
+          }
+        }
+    """
+
+
+def _get_prices_query(has_cryptocurrency: bool) -> str:
+    if not has_cryptocurrency:
+        return """
+            query getPrices{
+              getPrices{
+                """ + type_to_field[BuycoinsType.BUYCOINS_PRICE] + """
+              }
+            }
+        """
+    return """
+        query getPrices($cryptocurrency: Cryptocurrency){
+          getPrices(cryptocurrency: $cryptocurrency){
+            """ + type_to_field[BuycoinsType.BUYCOINS_PRICE] + """
+          }
+        }
+    """
+
+
+def _node_query(gql_type: BuycoinsType) -> str:
+    return """
+        query node($id: ID!){
+            node(id: $id){
+                 ... on """ + gql_type.value + """ {
+                    """ + type_to_field[gql_type] + """
+                }
+            }
+        }
+    """
+
+
+def _nodes_query(*gql_types: BuycoinsType) -> str:
+    on_part_of_query = """"""
+    for i in dict.fromkeys(gql_types):
+        on_part_of_query = on_part_of_query + "\n" + """
+            ... on """ + i.value + """{
+                """ + type_to_field[i] + """
+            }
+        """
+    return """
+        query nodes($ids: [ID!]!){
+            nodes(ids: $ids){
+                """ + on_part_of_query + """
+            }
+        }
+    """
+
+
+def _buy_query() -> str:
+    return """
+        mutation buy($cryptocurrency: Cryptocurrency, $price: ID!, $coin_amount: BigDecimal!){
+            buy(cryptocurrency: $cryptocurrency, price: $price, coin_amount: $coin_amount){
+               """ + type_to_field[BuycoinsType.ORDER] + """
+            }
+        }
+    """
+
+
+def _cancel_withdrawal_query() -> str:
+    return """
+        mutation cancelWithdrawal($payment: ID!){
+            cancelWithdrawal(payment: $payment){
+               """ + type_to_field[BuycoinsType.PAYMENT] + """
+            }
+        }
+    """
+
+
+def _create_address_query() -> str:
+    return """
+        mutation createAddress($cryptocurrency: Cryptocurrency){
+            createAddress(cryptocurrency: $cryptocurrency){
+                """ + type_to_field[BuycoinsType.ADDRESS] + """
+            }
+        }
+    """
+
+
+def _create_deposit_account_query() -> str:
+    return """
+        mutation createDepositAccount($account_name: String!){
+            createDepositAccount(accountName: $account_name){
+               """ + type_to_field[BuycoinsType.DEPOSIT_ACCOUNT] + """
+            }
+        }
+    """
+
+
+def _create_withdrawal_query() -> str:
+    return """
+        mutation createWithdrawal($bank_account: ID!, $amount: BigDecimal!){
+            createWithdrawal(bankAccount: $bank_account, amount: $amount){
+               """ + type_to_field[BuycoinsType.PAYMENT] + """
+            }
+        }
+    """
+
+
+def _post_limit_order_query(has_dynamic_exchange_rate: bool) -> str:
+    dynamic_exchange_rate_query_slices = ["", ""]
+    if has_dynamic_exchange_rate:
+        dynamic_exchange_rate_query_slices = [", $dynamic_exchange_rate: BigDecimal", ", dynamicExchangeRate: "
+                                                                                      "$dynamic_exchange_rate"]
+    static_price_query_slices = [", $static_price: BigDecimal", ", staticPrice: $static_price"]
+    return """
+        mutation postLimitOrder($cryptocurrency: Cryptocurrency, $order_side: OrderSide!, $coin_amount: BigDecimal!,
+        $price_type: PriceType!""" + dynamic_exchange_rate_query_slices[0] + static_price_query_slices[0] + """){
+            postLimitOrder(cryptocurrency: $cryptocurrency, orderSide: $order_side, coinAmount: $coin_amount,
+            priceType: $price_type""" + dynamic_exchange_rate_query_slices[1] + \
+            static_price_query_slices[1] + """){
+               """ + type_to_field[BuycoinsType.POST_ORDER] + """
+            }
+        }
+    """
+
+
+def _post_market_order_query() -> str:
+    return """
+        mutation postMarketOrder($cryptocurrency: Cryptocurrency, $order_side: OrderSide!, $coin_amount: BigDecimal!){
+            postMarketOrder(cryptocurrency: $cryptocurrency, orderSide: $order_side, coinAmount: $coin_amount){
+               """ + type_to_field[BuycoinsType.POST_ORDER] + """
+            }
+        }
+    """
+
+
+def _sell_query() -> str:
+    return """
+        mutation sell($cryptocurrency: Cryptocurrency, $price: ID!, $coin_amount: BigDecimal!){
+            sell(cryptocurrency: $cryptocurrency, price: $price, coin_amount: $coin_amount){
+               """ + type_to_field[BuycoinsType.ORDER] + """
+            }
+        }
+    """
+
+
+def _send_query() -> str:
+    return """
+        mutation send($cryptocurrency: Cryptocurrency, $address: String!, $amount: BigDecimal!){
+            send(cryptocurrency: $cryptocurrency, address: $address, amount: $amount){
+               """ + type_to_field[BuycoinsType.ONCHAIN_TRANSFER_REQUEST] + """
+            }
+        }
+    """
+
+
+def _send_offchain_query() -> str:
+    return """
+        mutation sendOffchain($cryptocurrency: Cryptocurrency, $recipient: String!, $amount: BigDecimal!){
+            sendOffchain(cryptocurrency: $cryptocurrency, recipient: $recipient, amount: $amount){
+               initiated
+            }
+        }
+    """
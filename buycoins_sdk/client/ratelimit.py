@@ -0,0 +1,184 @@
+"""
+This module contains the token buckets and the rate limiter used by the transports to pace requests
+"""
+
+import os
+import struct
+import threading
+import time
+from buycoins_sdk.client.retry import _is_mutation
+from buycoins_sdk.commons import errors
+from typing import Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+__all__ = [
+    'TokenBucket',
+    'FileTokenBucket',
+    'RateLimiter'
+]
+
+
+class TokenBucket:
+    """TokenBucket allows rate requests per second on average, with bursts of up to capacity requests.
+
+    Requests reserve tokens with reserve(), which never fails: it takes the tokens straight away, even if that leaves
+    the bucket in debt, and returns the number of seconds the caller has to wait before sending the request. This
+    paces concurrent callers fairly, in the order they reserved. A TokenBucket is safe to share between threads.
+
+    Attributes:
+        rate: the number of tokens added to the bucket every second
+        capacity: the maximum number of tokens in the bucket, which is the largest burst allowed
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        """Create a new TokenBucket, which starts full
+
+        Args:
+            rate: the number of requests allowed per second on average
+            capacity: the largest burst of requests allowed. Defaults to rate
+        """
+        if rate <= 0:
+            raise errors.BuycoinsException("The rate of a TokenBucket must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self, tokens: float, available: float, elapsed: float) -> Tuple[float, float]:
+        """Refills available tokens for the elapsed seconds and takes tokens away. Returns the tokens left and the
+        number of seconds to wait
+
+        """
+        available = min(self.capacity, available + max(0.0, elapsed) * self.rate) - tokens
+        return available, (0.0 if available >= 0 else -available / self.rate)
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Takes tokens from the bucket
+
+        Args:
+            tokens: the number of tokens to take
+
+        Returns:
+            The number of seconds to wait before the request may be sent
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens, wait = self._take(tokens, self._tokens, now - self._updated)
+            self._updated = now
+            return wait
+
+    def acquire(self, tokens: float = 1.0):
+        """Takes tokens from the bucket, sleeping until the request may be sent
+
+        Args:
+            tokens: the number of tokens to take
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+
+class FileTokenBucket(TokenBucket):
+    """FileTokenBucket is a TokenBucket whose state lives in a small file, so every process on the host which opens the
+    same path shares one bucket. Access to the file is serialized with flock, so it is only available on POSIX systems.
+
+    Attributes:
+        path: the path of the file holding the state of the bucket
+    """
+
+    _STATE = struct.Struct('dd')
+
+    def __init__(self, path: str, rate: float, capacity: float = None):
+        """Create a new FileTokenBucket. The bucket starts full if the file does not exist yet
+
+        Args:
+            path: the path of the file holding the state of the bucket. Every process must use the same path
+            rate: the number of requests allowed per second on average, across every process
+            capacity: the largest burst of requests allowed. Defaults to rate
+        """
+        if fcntl is None:
+            raise errors.BuycoinsException("FileTokenBucket needs fcntl, which is not available on this platform")
+        super().__init__(rate, capacity)
+        self.path = path
+        self._fd = None
+        self._pid = None
+
+    def _file(self) -> int:
+        """Returns the file descriptor of the state file, opening it again in a forked process so that flock works
+        between the parent and the child
+
+        """
+        if self._pid != os.getpid():
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            self._pid = os.getpid()
+        return self._fd
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        with self._lock:
+            fd = self._file()
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                now = time.time()
+                state = os.pread(fd, self._STATE.size, 0)
+                available, updated = self._STATE.unpack(state) if len(state) == self._STATE.size \
+                    else (self.capacity, now)
+                available, wait = self._take(tokens, available, now - updated)
+                os.pwrite(fd, self._STATE.pack(available, now), 0)
+                return wait
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def close(self):
+        """Close the state file. It is opened again if the bucket is used after this
+
+        """
+        with self._lock:
+            if self._fd is not None and self._pid == os.getpid():
+                os.close(self._fd)
+            self._fd = None
+            self._pid = None
+
+
+class RateLimiter:
+    """RateLimiter paces the requests of a client with separate budgets for queries and mutations, so that requests wait
+    on the client instead of being rejected by the Buycoins API with 429 responses.
+
+    Share one RateLimiter between clients (and threads) to give them a common budget, or use FileTokenBucket buckets
+    to share the budget with other processes on the host.
+
+    Example:
+        limiter = RateLimiter(queries=TokenBucket(rate=10, capacity=20),
+                              mutations=FileTokenBucket('/tmp/buycoins-mutations', rate=1))
+        client = BuycoinsGraphqlClient(public_key, secret_key, rate_limiter=limiter)
+
+    Attributes:
+        queries: the TokenBucket of queries, or None if queries are not limited
+        mutations: the TokenBucket of mutations, or None if mutations are not limited
+    """
+
+    def __init__(self, queries: TokenBucket = None, mutations: TokenBucket = None):
+        """Create a new RateLimiter
+
+        Args:
+            queries: the TokenBucket of queries. None means queries are not limited
+            mutations: the TokenBucket of mutations. None means mutations are not limited
+        """
+        self.queries = queries
+        self.mutations = mutations
+
+    def reserve(self, query: str) -> float:
+        """Takes a token for a request from the bucket of its kind
+
+        Args:
+            query: the GraphQL query string of the request
+
+        Returns:
+            The number of seconds to wait before the request may be sent
+        """
+        bucket = self.mutations if _is_mutation(query) else self.queries
+        return bucket.reserve() if bucket is not None else 0.0
@@ -0,0 +1,187 @@
+"""
+This module contains the retry policy and the retry budget used by the transports
+"""
+
+import asyncio
+import random
+import sys
+import threading
+from buycoins_sdk.commons import errors
+from requests import exceptions
+from typing import Optional, Tuple, Union
+
+__all__ = [
+    'RetryBudget',
+    'RetryPolicy',
+    'default_retry_budget'
+]
+
+
+def _split_timeout(timeout: Union[None, float, Tuple[float, float]]) -> Tuple[Optional[float], Optional[float]]:
+    """Returns the connect and read timeouts of a timeout given as a number of seconds or a (connect, read) tuple
+
+    """
+    if isinstance(timeout, tuple):
+        return timeout
+    return timeout, timeout
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    """Returns the HTTP status code of an error raised for an HTTP error response, else None
+
+    """
+    if isinstance(error, exceptions.HTTPError):
+        return error.response.status_code if error.response is not None else None
+    if isinstance(error, errors.BuycoinsHTTPException):
+        return error.status_code
+    return None
+
+
+def _is_connection_error(error: BaseException) -> bool:
+    """Returns whether an error is a connection error or a timeout
+
+    """
+    if isinstance(error, (exceptions.ConnectionError, exceptions.Timeout, asyncio.TimeoutError)):
+        return True
+    # aiohttp is only installed with the async extra, and its errors can only be raised once it has been imported
+    aiohttp = sys.modules.get('aiohttp')
+    return aiohttp is not None and isinstance(error, aiohttp.ClientConnectionError)
+
+
+def _is_mutation(query: str) -> bool:
+    """Returns whether a GraphQL document is a mutation
+
+    """
+    return query.lstrip().startswith('mutation')
+
+
+class RetryBudget:
+    """RetryBudget stops retries from multiplying the load on the Buycoins API during an outage.
+
+    The budget holds max_tokens tokens. Every failed attempt takes a token away and every successful request gives
+    back token_ratio of a token. Retries are only allowed while more than half of the tokens are left, so once most
+    requests are failing the clients stop retrying until requests start succeeding again. A RetryBudget is safe to
+    share between threads and clients.
+
+    Attributes:
+        max_tokens: the number of tokens in a full budget
+        token_ratio: the fraction of a token given back by every successful request
+        tokens: the number of tokens left
+    """
+
+    def __init__(self, max_tokens: float = 10.0, token_ratio: float = 0.1):
+        """Create a new RetryBudget
+
+        Args:
+            max_tokens: the number of tokens in a full budget
+            token_ratio: the fraction of a token given back by every successful request
+        """
+        self.max_tokens = max_tokens
+        self.token_ratio = token_ratio
+        self.tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def record_success(self):
+        """Give back token_ratio of a token after a successful request
+
+        """
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.token_ratio)
+
+    def record_failure(self):
+        """Take away a token after a failed attempt
+
+        """
+        with self._lock:
+            self.tokens = max(0.0, self.tokens - 1)
+
+    def can_retry(self) -> bool:
+        """Returns whether the budget allows another retry
+
+        """
+        return self.tokens > self.max_tokens / 2
+
+
+default_retry_budget = RetryBudget()
+
+
+class RetryPolicy:
+    """RetryPolicy decides which failed requests are retried and how long to wait before each retry.
+
+    Only connection errors, timeouts and 5xx responses are retried. Queries are retried but mutations never are,
+    unless retry_mutations is set, because a mutation which timed out may still have been carried out. The wait
+    before retry n is a random number of seconds between 0 and min(max_backoff, backoff_factor * 2 ** n)
+    (exponential backoff with full jitter), so that clients which failed together do not retry together.
+
+    Attributes:
+        max_retries: the maximum number of retries of a request
+        backoff_factor: the base of the exponential backoff in seconds
+        max_backoff: the maximum number of seconds to wait before a retry
+        retry_mutations: whether mutations are retried too
+        budget: the RetryBudget shared by the requests which use this policy
+    """
+
+    def __init__(self, max_retries: int = 3, backoff_factor: float = 0.1, max_backoff: float = 10.0,
+                 retry_mutations: bool = False, budget: RetryBudget = None):
+        """Create a new RetryPolicy
+
+        Args:
+            max_retries: the maximum number of retries of a request. 0 turns retries off
+            backoff_factor: the base of the exponential backoff in seconds
+            max_backoff: the maximum number of seconds to wait before a retry
+            retry_mutations: whether to retry mutations too. Only set this if retrying your mutations is safe
+            budget: the RetryBudget to draw retries from. Defaults to a budget shared by every client in the process
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.retry_mutations = retry_mutations
+        self.budget = budget if budget is not None else default_retry_budget
+
+    def is_retryable(self, error: Exception) -> bool:
+        """Returns whether a request which failed with error may be retried
+
+        Args:
+            error: the exception raised by the request
+
+        Returns:
+            True for connection errors, timeouts and 5xx responses
+        """
+        status_code = _status_code(error)
+        if status_code is not None:
+            return status_code >= 500
+        return _is_connection_error(error)
+
+    def should_retry(self, query: str, error: Exception, attempt: int, retry_mutations: bool = None) -> bool:
+        """Returns whether to retry a request after it failed, and records retryable failures in the retry budget
+
+        Args:
+            query: the GraphQL query string of the request
+            error: the exception raised by the request
+            attempt: the number of retries already made
+            retry_mutations: overrides the retry_mutations of the policy for this request
+
+        Returns:
+            Whether the request should be retried
+        """
+        if not self.is_retryable(error):
+            return False
+        self.budget.record_failure()
+        if retry_mutations is None:
+            retry_mutations = self.retry_mutations
+        if attempt >= self.max_retries:
+            return False
+        if _is_mutation(query) and not retry_mutations:
+            return False
+        return self.budget.can_retry()
+
+    def backoff(self, attempt: int) -> float:
+        """Returns the number of seconds to wait before a retry
+
+        Args:
+            attempt: the number of retries already made
+
+        Returns:
+            A random number of seconds between 0 and min(max_backoff, backoff_factor * 2 ** attempt)
+        """
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * 2 ** attempt))
@@ -0,0 +1,124 @@
+"""
+This module contains SingleFlight, which coalesces identical concurrent requests into one
+"""
+
+import asyncio
+import json
+import threading
+from typing import Any, Awaitable, Callable, Hashable
+
+__all__ = [
+    'SingleFlight'
+]
+
+
+def _request_key(query: str, variables: dict) -> tuple:
+    """Returns the key of a request: the query with its variables in a canonical form, so that the same variables given
+    in a different order give the same key
+
+    """
+    return query, json.dumps(variables, sort_keys=True, separators=(',', ':'), default=str)
+
+
+def _call_key(query: str, variables: dict, options: dict) -> tuple:
+    """Returns the key of a call: the key of its request and the per-call options it is sent with, so that clients made
+    with with_options() only share calls made with the same timeout and retry policy
+
+    """
+    return _request_key(query, variables) + (tuple(sorted(options.items())),)
+
+
+class _Call:
+    """_Call is a call in flight, which the other callers with the same key wait on
+
+    """
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """SingleFlight makes concurrent calls with the same key share one execution: the first caller runs the function
+    and every caller which arrives while it is running waits for it and gets the same result, or the same exception.
+    Once the call finishes, the next call with the key runs the function again, so results are never cached.
+
+    do() coalesces calls made from different threads, and do_async() coalesces coroutines running on one event loop.
+    The result is shared between callers, so it must not be modified.
+
+    Attributes:
+        shared: the number of calls which got the result of another call instead of running the function
+    """
+
+    def __init__(self):
+        """Create a new SingleFlight
+
+        """
+        self.shared = 0
+        self._calls = {}
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        """Runs function, unless a call with the same key is already running, in which case it waits for that call
+
+        Args:
+            key: the key of the call
+            function: the function to run
+
+        Returns:
+            The result of the function
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+        except BaseException as err:
+            call.error = err
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    async def do_async(self, key: Hashable, function: Callable[[], Awaitable[Any]]) -> Any:
+        """Awaits function(), unless a call with the same key is already running, in which case it waits for that call.
+        Cancelling one caller does not cancel the call the other callers are waiting for.
+
+        Args:
+            key: the key of the call
+            function: the coroutine function to run
+
+        Returns:
+            The result of the coroutine
+        """
+        future = self._futures.get(key)
+        if future is None:
+            future = asyncio.ensure_future(function())
+            self._futures[key] = future
+
+            def done(finished: asyncio.Future):
+                self._futures.pop(key, None)
+                if not finished.cancelled():
+                    # mark the exception as retrieved even if every caller was cancelled
+                    finished.exception()
+
+            future.add_done_callback(done)
+        else:
+            self.shared += 1
+        return await asyncio.shield(future)
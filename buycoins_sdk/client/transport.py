@@ -0,0 +1,403 @@
+"""
+This module contains the HTTP transport used by BuycoinsGraphqlClient to talk to the Buycoins API
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+from buycoins_sdk.client.codecs import JSONCodec, get_codec
+from buycoins_sdk.client.breaker import CircuitBreaker
+from buycoins_sdk.client.ratelimit import RateLimiter
+from buycoins_sdk.client.retry import RetryPolicy, _split_timeout
+from buycoins_sdk.commons import errors
+from python_graphql_client import GraphqlClient
+from requests import Session
+from requests.adapters import HTTPAdapter
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple, Union
+
+__all__ = [
+    'PooledGraphqlClient',
+    'AsyncPooledGraphqlClient',
+    'DEFAULT_TIMEOUT'
+]
+
+DEFAULT_TIMEOUT = (5.0, 30.0)
+
+
+@lru_cache(maxsize=512)
+def _query_hash(query: str) -> str:
+    """Returns the SHA-256 hash of a query as a hex string. Hashes are memoized per query string
+
+    """
+    return hashlib.sha256(query.encode()).hexdigest()
+
+
+def _request_body(query: str, variables: dict = None, operation_name: str = None, persisted: bool = False,
+                  include_query: bool = True) -> dict:
+    """Builds the JSON body of a GraphQL request
+
+    Args:
+        query: the GraphQL query string
+        variables: the variables used within the GraphQL query
+        operation_name: the name of the operation to execute
+        persisted: whether to add the hash of the query for automatic persisted queries
+        include_query: whether to send the text of the query
+
+    Returns:
+        The request body
+    """
+    request_body = {}
+    if include_query:
+        request_body['query'] = query
+    if variables:
+        request_body['variables'] = variables
+    if operation_name:
+        request_body['operationName'] = operation_name
+    if persisted:
+        request_body['extensions'] = {'persistedQuery': {'version': 1, 'sha256Hash': _query_hash(query)}}
+    return request_body
+
+
+def _aiohttp():
+    """Returns the aiohttp module, which is only needed by the asynchronous client
+
+    Raises:
+        BuycoinsException: aiohttp is not installed
+    """
+    try:
+        import aiohttp
+    except ImportError:
+        raise errors.BuycoinsException("aiohttp is not installed. Install it with pip install buycoins_sdk[async]")
+    return aiohttp
+
+
+def _persisted_query_error(data: dict) -> Optional[str]:
+    """Returns PersistedQueryNotFound or PersistedQueryNotSupported if the response contains either error, else None
+
+    """
+    for error in data.get('errors') or []:
+        message = error.get('message')
+        code = (error.get('extensions') or {}).get('code')
+        if message == 'PersistedQueryNotFound' or code == 'PERSISTED_QUERY_NOT_FOUND':
+            return 'PersistedQueryNotFound'
+        if message == 'PersistedQueryNotSupported' or code == 'PERSISTED_QUERY_NOT_SUPPORTED':
+            return 'PersistedQueryNotSupported'
+    return None
+
+
+class PooledGraphqlClient(GraphqlClient):
+    """PooledGraphqlClient is a GraphqlClient which sends every request over a shared pool of keep-alive connections
+    instead of opening a new connection (and doing a new TLS handshake) for each request.
+
+    It is safe to share a PooledGraphqlClient between threads. Every thread gets its own requests.Session but all the
+    sessions are mounted on the same HTTPAdapter, so they all draw connections from the same pool.
+
+    With persisted_queries, requests use automatic persisted queries: only the SHA-256 hash of the query is sent with
+    the variables, and the full query text is sent once, when the server answers PersistedQueryNotFound. If the
+    server answers PersistedQueryNotSupported, the client goes back to sending the full query text.
+
+    Request bodies are encoded straight to bytes and responses are decoded straight from bytes with the client's JSON
+    codec, so a faster JSON library such as orjson can be plugged in.
+
+    Every request has a connect timeout and a read timeout, and requests which fail with a connection error, a timeout
+    or a 5xx response are retried according to the client's RetryPolicy. Mutations are not retried unless the policy
+    or the call allows it. With a RateLimiter, every attempt waits for a token before it is sent. With a
+    CircuitBreaker, attempts fail fast with a CircuitOpenException while the breaker is open.
+
+    Attributes:
+        endpoint: the URL of the GraphQL API
+        headers: the headers sent with every request
+        pool_connections: the number of hosts to keep a connection pool for
+        pool_maxsize: the maximum number of keep-alive connections kept open per host
+        pool_block: whether a request should wait for a free connection when pool_maxsize connections to a host are
+                    already in use, instead of opening a connection which is discarded after the request
+        persisted_queries: whether requests use automatic persisted queries
+        codec: the JSONCodec used to encode requests and decode responses
+        timeout: the timeout of every request, in seconds or as a (connect, read) tuple. None means no timeout
+        retry: the RetryPolicy of every request
+        rate_limiter: the RateLimiter pacing every request, or None
+        circuit_breaker: the CircuitBreaker guarding every request, or None
+    """
+
+    def __init__(self, endpoint: str, headers: dict = None, pool_connections: int = 10, pool_maxsize: int = 10,
+                 pool_block: bool = False, persisted_queries: bool = False, codec: Union[str, JSONCodec] = 'json',
+                 timeout: Union[None, float, Tuple[float, float]] = DEFAULT_TIMEOUT, retry: RetryPolicy = None,
+                 rate_limiter: RateLimiter = None, circuit_breaker: CircuitBreaker = None, **kwargs: Any):
+        """Create a new PooledGraphqlClient
+
+        Args:
+            endpoint: the URL of the GraphQL API
+            headers: the headers to send with every request
+            pool_connections: the number of hosts to keep a connection pool for
+            pool_maxsize: the maximum number of keep-alive connections kept open per host
+            pool_block: whether to wait for a free connection once pool_maxsize connections to a host are in use
+            persisted_queries: whether to use automatic persisted queries
+            codec: a JSONCodec or the name of one (json, orjson, ujson or auto)
+            timeout: the timeout of every request, in seconds or as a (connect, read) tuple. None means no timeout
+            retry: the RetryPolicy of every request. Defaults to RetryPolicy()
+            rate_limiter: the RateLimiter pacing every request. None means requests are not paced
+            circuit_breaker: the CircuitBreaker guarding every request. None means there is no circuit breaker
+            **kwargs: other keyword arguments passed to requests on every request
+        """
+        super().__init__(endpoint, headers=headers or {}, **kwargs)
+        self.persisted_queries = persisted_queries
+        self.codec = get_codec(codec)
+        self.timeout = timeout
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self._adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                    pool_block=pool_block)
+        self._local = threading.local()
+        self._sessions: Dict[int, Session] = {}
+        self._lock = threading.Lock()
+
+    def _get_session(self) -> Session:
+        """Returns the requests.Session of the current thread, creating it if it doesn't exist yet
+
+        """
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = Session()
+            session.mount('https://', self._adapter)
+            session.mount('http://', self._adapter)
+            self._local.session = session
+            with self._lock:
+                # drop the sessions of threads which have exited, so they don't pile up as threads come and go. Their
+                # connections belong to the shared adapter, so the sessions are not closed
+                alive = {thread.ident for thread in threading.enumerate()}
+                for ident in [ident for ident in self._sessions if ident not in alive]:
+                    del self._sessions[ident]
+                self._sessions[threading.get_ident()] = session
+        return session
+
+    def execute(self, query: str, variables: dict = None, operation_name: str = None, headers: dict = None,
+                timeout: Union[float, Tuple[float, float]] = None, retry: RetryPolicy = None,
+                retry_mutations: bool = None, **kwargs: Any):
+        """Make a synchronous request to the GraphQL API over a pooled connection, retrying it if it fails
+
+        Args:
+            query: the GraphQL query string
+            variables: the variables used within the GraphQL query
+            operation_name: the name of the operation to execute
+            headers: extra headers to send with this request
+            timeout: the timeout of this request. Defaults to the timeout of the client
+            retry: the RetryPolicy of this request. Defaults to the policy of the client
+            retry_mutations: whether to retry this request if it is a mutation. Defaults to the policy's setting
+            **kwargs: other keyword arguments passed to requests for this request
+
+        Returns:
+            The decoded JSON response
+        """
+        policy = retry if retry is not None else self.retry
+        timeout = timeout if timeout is not None else self.timeout
+        attempt = 0
+        while True:
+            wait, probe = self._before_attempt(query)
+            if wait > 0:
+                time.sleep(wait)
+            started = time.monotonic()
+            try:
+                data = self._send(query, variables, operation_name, headers, timeout=timeout, **kwargs)
+            except BaseException as err:
+                self._after_attempt(started, probe, err)
+                if not isinstance(err, Exception) or not policy.should_retry(query, err, attempt, retry_mutations):
+                    raise
+                time.sleep(policy.backoff(attempt))
+                attempt += 1
+            else:
+                self._after_attempt(started, probe)
+                policy.budget.record_success()
+                return data
+
+    def _before_attempt(self, query: str) -> Tuple[float, Optional[int]]:
+        """Checks the circuit breaker and takes a rate limiter token before an attempt is sent
+
+        Returns:
+            The number of seconds to wait before sending the attempt, and the probe token the circuit breaker gave it
+
+        Raises:
+            CircuitOpenException: the circuit breaker is open
+        """
+        probe = self.circuit_breaker.before_call() if self.circuit_breaker is not None else None
+        return self.rate_limiter.reserve(query) if self.rate_limiter is not None else 0.0, probe
+
+    def _after_attempt(self, started: float, probe: Optional[int], error: BaseException = None):
+        """Records the outcome of an attempt in the circuit breaker
+
+        """
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record(error, time.monotonic() - started, probe=probe)
+
+    def _send(self, query: str, variables: dict = None, operation_name: str = None, headers: dict = None,
+              **kwargs: Any) -> dict:
+        """Sends a request once, with the automatic persisted query handshake if persisted queries are used
+
+        """
+        if self.persisted_queries:
+            data = self._post(_request_body(query, variables, operation_name, persisted=True, include_query=False),
+                              headers, **kwargs)
+            error = _persisted_query_error(data)
+            if error is None:
+                return data
+            if error == 'PersistedQueryNotSupported':
+                self.persisted_queries = False
+            return self._post(_request_body(query, variables, operation_name, persisted=self.persisted_queries),
+                              headers, **kwargs)
+        return self._post(_request_body(query, variables, operation_name), headers, **kwargs)
+
+    def _post(self, request_body: dict, headers: dict = None, **kwargs: Any) -> dict:
+        """Posts a request body to the GraphQL API and returns the decoded JSON response
+
+        """
+        result = self._get_session().post(
+            self.endpoint,
+            data=self.codec.dumps(request_body),
+            headers={'Content-Type': 'application/json', **self.headers, **(headers or {})},
+            **{**self.options, **kwargs}
+        )
+        result.raise_for_status()
+        return self.codec.loads(result.content)
+
+    def close(self):
+        """Close every pooled connection. The client opens new connections if it is used again after this
+
+        """
+        with self._lock:
+            sessions, self._sessions = list(self._sessions.values()), {}
+            self._local = threading.local()
+        for session in sessions:
+            session.close()
+        self._adapter.close()
+
+
+class AsyncPooledGraphqlClient(PooledGraphqlClient):
+    """AsyncPooledGraphqlClient is a PooledGraphqlClient which can also make non-blocking requests with execute_async.
+
+    Asynchronous requests are sent over a single aiohttp.ClientSession which is created on the first call to
+    execute_async, so the client must only be used from the event loop it was first used in. aiohttp is installed with
+    pip install buycoins_sdk[async].
+
+    Attributes:
+        limit: the maximum number of simultaneous asynchronous connections
+        limit_per_host: the maximum number of simultaneous asynchronous connections to one host. 0 means no limit
+        keepalive_timeout: the number of seconds an idle asynchronous connection is kept alive
+    """
+
+    def __init__(self, endpoint: str, headers: dict = None, limit: int = 100, limit_per_host: int = 0,
+                 keepalive_timeout: float = 15.0, **kwargs: Any):
+        """Create a new AsyncPooledGraphqlClient
+
+        Args:
+            endpoint: the URL of the GraphQL API
+            headers: the headers to send with every request
+            limit: the maximum number of simultaneous asynchronous connections
+            limit_per_host: the maximum number of simultaneous asynchronous connections to one host. 0 means no limit
+            keepalive_timeout: the number of seconds an idle asynchronous connection is kept alive
+            **kwargs: other keyword arguments passed to PooledGraphqlClient
+        """
+        super().__init__(endpoint, headers=headers, **kwargs)
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self._session = None
+
+    def _get_async_session(self) -> 'aiohttp.ClientSession':
+        """Returns the aiohttp.ClientSession of the client, creating it if it doesn't exist yet
+
+        """
+        if self._session is None or self._session.closed:
+            aiohttp = _aiohttp()
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host,
+                                             keepalive_timeout=self.keepalive_timeout)
+            self._session = aiohttp.ClientSession(connector=connector, headers=self.headers)
+        return self._session
+
+    async def execute_async(self, query: str, variables: dict = None, operation_name: str = None,
+                            headers: dict = None, timeout: Union[float, Tuple[float, float]] = None,
+                            retry: RetryPolicy = None, retry_mutations: bool = None):
+        """Make an asynchronous request to the GraphQL API over a pooled connection, retrying it if it fails
+
+        Args:
+            query: the GraphQL query string
+            variables: the variables used within the GraphQL query
+            operation_name: the name of the operation to execute
+            headers: extra headers to send with this request
+            timeout: the timeout of this request. Defaults to the timeout of the client
+            retry: the RetryPolicy of this request. Defaults to the policy of the client
+            retry_mutations: whether to retry this request if it is a mutation. Defaults to the policy's setting
+
+        Returns:
+            The decoded JSON response
+
+        Raises:
+            BuycoinsHTTPException: the API responded with an HTTP error status
+        """
+        policy = retry if retry is not None else self.retry
+        connect, read = _split_timeout(timeout if timeout is not None else self.timeout)
+        client_timeout = _aiohttp().ClientTimeout(sock_connect=connect, sock_read=read)
+        attempt = 0
+        while True:
+            wait, probe = self._before_attempt(query)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            started = time.monotonic()
+            try:
+                data = await self._send_async(query, variables, operation_name, headers, client_timeout)
+            except BaseException as err:
+                self._after_attempt(started, probe, err)
+                if not isinstance(err, Exception) or not policy.should_retry(query, err, attempt, retry_mutations):
+                    raise
+                await asyncio.sleep(policy.backoff(attempt))
+                attempt += 1
+            else:
+                self._after_attempt(started, probe)
+                policy.budget.record_success()
+                return data
+
+    async def _send_async(self, query: str, variables: dict, operation_name: str, headers: dict,
+                          timeout: 'aiohttp.ClientTimeout') -> dict:
+        """Sends a request once without blocking, with the automatic persisted query handshake if persisted queries
+        are used
+
+        """
+        if self.persisted_queries:
+            data = await self._post_async(_request_body(query, variables, operation_name, persisted=True,
+                                                        include_query=False), headers, timeout)
+            error = _persisted_query_error(data)
+            if error is None:
+                return data
+            if error == 'PersistedQueryNotSupported':
+                self.persisted_queries = False
+            return await self._post_async(_request_body(query, variables, operation_name,
+                                                        persisted=self.persisted_queries), headers, timeout)
+        return await self._post_async(_request_body(query, variables, operation_name), headers, timeout)
+
+    async def _post_async(self, request_body: dict, headers: dict = None, timeout: 'aiohttp.ClientTimeout' = None) \
+            -> dict:
+        """Posts a request body to the GraphQL API without blocking and returns the decoded JSON response
+
+        """
+        async with self._get_async_session().post(self.endpoint, data=self.codec.dumps(request_body), headers={
+            'Content-Type': 'application/json', **(headers or {})
+        }, timeout=timeout) as response:
+            if response.status >= 400:
+                raise errors.BuycoinsHTTPException(
+                    response=response,
+                    message=f"{response.status} Error: {response.reason} for url: {response.url}"
+                )
+            return self.codec.loads(await response.read())
+
+    async def aclose(self):
+        """Close every pooled connection, both synchronous and asynchronous
+
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        self.close()
@@ -143,3 +143,29 @@ class EventType(Enum):
     BANK_DEPOSIT_INCOMING = 'bank_deposit.incoming'
     ORDER_SUCCEEDED = 'order.succeeded'
     ORDER_FAILED = 'order.failed'
+
+
+class CircuitState(Enum):
+    """The CircuitState enum represents the states of a CircuitBreaker
+
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+
+class PaginationDirection(Enum):
+    """The PaginationDirection enum represents the direction in which a connection is paginated
+
+    """
+    FORWARD = 'forward'
+    BACKWARD = 'backward'
+
+
+class ExportFormat(Enum):
+    """The ExportFormat enum represents the file formats an Exporter writes
+
+    """
+    CSV = 'csv'
+    JSON_LINES = 'jsonl'
+    PARQUET = 'parquet'
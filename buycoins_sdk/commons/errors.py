@@ -2,7 +2,7 @@
 This module contains errors that can be raised during the use of the SDK
 """
 
-from .enums import BuycoinsType
+from .enums import BuycoinsType, CircuitState
 from requests import Response
 
 __all__ = [
@@ -13,7 +13,8 @@ __all__ = [
     'InsufficientBalanceToWithdrawException',
     'WithdrawalCannotBeCanceledException',
     'BuycoinsHTTPException',
-    'MissingFieldException'
+    'MissingFieldException',
+    'CircuitOpenException'
 ]
 
 
@@ -39,7 +40,8 @@ class BuycoinsHTTPException(BuycoinsException):
 
     Attributes:
         status_code [int]: an integer representing the status code of the HTTPError
-        response [requests.Response]: the HTTP Response from the HTTPError
+        response [requests.Response]: the HTTP Response from the HTTPError. This is an aiohttp.ClientResponse when
+            the error was raised by an asynchronous client
         error_message: the error message from the HTTPError
     """
 
@@ -50,7 +52,7 @@ class BuycoinsHTTPException(BuycoinsException):
                 response: This is the HTTP Response from the HTTPError
                 message: This is error message from the HTTPError
         """
-        self.status_code = response.status_code
+        self.status_code = response.status_code if hasattr(response, 'status_code') else response.status
         self.response = response
         self.error_message = message
         super().__init__(error_message=message)
@@ -162,4 +164,26 @@ class MissingFieldException(BuycoinsException):
             missing_field: the field missing from the dictionary passed to the from_dict method
 
         """
-        super().__init__("Type could not be created due to missing field: "+missing_field)
\ No newline at end of file
+        super().__init__("Type could not be created due to missing field: "+missing_field)
+
+
+class CircuitOpenException(BuycoinsException):
+    """CircuitOpenException is raised without making a request when the circuit breaker of a client is open because
+    the Buycoins API has been failing
+
+    Attributes:
+        state: the CircuitState of the circuit breaker
+        retry_after: the number of seconds until the circuit breaker lets a probe request through
+    """
+
+    def __init__(self, state: CircuitState, retry_after: float):
+        """Create a new CircuitOpenException
+
+        Args:
+            state: the CircuitState of the circuit breaker
+            retry_after: the number of seconds until the circuit breaker lets a probe request through
+        """
+        self.state = state
+        self.retry_after = retry_after
+        super().__init__(f"The circuit breaker is {state.value}, the Buycoins API is failing. Retry in "
+                         f"{retry_after:.1f} seconds")
@@ -1,7 +1,32 @@
 from .main_buycoins_sdk import BuycoinsSDK
+from .async_buycoins_sdk import AsyncBuycoinsSDK
+from .batch import BuycoinsSDKBatch
+from .columnar import PostOrderArrays
+from .export import Exporter
+from .identity_map import IdentityMap
+from .loader import NodeLoader
+from .order_book import BookDiff, OrderBook
+from .poller import MarketBookPoller
+from .price_cache import PriceCache
+from .store import SQLiteStore
+from .sync import CheckpointStore, FileCheckpointStore, PaymentSync
 from . import types
 
 __all__ = [
     'BuycoinsSDK',
+    'AsyncBuycoinsSDK',
+    'BuycoinsSDKBatch',
+    'PostOrderArrays',
+    'Exporter',
+    'IdentityMap',
+    'NodeLoader',
+    'BookDiff',
+    'OrderBook',
+    'MarketBookPoller',
+    'PriceCache',
+    'SQLiteStore',
+    'CheckpointStore',
+    'FileCheckpointStore',
+    'PaymentSync',
     'types'
 ]
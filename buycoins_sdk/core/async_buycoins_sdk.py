@@ -0,0 +1,293 @@
+import asyncio
+from buycoins_sdk.client.async_client import AsyncBuycoinsGraphqlClient
+from buycoins_sdk.commons import errors
+from buycoins_sdk.commons.enums import BuycoinsType, Cryptocurrency, ExportFormat, GetOrdersStatus, OrderSide, \
+    PaginationDirection
+from buycoins_sdk.core.identity_map import IdentityMap
+from buycoins_sdk.core.main_buycoins_sdk import BuycoinsSDK, T, _chunks, _cryptocurrencies, _page_args, \
+    _page_items, _partial_results
+from buycoins_sdk.core.price_cache import PriceCache
+from buycoins_sdk.core.store import SQLiteStore
+from buycoins_sdk.core.sync import CheckpointStore
+from buycoins_sdk.core.types import BuycoinsPrice, Payment, PostOrder
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+
+__all__ = [
+    'AsyncBuycoinsSDK'
+]
+
+
+async def _pages_async(fetch_page: Callable[..., Awaitable[Any]], items: Callable[[Any], List[T]],
+                       direction: PaginationDirection, page_size: int) -> AsyncIterator[List[T]]:
+    """The asyncio version of _pages
+
+    """
+    cursor = None
+    while True:
+        page = await fetch_page(**_page_args(direction, page_size, cursor))
+        page_items, cursor = _page_items(items(page), page.page_info, direction)
+        yield page_items
+        if cursor is None:
+            return
+
+
+async def _prefetch_async(pages: AsyncIterator[List[T]], depth: int) -> AsyncIterator[List[T]]:
+    """Fetches pages in a background task, at most depth pages ahead of the caller. The task is cancelled, and closes
+    pages, once the iterator is closed
+
+    """
+    buffer = asyncio.Queue(maxsize=depth)
+
+    async def produce():
+        try:
+            async for page in pages:
+                await buffer.put((page, None))
+            await buffer.put((None, None))
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            await buffer.put((None, err))
+        finally:
+            await pages.aclose()
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        while True:
+            page, error = await buffer.get()
+            if error is not None:
+                raise error
+            if page is None:
+                return
+            yield page
+    finally:
+        producer.cancel()
+
+
+async def _paginate_async(fetch_page: Callable[..., Awaitable[Any]], items: Callable[[Any], List[T]],
+                          direction: PaginationDirection, page_size: int, until: Optional[Callable[[T], bool]],
+                          prefetch: int = 0) -> AsyncIterator[T]:
+    """The asyncio version of _paginate
+
+    """
+    pages = _pages_async(fetch_page, items, direction, page_size)
+    if prefetch > 0:
+        pages = _prefetch_async(pages, prefetch)
+    try:
+        async for page_items in pages:
+            for item in page_items:
+                if until is not None and until(item):
+                    return
+                yield item
+    finally:
+        await pages.aclose()
+
+
+class AsyncBuycoinsSDK(BuycoinsSDK):
+    """AsyncBuycoinsSDK is the asyncio version of BuycoinsSDK
+
+    It has every method of BuycoinsSDK, with the same arguments and return types, but each method is a coroutine which
+    has to be awaited. Example::
+
+        >>> async with AsyncBuycoinsSDK(public_key=public_key, secret_key=secret_key) as buycoins_sdk:
+        ...     prices = await buycoins_sdk.get_prices(enums.Cryptocurrency.BITCOIN)
+
+    Attributes:
+        client: An AsyncBuycoinsGraphqlClient object where the actual GraphQL queries and mutations are made
+    """
+
+    def __init__(self, public_key: str, secret_key: str, identity_map: IdentityMap = None, store: SQLiteStore = None,
+                 **client_options):
+        """Initialise an AsyncBuycoinsSDK
+
+        Args:
+            public_key: your BuyCoins public key as a string
+            secret_key: your BuyCoins secret key as a string
+            identity_map: an IdentityMap which keeps the nodes fetched with node() and nodes()
+            store: a SQLiteStore which keeps the payments, post orders, orders and onchain transfer requests the SDK
+                    returns
+            **client_options: keyword arguments passed on to AsyncBuycoinsGraphqlClient e.g limit_per_host
+        """
+        self._public_key = public_key
+        self._secret_key = secret_key
+        self._identity_map = identity_map
+        self._store = store
+        self._price_cache = PriceCache()
+        self.client = AsyncBuycoinsGraphqlClient(public_key=public_key, secret_key=secret_key, **client_options)
+
+    async def close(self):
+        """Close the pooled connections to the Buycoins API
+
+        """
+        await self.client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def __enter__(self):
+        raise TypeError("AsyncBuycoinsSDK must be used with 'async with', not 'with'")
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    async def _result(self, response: Awaitable[dict], convert: Callable[[Any], Any]) -> Any:
+        """Awaits the response of an AsyncBuycoinsGraphqlClient method and converts its data with the given function
+
+        Args:
+            response: an awaitable returned by an AsyncBuycoinsGraphqlClient method
+            convert: a function which takes the data of the response and returns a native Python object
+
+        Returns:
+            The converted data
+        """
+        return self._keep(convert((await response)['data']))
+
+    async def _by_cryptocurrency(self, call: Callable[[BuycoinsSDK, Cryptocurrency], Awaitable[Any]],
+                                 cryptocurrencies: Optional[Iterable[Cryptocurrency]],
+                                 max_concurrency: int) -> Dict[Cryptocurrency, Any]:
+        """Makes a call for every cryptocurrency, up to max_concurrency at a time, and returns the results by
+        cryptocurrency, or the exception a call raised in place of its result
+
+        """
+        cryptocurrencies = _cryptocurrencies(cryptocurrencies)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(cryptocurrency: Cryptocurrency) -> Any:
+            async with semaphore:
+                return await call(self, cryptocurrency)
+
+        results = await asyncio.gather(*(fetch(cryptocurrency) for cryptocurrency in cryptocurrencies),
+                                       return_exceptions=True)
+        return dict(zip(cryptocurrencies, results))
+
+    async def get_estimated_network_fee_by_cryptocurrency(self, amount: str,
+                                                          cryptocurrencies: Iterable[Cryptocurrency] = None,
+                                                          max_concurrency: int = 6,
+                                                          partial: bool = False) -> Dict[Cryptocurrency, Any]:
+        """Retrieves the estimated network fee to send an amount of several cryptocurrencies, up to max_concurrency
+        requests at a time. See BuycoinsSDK.get_estimated_network_fee_by_cryptocurrency
+
+        """
+        return _partial_results(await self._by_cryptocurrency(
+            lambda sdk, cryptocurrency: sdk.get_estimated_network_fee(amount=amount, cryptocurrency=cryptocurrency),
+            cryptocurrencies, max_concurrency), partial)
+
+    async def get_market_book_by_cryptocurrency(self, cryptocurrencies: Iterable[Cryptocurrency] = None,
+                                                first: int = None, last: int = None,
+                                                max_concurrency: int = 6,
+                                                partial: bool = False) -> Dict[Cryptocurrency, Any]:
+        """Retrieves the market books of several cryptocurrencies, up to max_concurrency requests at a time. See
+        BuycoinsSDK.get_market_book_by_cryptocurrency
+
+        """
+        return _partial_results(await self._by_cryptocurrency(
+            lambda sdk, cryptocurrency: sdk.get_market_book(first=first, last=last, cryptocurrency=cryptocurrency),
+            cryptocurrencies, max_concurrency), partial)
+
+    async def get_orders_by_cryptocurrency(self, status: GetOrdersStatus,
+                                           cryptocurrencies: Iterable[Cryptocurrency] = None, side: OrderSide = None,
+                                           first: int = None, last: int = None,
+                                           max_concurrency: int = 6,
+                                           partial: bool = False) -> Dict[Cryptocurrency, Any]:
+        """Retrieves your orders in several cryptocurrencies, up to max_concurrency requests at a time. See
+        BuycoinsSDK.get_orders_by_cryptocurrency
+
+        """
+        return _partial_results(await self._by_cryptocurrency(
+            lambda sdk, cryptocurrency: sdk.get_orders(status=status, side=side, first=first, last=last,
+                                                       cryptocurrency=cryptocurrency),
+            cryptocurrencies, max_concurrency), partial)
+
+    @property
+    def price_cache(self) -> PriceCache:
+        """The PriceCache used by quote(). It is filled by every call to get_prices too
+
+        """
+        if self._price_cache is None:  # only when __init__ was skipped
+            self._price_cache = PriceCache()
+        return self._price_cache
+
+    async def quote(self, cryptocurrency: Cryptocurrency = Cryptocurrency.BITCOIN) -> BuycoinsPrice:
+        """Returns a live price of a cryptocurrency for buy or sell, from the price cache when it holds one. See
+        BuycoinsSDK.quote
+
+        """
+        return await self.price_cache.get_async(cryptocurrency, self._fetch_prices)
+
+    async def node(self, node_id: str, gql_type: BuycoinsType) -> dict:
+        """Fetches an object given its ID, from the identity map when it keeps it. See BuycoinsSDK.node
+
+        """
+        if self._identity_map is not None:
+            node = self._identity_map.get(node_id, (gql_type,))
+            if node is not None:
+                return {'data': node}
+        response = await self.client.node(node_id=node_id, gql_type=gql_type)
+        if self._identity_map is not None:
+            self._identity_map.put(node_id, (gql_type,), response['data'])
+        return response
+
+    async def nodes(self, ids: List[str], gql_types: List[BuycoinsType], partial: bool = False, chunk_size: int = 100,
+                    max_concurrency: int = 4) -> dict:
+        """Fetches a list of objects given a list of IDs, in chunks fetched concurrently. See BuycoinsSDK.nodes
+
+        """
+        cached, missing = self._cached_nodes(ids, gql_types)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(chunk: List[str]) -> Tuple[List[dict], Dict[str, Exception]]:
+            async with semaphore:
+                try:
+                    return (await self.client.nodes(ids=chunk, gql_types=gql_types, partial=partial))['data'], {}
+                except Exception as err:
+                    if not partial:
+                        raise
+                    return [{}] * len(chunk), dict.fromkeys(chunk, err)
+
+        results = await asyncio.gather(*(fetch(chunk) for chunk in _chunks(missing, chunk_size)))
+        return self._nodes_response(ids, gql_types, cached, missing, list(results), partial)
+
+    def iter_market_book(self, cryptocurrency: Cryptocurrency = Cryptocurrency.BITCOIN, page_size: int = 50,
+                         direction: PaginationDirection = PaginationDirection.FORWARD,
+                         until: Callable[[PostOrder], bool] = None, prefetch: int = 0) -> AsyncIterator[PostOrder]:
+        """Iterates over the orders in the market book with async for, fetching them one page at a time. See
+        BuycoinsSDK.iter_market_book
+
+        """
+        return _paginate_async(lambda **page: self.get_market_book(cryptocurrency=cryptocurrency, **page),
+                               lambda post_orders: [edge.post_order for edge in post_orders.post_order_edges],
+                               direction, page_size, until, prefetch)
+
+    def iter_orders(self, status: GetOrdersStatus, side: OrderSide = None,
+                    cryptocurrency: Cryptocurrency = Cryptocurrency.BITCOIN, page_size: int = 50,
+                    direction: PaginationDirection = PaginationDirection.FORWARD,
+                    until: Callable[[PostOrder], bool] = None, prefetch: int = 0) -> AsyncIterator[PostOrder]:
+        """Iterates over your orders with async for, fetching them one page at a time. See BuycoinsSDK.iter_orders
+
+        """
+        return _paginate_async(lambda **page: self.get_orders(status=status, side=side, cryptocurrency=cryptocurrency,
+                                                              **page),
+                               lambda post_orders: [edge.post_order for edge in post_orders.post_order_edges],
+                               direction, page_size, until, prefetch)
+
+    def iter_payments(self, page_size: int = 50, direction: PaginationDirection = PaginationDirection.FORWARD,
+                      until: Callable[[Payment], bool] = None, prefetch: int = 0) -> AsyncIterator[Payment]:
+        """Iterates over your payments with async for, fetching them one page at a time. See BuycoinsSDK.iter_payments
+
+        """
+        return _paginate_async(lambda **page: self.get_payments(**page),
+                               lambda connection: [edge.payment for edge in connection.payment_edges],
+                               direction, page_size, until, prefetch)
+
+    def exporter(self, path: str, export_format: ExportFormat = ExportFormat.CSV,
+                 checkpoint: Union[str, CheckpointStore] = None, **options: Any):
+        """Exporter fetches its pages synchronously, so it can't be used with AsyncBuycoinsSDK. Use a BuycoinsSDK to
+        export, or write the items of iter_payments or iter_market_book yourself
+
+        Raises:
+            BuycoinsException: always
+        """
+        raise errors.BuycoinsException("exporter can not be used with AsyncBuycoinsSDK, use BuycoinsSDK instead")
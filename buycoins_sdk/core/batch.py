@@ -0,0 +1,123 @@
+from buycoins_sdk.client.batch import BatchResult
+from buycoins_sdk.commons import errors
+from buycoins_sdk.commons.enums import BuycoinsType, Cryptocurrency
+from buycoins_sdk.core.main_buycoins_sdk import BuycoinsSDK, _cryptocurrencies
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+__all__ = [
+    'BuycoinsSDKBatch'
+]
+
+
+class BuycoinsSDKBatch(BuycoinsSDK):
+    """BuycoinsSDKBatch queues the queries made with it and sends them to the Buycoins API in a single request.
+
+    It has every query method of BuycoinsSDK, but each method returns a BatchResult whose result() is the same native
+    Python object the BuycoinsSDK method returns. The results are available once the with block exits::
+
+        >>> with buycoins_sdk.batch() as batch:
+        ...     balances = batch.get_balances()
+        ...     prices = batch.get_prices()
+        ...     market_book = batch.get_market_book(cryptocurrency=enums.Cryptocurrency.ETHEREUM)
+        ...     open_orders = batch.get_orders(status=enums.GetOrdersStatus.OPEN)
+        >>> balances.result()
+
+    A query that fails only raises when its own result is accessed. Mutations can not be batched.
+
+    Attributes:
+        client: the BatchGraphqlClient which queues the queries
+    """
+
+    def __init__(self, buycoins_sdk: BuycoinsSDK):
+        """Create a new BuycoinsSDKBatch
+
+        Args:
+            buycoins_sdk: the BuycoinsSDK whose client is used to send the batch
+        """
+        self.client = buycoins_sdk.client.batch()
+        self._price_cache = buycoins_sdk.price_cache
+        self._store = buycoins_sdk.store
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.execute()
+
+    def close(self):
+        """A batch does not own any connections, so there is nothing to close
+
+        """
+
+    def execute(self):
+        """Sends every queued query in a single request and sets the result of each BatchResult
+
+        """
+        self.client.execute()
+
+    def quote(self, cryptocurrency: Cryptocurrency = Cryptocurrency.BITCOIN):
+        """Quotes can not be batched. Use BuycoinsSDK.quote instead
+
+        Raises:
+            BuycoinsException: always
+        """
+        raise errors.BuycoinsException("quote can not be batched, use BuycoinsSDK.quote instead")
+
+    def iter_market_book(self, *args, **kwargs):
+        """Iterators fetch their pages one after the other, so they can not be batched
+
+        Raises:
+            BuycoinsException: always
+        """
+        raise errors.BuycoinsException("iter_market_book can not be batched, use get_market_book instead")
+
+    def iter_orders(self, *args, **kwargs):
+        """Iterators fetch their pages one after the other, so they can not be batched
+
+        Raises:
+            BuycoinsException: always
+        """
+        raise errors.BuycoinsException("iter_orders can not be batched, use get_orders instead")
+
+    def iter_payments(self, *args, **kwargs):
+        """Iterators fetch their pages one after the other, so they can not be batched
+
+        Raises:
+            BuycoinsException: always
+        """
+        raise errors.BuycoinsException("iter_payments can not be batched, use get_payments instead")
+
+    def _by_cryptocurrency(self, call: Callable[[BuycoinsSDK, Cryptocurrency], Any],
+                           cryptocurrencies: Optional[Iterable[Cryptocurrency]]) -> Dict[Cryptocurrency, BatchResult]:
+        """Queues a call for every cryptocurrency in this batch
+
+        Returns:
+            A dict mapping every cryptocurrency to the BatchResult of its call
+        """
+        return {cryptocurrency: call(self, cryptocurrency) for cryptocurrency in _cryptocurrencies(cryptocurrencies)}
+
+    def nodes(self, ids: List[str], gql_types: List[BuycoinsType], partial: bool = False, chunk_size: int = None,
+              max_concurrency: int = None) -> BatchResult:
+        """Queues a nodes query for the IDs. A batch is a single request, so the IDs are not chunked. See
+        BuycoinsSDK.nodes
+
+        """
+        if not partial:
+            return self.client.nodes(ids=ids, gql_types=gql_types)
+        return self._result(self.client.nodes(ids=ids, gql_types=gql_types, partial=True),
+                            lambda data: self._nodes_response(ids, gql_types, [None] * len(ids), ids, [(data, {})],
+                                                              partial=True))
+
+    def _result(self, response: BatchResult, convert: Callable[[Any], Any]) -> BatchResult:
+        """Adds the conversion to the BatchResult of a queued query
+
+        Args:
+            response: the BatchResult returned by the BatchGraphqlClient
+            convert: a function which takes the data of the response and returns a native Python object
+
+        Returns:
+            The BatchResult
+        """
+        return response._then(lambda data: self._keep(convert(data['data'])))
@@ -0,0 +1,158 @@
+"""
+This module contains the PostOrderArrays class, a columnar view of a market book for vectorized analytics with NumPy
+"""
+
+from decimal import Decimal, ROUND_HALF_EVEN
+from buycoins_sdk.commons import errors
+from buycoins_sdk.commons.enums import OrderSide, PostOrderStatus
+from buycoins_sdk.core.types import PageInfo, PostOrders
+from typing import List, Optional
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+__all__ = [
+    'PostOrderArrays',
+    'SIDE_CODES',
+    'STATUS_CODES'
+]
+
+SIDE_CODES = {side: code for code, side in enumerate(OrderSide)}
+
+STATUS_CODES = {status: code for code, status in enumerate(PostOrderStatus)}
+
+_SIDE_CODES_BY_VALUE = {side.value: code for side, code in SIDE_CODES.items()}
+
+_STATUS_CODES_BY_VALUE = {status.value: code for status, code in STATUS_CODES.items()}
+
+
+def _decimals(values: List[str], scale: Optional[int]):
+    """Returns decimal strings as a float64 array, or as an int64 array of the values times 10 ** scale, rounded half
+    to even, if a scale is given
+
+    """
+    if scale is None:
+        return numpy.array(values, dtype=numpy.float64)
+    return numpy.array([int(Decimal(value).scaleb(scale).to_integral_value(ROUND_HALF_EVEN)) for value in values],
+                       dtype=numpy.int64)
+
+
+class PostOrderArrays:
+    """PostOrderArrays holds a market book as one NumPy array per field instead of a PostOrder object per order, so
+    that depth, spread or VWAP calculations run vectorized::
+
+        >>> book = buycoins_sdk.get_market_book(first=1000, columnar=True)
+        >>> asks = book.mask(side=enums.OrderSide.SELL)
+        >>> vwap = (book.price_per_coin[asks] * book.coin_amount[asks]).sum() / book.coin_amount[asks].sum()
+
+    Prices and amounts are float64 arrays, or int64 fixed point arrays holding the values times 10 ** scale when a
+    scale is given, which keeps them exact. Sides and statuses are int8 codes, given by SIDE_CODES and STATUS_CODES.
+    Install NumPy with pip install buycoins_sdk[numpy].
+
+    Attributes:
+        ids: the IDs of the post orders
+        cursors: the cursors of the post orders
+        created_at: an int64 array of the createdAt field
+        price_per_coin: an array of the pricePerCoin field
+        coin_amount: an array of the coinAmount field
+        side: an int8 array of the codes of the side field
+        status: an int8 array of the codes of the status field
+        scale: the number of decimal places of the fixed point arrays, or None for float64 arrays
+        dynamic_price_expiry: the dynamicPriceExpiry field of the market book
+        page_info: the PageInfo of the market book
+    """
+
+    def __init__(self, ids: List[str], cursors: List[str], created_at, price_per_coin, coin_amount, side, status,
+                 scale: int = None, dynamic_price_expiry: str = None, page_info: PageInfo = None):
+        """Create a new PostOrderArrays. See from_dict and from_post_orders
+
+        """
+        self.ids = ids
+        self.cursors = cursors
+        self.created_at = created_at
+        self.price_per_coin = price_per_coin
+        self.coin_amount = coin_amount
+        self.side = side
+        self.status = status
+        self.scale = scale
+        self.dynamic_price_expiry = dynamic_price_expiry
+        self.page_info = page_info
+
+    def __len__(self):
+        return len(self.ids)
+
+    def mask(self, side: OrderSide = None, status: PostOrderStatus = None):
+        """Returns a boolean array which is True for the post orders with the given side and status
+
+        Args:
+            side: only select post orders on this side
+            status: only select post orders with this status
+        """
+        selected = numpy.ones(len(self), dtype=bool)
+        if side is not None:
+            selected &= self.side == SIDE_CODES[side]
+        if status is not None:
+            selected &= self.status == STATUS_CODES[status]
+        return selected
+
+    @staticmethod
+    def from_dict(fields: dict, scale: int = None):
+        """Create a PostOrderArrays from the data of a getMarketBook or getOrders response, without creating a
+        PostOrder object per order
+
+        Args:
+            fields: the fields of the data property of a dict returned from a BuycoinsGraphqlClient method
+            scale: the number of decimal places of fixed point prices and amounts, or None for float64 arrays
+
+        Returns:
+            A PostOrderArrays object
+        """
+        if numpy is None:
+            raise errors.BuycoinsException("numpy is not installed. Install it with pip install buycoins_sdk[numpy]")
+        try:
+            edges = fields['orders']['edges']
+            nodes = [edge['node'] for edge in edges]
+            return PostOrderArrays(
+                ids=[node['id'] for node in nodes],
+                cursors=[edge['cursor'] for edge in edges],
+                created_at=numpy.array([node['createdAt'] for node in nodes], dtype=numpy.int64),
+                price_per_coin=_decimals([node['pricePerCoin'] for node in nodes], scale),
+                coin_amount=_decimals([node['coinAmount'] for node in nodes], scale),
+                side=numpy.array([_SIDE_CODES_BY_VALUE[node['side']] for node in nodes], dtype=numpy.int8),
+                status=numpy.array([_STATUS_CODES_BY_VALUE[node['status']] for node in nodes], dtype=numpy.int8),
+                scale=scale,
+                dynamic_price_expiry=fields['dynamicPriceExpiry'],
+                page_info=PageInfo.from_dict(fields['orders']['pageInfo'])
+            )
+        except KeyError as err:
+            raise errors.MissingFieldException(err.args[0])
+
+    @staticmethod
+    def from_post_orders(post_orders: PostOrders, scale: int = None):
+        """Create a PostOrderArrays from a PostOrders object
+
+        Args:
+            post_orders: the PostOrders
+            scale: the number of decimal places of fixed point prices and amounts, or None for float64 arrays
+
+        Returns:
+            A PostOrderArrays object
+        """
+        if numpy is None:
+            raise errors.BuycoinsException("numpy is not installed. Install it with pip install buycoins_sdk[numpy]")
+        edges = post_orders.post_order_edges
+        orders = [edge.post_order for edge in edges]
+        return PostOrderArrays(
+            ids=[order.id for order in orders],
+            cursors=[edge.cursor for edge in edges],
+            created_at=numpy.array([order.created_at for order in orders], dtype=numpy.int64),
+            price_per_coin=_decimals([order.price_per_coin for order in orders], scale),
+            coin_amount=_decimals([order.coin_amount for order in orders], scale),
+            side=numpy.array([SIDE_CODES[order.side] for order in orders], dtype=numpy.int8),
+            status=numpy.array([STATUS_CODES[order.status] for order in orders], dtype=numpy.int8),
+            scale=scale,
+            dynamic_price_expiry=post_orders.dynamic_price_expiry,
+            page_info=post_orders.page_info
+        )
@@ -0,0 +1,222 @@
+"""
+This module contains the Exporter class, which streams your payments and the market book to CSV, JSON Lines or
+Parquet files
+"""
+
+import csv
+import glob
+import json
+import os
+from enum import Enum
+from buycoins_sdk.commons import errors
+from buycoins_sdk.commons.enums import Cryptocurrency, ExportFormat, PaginationDirection
+from buycoins_sdk.core.main_buycoins_sdk import _pages, _prefetch
+from buycoins_sdk.core.sync import Checkpoint, CheckpointStore, FileCheckpointStore
+from typing import Any, Callable, Iterator, List, Tuple, Union
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+__all__ = [
+    'Exporter',
+    'PAYMENT_COLUMNS',
+    'POST_ORDER_COLUMNS'
+]
+
+PAYMENT_COLUMNS = ('cursor', 'id', 'amount', 'created_at', 'fee', 'reference', 'status', 'total_amount',
+                   'payment_type')
+
+POST_ORDER_COLUMNS = ('cursor', 'id', 'coin_amount', 'created_at', 'cryptocurrency', 'dynamic_exchange_rate',
+                      'price_per_coin', 'price_type', 'side', 'static_price', 'status')
+
+
+def _row(cursor: str, node: Any) -> dict:
+    """Returns the row of a node: its attributes, with enums replaced by their values, and the cursor of its edge
+
+    """
+    row = {'cursor': cursor}
+    for name, value in vars(node).items():
+        row[name] = value.value if isinstance(value, Enum) else value
+    return row
+
+
+class _CSVWriter:
+    """_CSVWriter appends rows to a CSV file, writing the header if the file is empty
+
+    """
+
+    def __init__(self, path: str, columns: Tuple[str, ...]):
+        self._file = open(path, 'a', newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=columns)
+        if self._file.tell() == 0:
+            self._writer.writeheader()
+
+    def write(self, rows: List[dict]):
+        self._writer.writerows(rows)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+class _JSONLinesWriter:
+    """_JSONLinesWriter appends rows to a JSON Lines file
+
+    """
+
+    def __init__(self, path: str, columns: Tuple[str, ...]):
+        self._file = open(path, 'a')
+
+    def write(self, rows: List[dict]):
+        self._file.writelines(json.dumps(row) + '\n' for row in rows)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetWriter:
+    """_ParquetWriter writes rows to a new part file of a Parquet dataset directory, one row group per write. A Parquet
+    file can not be appended to, so every export adds a part file
+
+    """
+
+    def __init__(self, path: str, columns: Tuple[str, ...]):
+        if pyarrow is None:
+            raise errors.BuycoinsException("pyarrow is not installed. Install it with pip install buycoins_sdk[parquet]")
+        os.makedirs(path, exist_ok=True)
+        part = len(glob.glob(os.path.join(path, 'part-*.parquet')))
+        self._schema = pyarrow.schema([(column, pyarrow.int64() if column == 'created_at' else pyarrow.string())
+                                       for column in columns])
+        self._writer = pyarrow.parquet.ParquetWriter(os.path.join(path, f"part-{part:05d}.parquet"), self._schema)
+
+    def write(self, rows: List[dict]):
+        self._writer.write_table(pyarrow.Table.from_pydict(
+            {column: [row[column] for row in rows] for column in self._schema.names}, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+
+_WRITERS = {
+    ExportFormat.CSV: _CSVWriter,
+    ExportFormat.JSON_LINES: _JSONLinesWriter,
+    ExportFormat.PARQUET: _ParquetWriter
+}
+
+
+class Exporter:
+    """Exporter streams your payments or the market book into a file page by page, so that exporting millions of rows
+    takes a constant amount of memory.
+
+    Pages are fetched with the pagination cursors, up to prefetch pages ahead of the writer, and rows are written to
+    the file whenever buffer_size of them are waiting. The formats are CSV and JSON Lines, which are appended to, and
+    Parquet, which is written as a directory with a part file for every export::
+
+        >>> exporter = buycoins_sdk.exporter('payments.csv', checkpoint='payments.cursor.json')
+        >>> exporter.payments()
+        1000000
+
+    With a checkpoint, the cursor of the last row written is saved after every write, and an export starts after it,
+    so an export which was interrupted resumes where it stopped, and the next export of payments only writes the new
+    ones. A row may be written twice if the export is interrupted between writing it and saving the checkpoint.
+
+    Attributes:
+        buycoins_sdk: the BuycoinsSDK the pages are fetched with
+        path: the path of the file, or of the directory for Parquet
+        export_format: the format of the file
+        checkpoint: the CheckpointStore of the last cursor written, or None to always export from the first page
+        page_size: the number of rows fetched per request
+        buffer_size: the number of rows held in memory before they are written
+        prefetch: the number of pages fetched on a background thread ahead of the writer
+    """
+
+    def __init__(self, buycoins_sdk, path: str, export_format: ExportFormat = ExportFormat.CSV,
+                 checkpoint: Union[str, CheckpointStore] = None, page_size: int = 100, buffer_size: int = 1000,
+                 prefetch: int = 1):
+        """Create a new Exporter
+
+        Args:
+            buycoins_sdk: the BuycoinsSDK to fetch the pages with
+            path: the path of the file, or of the directory for Parquet
+            export_format: the format of the file. PARQUET needs pyarrow
+            checkpoint: the path of the JSON file to keep the last cursor written in, or a CheckpointStore
+            page_size: the number of rows fetched per request
+            buffer_size: the number of rows held in memory before they are written
+            prefetch: the number of pages fetched on a background thread ahead of the writer. 0 fetches each page when
+                    the rows before it are buffered
+        """
+        self.buycoins_sdk = buycoins_sdk
+        self.path = path
+        self.export_format = export_format
+        self.checkpoint = FileCheckpointStore(checkpoint) if isinstance(checkpoint, str) else checkpoint
+        self.page_size = page_size
+        self.buffer_size = buffer_size
+        self.prefetch = prefetch
+
+    def payments(self) -> int:
+        """Exports your payments, with the columns in PAYMENT_COLUMNS
+
+        Returns:
+            The number of rows written
+        Raises:
+            BuycoinsException: An error occurred. With a checkpoint, the export resumes after the last row written
+        """
+        return self._export(lambda **page: self.buycoins_sdk.get_payments(**page),
+                            lambda connection: [(edge.cursor, edge.payment) for edge in connection.payment_edges],
+                            PAYMENT_COLUMNS)
+
+    def market_book(self, cryptocurrency: Cryptocurrency = Cryptocurrency.BITCOIN) -> int:
+        """Exports the market book of a cryptocurrency, with the columns in POST_ORDER_COLUMNS
+
+        Args:
+            cryptocurrency: the cryptocurrency whose market book is exported
+
+        Returns:
+            The number of rows written
+        Raises:
+            BuycoinsException: An error occurred. With a checkpoint, the export resumes after the last row written
+        """
+        return self._export(lambda **page: self.buycoins_sdk.get_market_book(cryptocurrency=cryptocurrency, **page),
+                            lambda post_orders: [(edge.cursor, edge.post_order)
+                                                 for edge in post_orders.post_order_edges],
+                            POST_ORDER_COLUMNS)
+
+    def _export(self, fetch_page: Callable[..., Any], edges: Callable[[Any], List[Tuple[str, Any]]],
+                columns: Tuple[str, ...]) -> int:
+        writer = _WRITERS[self.export_format](self.path, columns)
+        checkpoint = self.checkpoint.load() if self.checkpoint is not None else Checkpoint()
+        pages: Iterator[List[Tuple[str, Any]]] = _pages(fetch_page, edges, PaginationDirection.FORWARD,
+                                                        self.page_size, cursor=checkpoint.cursor)
+        if self.prefetch > 0:
+            pages = _prefetch(pages, self.prefetch)
+        buffer = []
+        written = 0
+
+        def flush():
+            nonlocal buffer, written, checkpoint
+            if not buffer:
+                return
+            writer.write(buffer)
+            written += len(buffer)
+            if self.checkpoint is not None:
+                checkpoint = Checkpoint(cursor=buffer[-1]['cursor'], pending=checkpoint.pending)
+                self.checkpoint.save(checkpoint)
+            buffer = []
+
+        try:
+            for page in pages:
+                for cursor, node in page:
+                    buffer.append(_row(cursor, node))
+                    if len(buffer) >= self.buffer_size:
+                        flush()
+            flush()
+        finally:
+            pages.close()
+            writer.close()
+        return written
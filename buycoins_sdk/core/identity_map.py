@@ -0,0 +1,194 @@
+"""
+This module contains the IdentityMap class, which keeps the nodes fetched with node() and nodes() by their global ID
+"""
+
+import base64
+import math
+import threading
+import time
+from collections import OrderedDict
+from buycoins_sdk.commons.enums import BuycoinsType, OnchainTransferRequestStatus, OrderStatus, PaymentStatus, \
+    PostOrderStatus
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+__all__ = [
+    'IdentityMap',
+    'IMMUTABLE_TYPES',
+    'TERMINAL_STATUSES'
+]
+
+IMMUTABLE_TYPES = frozenset([BuycoinsType.ADDRESS, BuycoinsType.BANK_ACCOUNT, BuycoinsType.DEPOSIT_ACCOUNT])
+
+TERMINAL_STATUSES = {
+    BuycoinsType.ORDER: frozenset(status.value for status in (
+        OrderStatus.CANCELED, OrderStatus.DONE, OrderStatus.FAILED)),
+    BuycoinsType.PAYMENT: frozenset(status.value for status in (
+        PaymentStatus.SUCCESS, PaymentStatus.FAILED, PaymentStatus.CANCELED, PaymentStatus.RETURNED)),
+    BuycoinsType.POST_ORDER: frozenset(status.value for status in (
+        PostOrderStatus.CANCELLED, PostOrderStatus.EXPIRED, PostOrderStatus.COMPLETED, PostOrderStatus.DONE)),
+    BuycoinsType.ONCHAIN_TRANSFER_REQUEST: frozenset(status.value for status in (
+        OnchainTransferRequestStatus.FAILED, OnchainTransferRequestStatus.EXPIRED,
+        OnchainTransferRequestStatus.PROCESSED))
+}
+
+
+def _type_of(node_id: str) -> Optional[BuycoinsType]:
+    """Returns the GraphQL type encoded in a global ID, which is the base64 encoding of the type name and a UUID joined
+    by a dash, or None if the ID is not in that form
+
+    """
+    try:
+        return BuycoinsType(base64.b64decode(node_id).decode().split('-', 1)[0])
+    except (TypeError, ValueError):
+        return None
+
+
+class _Entry(NamedTuple):
+    gql_type: BuycoinsType
+    node: dict
+    expires_at: float
+
+
+class IdentityMap:
+    """IdentityMap keeps the nodes returned by node() and nodes() by their global ID, so that looking up the same object
+    again does not make a request.
+
+    How long a node is kept depends on its type and status. Addresses, bank accounts and deposit accounts never
+    change, and neither do orders, payments, post orders and onchain transfer requests once they reach a terminal
+    status such as done or failed, so they are kept until they are evicted. Nodes which can still change, such as a
+    pending payment or an unconfirmed transaction, are kept for pending_ttl seconds, and a price is kept until it
+    expires. Accounts are never kept, since their balances change all the time.
+
+    At most maxsize nodes are kept, evicting the least recently used node when the map is full. Nodes are shared by
+    every caller, so they must not be modified. An IdentityMap is safe to share between threads.
+
+    Attributes:
+        pending_ttl: the number of seconds a node which can still change is kept
+        maxsize: the maximum number of nodes
+        hits: the number of nodes returned from the map
+        misses: the number of nodes which had to be fetched
+    """
+
+    def __init__(self, pending_ttl: float = 5.0, maxsize: int = 10000, clock: Callable[[], float] = time.time):
+        """Create a new IdentityMap
+
+        Args:
+            pending_ttl: the number of seconds a node which can still change is kept. 0 means such nodes are not kept
+            maxsize: the maximum number of nodes
+            clock: a function returning the current Unix time
+        """
+        self.pending_ttl = pending_ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def ttl(self, gql_type: BuycoinsType, node: dict) -> float:
+        """Returns the number of seconds a node may be kept: math.inf for nodes which can no longer change and 0 for
+        nodes which must not be kept
+
+        Args:
+            gql_type: the GraphQL type of the node
+            node: the node, as returned in a GraphQL response
+        """
+        if gql_type in IMMUTABLE_TYPES:
+            return math.inf
+        if gql_type in TERMINAL_STATUSES:
+            return math.inf if node.get('status') in TERMINAL_STATUSES[gql_type] else self.pending_ttl
+        if gql_type is BuycoinsType.TRANSACTION:
+            return math.inf if node.get('confirmed') else self.pending_ttl
+        if gql_type is BuycoinsType.BUYCOINS_PRICE and node.get('expiresAt') is not None:
+            return max(0.0, node['expiresAt'] - self._clock())
+        return 0.0
+
+    def get(self, node_id: str, gql_types: Iterable[BuycoinsType]) -> Optional[dict]:
+        """Returns the node with a global ID if it is kept and is of one of gql_types, else None
+
+        Args:
+            node_id: the global ID of the node
+            gql_types: the GraphQL types the node was requested as
+        """
+        gql_types = frozenset(gql_types)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(node_id)
+            if entry is not None and entry.expires_at <= now:
+                del self._entries[node_id]
+                entry = None
+            if entry is None or entry.gql_type not in gql_types:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(node_id)
+            self.hits += 1
+            return entry.node
+
+    def get_many(self, ids: List[str], gql_types: Iterable[BuycoinsType]) -> List[Optional[dict]]:
+        """Returns the kept node of every global ID in ids, or None for the IDs which have to be fetched
+
+        """
+        gql_types = frozenset(gql_types)
+        return [self.get(node_id, gql_types) for node_id in ids]
+
+    def put(self, node_id: str, gql_types: Iterable[BuycoinsType], node: dict):
+        """Keeps a node fetched as one of gql_types for as long as its ttl allows
+
+        Args:
+            node_id: the global ID of the node
+            gql_types: the GraphQL types the node was requested as. When there are several, the type is read from the
+                    global ID, and the node is not kept if it can not be
+            node: the node, as returned in a GraphQL response
+        """
+        gql_types = frozenset(gql_types)
+        gql_type = next(iter(gql_types)) if len(gql_types) == 1 else _type_of(node_id)
+        if not node or gql_type not in gql_types:
+            return
+        ttl = self.ttl(gql_type, node)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[node_id] = _Entry(gql_type=gql_type, node=node, expires_at=self._clock() + ttl)
+            self._entries.move_to_end(node_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def merge(self, ids: List[str], gql_types: Iterable[BuycoinsType], cached: List[Optional[dict]],
+              fetched_ids: List[str], fetched: List[dict]) -> List[dict]:
+        """Keeps the fetched nodes and returns the node of every ID in ids, in the order they were requested
+
+        Args:
+            ids: the requested global IDs
+            gql_types: the GraphQL types the nodes were requested as
+            cached: the result of get_many for ids
+            fetched_ids: the IDs which were fetched
+            fetched: the fetched nodes, in the order of fetched_ids
+
+        Returns:
+            The nodes
+        """
+        gql_types = frozenset(gql_types)
+        by_id: Dict[str, dict] = {}
+        for node_id, node in zip(fetched_ids, fetched):
+            self.put(node_id, gql_types, node)
+            by_id[node_id] = node
+        return [node if node is not None else by_id[node_id] for node_id, node in zip(ids, cached)]
+
+    def invalidate(self, node_id: str = None):
+        """Removes the node with a global ID, or every node if no ID is given
+
+        """
+        with self._lock:
+            if node_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(node_id, None)
+
+    def stats(self) -> dict:
+        """Returns the counters of the map, for exporting as metrics
+
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
@@ -0,0 +1,232 @@
+"""
+This module contains the NodeLoader class, which batches node() lookups into nodes() queries
+"""
+
+import asyncio
+import threading
+from buycoins_sdk.commons import errors
+from buycoins_sdk.commons.enums import BuycoinsType
+from typing import Any, Dict, List, Tuple
+
+__all__ = [
+    'NodeLoader'
+]
+
+
+class _Load:
+    """_Load is a node() lookup waiting for its batch to be sent
+
+    """
+    __slots__ = ('node_id', 'gql_type', 'done', 'result', 'error')
+
+    def __init__(self, node_id: str, gql_type: BuycoinsType):
+        self.node_id = node_id
+        self.gql_type = gql_type
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def _group(loads: List[Any], max_batch_size: int) -> List[Tuple[BuycoinsType, List[str], List[Any]]]:
+    """Splits lookups into nodes() queries of at most max_batch_size distinct IDs of one GraphQL type
+
+    Returns:
+        A list of (gql_type, ids, loads) tuples, one for every query
+    """
+    by_type: Dict[BuycoinsType, List[Any]] = {}
+    for load in loads:
+        by_type.setdefault(load.gql_type, []).append(load)
+    groups = []
+    for gql_type, same_type in by_type.items():
+        ids = list(dict.fromkeys(load.node_id for load in same_type))
+        for start in range(0, len(ids), max_batch_size):
+            chunk = set(ids[start:start + max_batch_size])
+            groups.append((gql_type, ids[start:start + max_batch_size],
+                           [load for load in same_type if load.node_id in chunk]))
+    return groups
+
+
+def _resolve(loads: List[_Load], ids: List[str], response: dict):
+    """Sets the result or the error of every lookup from the partial nodes() response for ids
+
+    """
+    nodes = dict(zip(ids, response['data']))
+    for load in loads:
+        error = response['errors'].get(load.node_id)
+        if error is not None:
+            load.error = error
+        else:
+            load.result = {'data': nodes[load.node_id]}
+
+
+def _finish(loads: List[_Load]):
+    """Wakes up the callers waiting on lookups. A lookup which has neither a result nor an error was interrupted
+
+    """
+    for load in loads:
+        if load.result is None and load.error is None:
+            load.error = errors.BuycoinsException("The batch of this node lookup was interrupted")
+        load.done.set()
+
+
+class NodeLoader:
+    """NodeLoader collects the node() lookups made within a short window and fetches them with one nodes() query, so
+    that looking up many nodes one at a time does not make a request for each of them.
+
+    load() waits up to wait seconds for the lookups made by other threads before the batch is sent, so threads which
+    look up nodes at the same time share requests. load_many() sends its lookups together::
+
+        >>> loader = buycoins_sdk.node_loader()
+        >>> payments = loader.load_many(payment_ids, enums.BuycoinsType.PAYMENT)
+
+    With an AsyncBuycoinsSDK, every load_async() made before the event loop gets to run the batch
+    is sent together, so gathering lookups batches them::
+
+        >>> payments = await asyncio.gather(*(loader.load_async(payment_id, enums.BuycoinsType.PAYMENT)
+        ...                                   for payment_id in payment_ids))
+
+    Each lookup gets the same response node() returns, or its own InvalidGraphQLNodeIDException. A batch holds at most
+    max_batch_size distinct IDs, and lookups of different GraphQL types are sent as separate nodes() queries, since a
+    node must be checked against the type it was looked up as.
+
+    Attributes:
+        buycoins_sdk: the BuycoinsSDK or AsyncBuycoinsSDK the nodes are fetched with
+        max_batch_size: the maximum number of distinct IDs in one nodes() query
+        wait: the number of seconds a batch waits for more lookups before it is sent
+    """
+
+    def __init__(self, buycoins_sdk, max_batch_size: int = 100, wait: float = 0.005):
+        """Create a new NodeLoader
+
+        Args:
+            buycoins_sdk: the BuycoinsSDK or AsyncBuycoinsSDK to fetch the nodes with
+            max_batch_size: the maximum number of distinct IDs in one nodes() query
+            wait: the number of seconds a batch waits for more lookups before it is sent. With 0, an async batch is
+                    sent as soon as the event loop runs
+        """
+        self.buycoins_sdk = buycoins_sdk
+        self.max_batch_size = max_batch_size
+        self.wait = wait
+        self._queue = []
+        self._full = threading.Event()
+        self._lock = threading.Lock()
+        self._async_queue = []
+        self._async_handle = None
+        self._async_tasks = set()
+
+    def load(self, node_id: str, gql_type: BuycoinsType) -> dict:
+        """Looks up a node together with the lookups other threads make within wait seconds
+
+        Args:
+            node_id: the Global object ID of the node
+            gql_type: the GraphQL type of the node
+
+        Returns:
+            A dict representing the GraphQL response, as returned by BuycoinsSDK.node
+        Raises:
+            InvalidGraphQLNodeIDException: You tried to search for a node with the wrong ID or wrong GraphQL type
+            BuycoinsException: An unspecified error occurred
+        """
+        return self.load_many([node_id], gql_type)[0]
+
+    def load_many(self, node_ids: List[str], gql_type: BuycoinsType) -> List[dict]:
+        """Looks up several nodes of one GraphQL type in as few requests as possible
+
+        Returns:
+            A list of responses, in the order of node_ids
+        Raises:
+            InvalidGraphQLNodeIDException: one of the IDs is wrong or is not of gql_type
+            BuycoinsException: An unspecified error occurred
+        """
+        loads = [_Load(node_id, gql_type) for node_id in node_ids]
+        with self._lock:
+            leader = not self._queue
+            self._queue.extend(loads)
+            if len(self._queue) >= self.max_batch_size:
+                self._full.set()
+
+        if leader:
+            self._full.wait(self.wait)
+            with self._lock:
+                batch, self._queue = self._queue, []
+                self._full.clear()
+            self._dispatch(batch)
+
+        results = []
+        for load in loads:
+            load.done.wait()
+            if load.error is not None:
+                raise load.error
+            results.append(load.result)
+        return results
+
+    async def load_async(self, node_id: str, gql_type: BuycoinsType) -> dict:
+        """The asyncio version of load(), for use with an AsyncBuycoinsSDK. Lookups made before the event loop runs the
+        batch are sent together
+
+        """
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self._async_queue.append((node_id, gql_type, future))
+        if len(self._async_queue) >= self.max_batch_size:
+            self._schedule_async(loop, 0)
+        elif self._async_handle is None:
+            self._schedule_async(loop, self.wait)
+        return await future
+
+    def _schedule_async(self, loop: asyncio.AbstractEventLoop, wait: float):
+        """Sends the queued async lookups after wait seconds, replacing the batch already scheduled
+
+        """
+        if self._async_handle is not None:
+            self._async_handle.cancel()
+        self._async_handle = loop.call_later(wait, self._start_async_batch) if wait else \
+            loop.call_soon(self._start_async_batch)
+
+    def _start_async_batch(self):
+        batch, self._async_queue, self._async_handle = self._async_queue, [], None
+        # the event loop only keeps a weak reference to a task, so it is kept until it is done
+        task = asyncio.ensure_future(self._dispatch_async(batch))
+        self._async_tasks.add(task)
+        task.add_done_callback(self._async_tasks.discard)
+
+    def _dispatch(self, batch: List[_Load]):
+        """Fetches a batch of lookups and sets the result or the error of each of them
+
+        """
+        try:
+            for gql_type, ids, loads in _group(batch, self.max_batch_size):
+                try:
+                    _resolve(loads, ids, self.buycoins_sdk.nodes(ids=ids, gql_types=[gql_type], partial=True,
+                                                                 chunk_size=self.max_batch_size))
+                except Exception as err:
+                    for load in loads:
+                        load.error = err
+        finally:
+            _finish(batch)
+
+    async def _dispatch_async(self, batch: List[Tuple[str, BuycoinsType, asyncio.Future]]):
+        """The asyncio version of _dispatch
+
+        """
+        loads = [_Load(node_id, gql_type) for node_id, gql_type, _ in batch]
+        try:
+            await asyncio.gather(*(self._fetch_async(gql_type, ids, group)
+                                   for gql_type, ids, group in _group(loads, self.max_batch_size)))
+        finally:
+            _finish(loads)
+            for load, (_, _, future) in zip(loads, batch):
+                if future.done():
+                    continue
+                if load.error is not None:
+                    future.set_exception(load.error)
+                else:
+                    future.set_result(load.result)
+
+    async def _fetch_async(self, gql_type: BuycoinsType, ids: List[str], loads: List[_Load]):
+        try:
+            _resolve(loads, ids, await self.buycoins_sdk.nodes(ids=ids, gql_types=[gql_type], partial=True,
+                                                               chunk_size=self.max_batch_size))
+        except Exception as err:
+            for load in loads:
+                load.error = err
@@ -1,14 +1,196 @@
+import copy
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from buycoins_sdk.client import BuycoinsGraphqlClient
-from buycoins_sdk.commons.enums import Cryptocurrency, OrderSide, GetOrdersStatus, BuycoinsType, PriceType
+from buycoins_sdk.commons import errors
+from buycoins_sdk.commons.enums import Cryptocurrency, OrderSide, GetOrdersStatus, BuycoinsType, PriceType, \
+    PaginationDirection, ExportFormat
+from buycoins_sdk.core.columnar import PostOrderArrays
+from buycoins_sdk.core.identity_map import IdentityMap
+from buycoins_sdk.core.loader import NodeLoader
+from buycoins_sdk.core.poller import MarketBookPoller
+from buycoins_sdk.core.price_cache import PriceCache
+from buycoins_sdk.core.store import SQLiteStore
+from buycoins_sdk.core.sync import CheckpointStore, FileCheckpointStore, PaymentSync
 from buycoins_sdk.core.types import Account, BankAccount, EstimatedFee, PostOrders, PaymentConnection, \
-    BuycoinsPrice, Order, Payment, DepositAccount, PostOrder, OnchainTransferRequest, Address
-from typing import Union, List, Dict
+    BuycoinsPrice, Order, Payment, DepositAccount, PostOrder, OnchainTransferRequest, Address, Event, PageInfo
+from typing import Any, Callable, Union, List, Dict, Iterable, Iterator, Optional, Tuple, TypeVar
 
 
 __all__ = [
     'BuycoinsSDK'
 ]
 
+T = TypeVar('T')
+
+
+def _one_or_many(from_dict: Callable[[dict], Any]) -> Callable[[List[dict]], Any]:
+    """Returns a function which converts a list of dicts to a list of objects with from_dict, or to a single object if
+    the list contains only one dict
+
+    Args:
+        from_dict: the from_dict method of a type
+
+    Returns:
+        The conversion function
+    """
+    def convert(items: List[dict]):
+        if len(items) > 1:
+            return [from_dict(item) for item in items]
+        else:
+            return from_dict(items[0])
+    return convert
+
+
+def _chunks(ids: List[str], size: int) -> List[List[str]]:
+    """Splits a list of IDs into lists of at most size IDs
+
+    """
+    return [ids[start:start + size] for start in range(0, len(ids), size)]
+
+
+def _cryptocurrencies(cryptocurrencies: Optional[Iterable[Cryptocurrency]]) -> List[Cryptocurrency]:
+    """Returns the distinct cryptocurrencies in cryptocurrencies, or every supported cryptocurrency if it is None
+
+    """
+    return list(dict.fromkeys(cryptocurrencies if cryptocurrencies is not None else Cryptocurrency))
+
+
+def _partial_results(results: Dict[Cryptocurrency, Any], partial: bool) -> Dict[Cryptocurrency, Any]:
+    """Returns the results of a call made for every cryptocurrency, in which a failed call is the exception it raised.
+    In partial mode the exceptions are returned in place of the results, otherwise the first one is raised
+
+    """
+    if not partial:
+        for result in results.values():
+            if isinstance(result, Exception):
+                raise result
+    return results
+
+
+def _post_orders_converter(columnar: bool, scale: Optional[int]) -> Callable[[dict], Any]:
+    """Returns the function which converts the data of a getMarketBook or getOrders response
+
+    """
+    if columnar:
+        return lambda fields: PostOrderArrays.from_dict(fields, scale=scale)
+    return PostOrders.from_dict
+
+
+def _page_args(direction: PaginationDirection, page_size: int, cursor: Optional[str]) -> dict:
+    """Returns the pagination arguments of the page after cursor, or of the first page if cursor is None
+
+    """
+    if direction is PaginationDirection.BACKWARD:
+        return {'last': page_size, 'before': cursor}
+    return {'first': page_size, 'after': cursor}
+
+
+def _page_items(items: List[T], page_info: PageInfo, direction: PaginationDirection) -> Tuple[List[T], Optional[str]]:
+    """Returns the items of a page in the order they are iterated over, and the cursor of the next page or None if it
+    was the last page
+
+    """
+    if direction is PaginationDirection.BACKWARD:
+        cursor = page_info.start_cursor if page_info.has_previous_page else None
+        items = items[::-1]
+    else:
+        cursor = page_info.end_cursor if page_info.has_next_page else None
+    return items, cursor if items else None
+
+
+def _pages(fetch_page: Callable[..., Any], items: Callable[[Any], List[T]], direction: PaginationDirection,
+           page_size: int, cursor: str = None) -> Iterator[List[T]]:
+    """Yields the items of every page of a connection after cursor, or from the first page if cursor is None, a page at
+    a time
+
+    """
+    while True:
+        page = fetch_page(**_page_args(direction, page_size, cursor))
+        page_items, cursor = _page_items(items(page), page.page_info, direction)
+        yield page_items
+        if cursor is None:
+            return
+
+
+def _prefetch(pages: Iterator[List[T]], depth: int) -> Iterator[List[T]]:
+    """Fetches pages on a background thread, at most depth pages ahead of the caller. The thread stops and closes pages
+    once the iterator is closed
+
+    """
+    buffer = queue.Queue(maxsize=depth)
+    stopped = threading.Event()
+
+    def put(entry: tuple) -> bool:
+        while not stopped.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for page in pages:
+                if not put((page, None)):
+                    return
+            put((None, None))
+        except BaseException as err:
+            put((None, err))
+        finally:
+            # pages is a generator running on this thread, so it has to be closed here
+            pages.close()
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            try:
+                page, error = buffer.get(timeout=0.1)
+            except queue.Empty:
+                if producer.is_alive():
+                    continue
+                # the producer may have put its last entry just before it exited
+                try:
+                    page, error = buffer.get_nowait()
+                except queue.Empty:
+                    raise errors.BuycoinsException("The thread prefetching pages stopped without finishing")
+            if error is not None:
+                raise error
+            if page is None:
+                return
+            yield page
+    finally:
+        stopped.set()
+
+
+def _paginate(fetch_page: Callable[..., Any], items: Callable[[Any], List[T]], direction: PaginationDirection,
+              page_size: int, until: Optional[Callable[[T], bool]], prefetch: int = 0) -> Iterator[T]:
+    """Yields the items of a connection one page at a time
+
+    Args:
+        fetch_page: a function which takes pagination arguments and returns a page of the connection
+        items: a function which returns the items of a page
+        direction: the direction to paginate in
+        page_size: the number of items fetched per request
+        until: a function which returns True for the first item which must not be yielded, or None
+        prefetch: the number of pages to fetch on a background thread ahead of the caller. 0 fetches each page when
+                it is needed
+    """
+    pages = _pages(fetch_page, items, direction, page_size)
+    if prefetch > 0:
+        pages = _prefetch(pages, prefetch)
+    try:
+        for page_items in pages:
+            for item in page_items:
+                if until is not None and until(item):
+                    return
+                yield item
+    finally:
+        pages.close()
+
 
 class BuycoinsSDK:
     """BuycoinsSDK is the entry point of the Buycoins SDK
@@ -19,11 +201,193 @@ class BuycoinsSDK:
         client: A BuycoinsGraphqlClient object where the actual GraphQL queries and mutations are made
     """
 
-    def __init__(self, public_key: str, secret_key: str):
+    _price_cache = None
+    _identity_map = None
+    _store = None
+
+    def __init__(self, public_key: str, secret_key: str, identity_map: IdentityMap = None, store: SQLiteStore = None,
+                 **client_options):
+        """Initialise a BuycoinsSDK
+
+        Args:
+            public_key: your BuyCoins public key as a string
+            secret_key: your BuyCoins secret key as a string
+            identity_map: an IdentityMap which keeps the nodes fetched with node() and nodes(), so that they are not
+                    fetched again
+            store: a SQLiteStore which keeps the payments, post orders, orders and onchain transfer requests the SDK
+                    returns, so that they can be queried without making a request
+            **client_options: keyword arguments passed on to BuycoinsGraphqlClient e.g pool_maxsize
+        """
         # TODO: decide whether to remove next 2 lines or not
         self._public_key = public_key
         self._secret_key = secret_key
-        self.client = BuycoinsGraphqlClient(public_key=public_key, secret_key=secret_key)
+        self._identity_map = identity_map
+        self._store = store
+        # created here rather than on first use, so that threads sharing the SDK and its copies share one cache
+        self._price_cache = PriceCache(fetch=self._fetch_prices)
+        self.client = BuycoinsGraphqlClient(public_key=public_key, secret_key=secret_key, **client_options)
+
+    def close(self):
+        """Close the pooled connections to the Buycoins API
+
+        """
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def with_options(self, **options: Any):
+        """Returns a copy of the SDK which makes its calls with different options, such as timeout, retry and
+        retry_mutations. See BuycoinsGraphqlClient.with_options for the options. The copy shares the connection pool of
+        the SDK, so only close one of them.
+
+        """
+        clone = copy.copy(self)
+        clone.client = self.client.with_options(**options)
+        return clone
+
+    @property
+    def price_cache(self) -> PriceCache:
+        """The PriceCache used by quote(). It is filled by every call to get_prices too
+
+        """
+        if self._price_cache is None:  # only when __init__ was skipped
+            self._price_cache = PriceCache(fetch=self._fetch_prices)
+        return self._price_cache
+
+    @property
+    def identity_map(self) -> Optional[IdentityMap]:
+        """The IdentityMap used by node() and nodes(), or None
+
+        """
+        return self._identity_map
+
+    @property
+    def store(self) -> Optional[SQLiteStore]:
+        """The SQLiteStore the payments, post orders, orders and onchain transfer requests the SDK returns are added
+        to, or None
+
+        """
+        return self._store
+
+    def handle_event(self, event: Union[Event, dict]) -> Event:
+        """Applies a webhook event from Buycoins to the SDK. Call this for every webhook request once it has been checked
+        with utils.is_valid_webhook_request.
+
+        The cached responses the event makes out of date, such as the balances after coins.incoming, are removed from
+        the response cache of the client. The node the event is about is removed from the identity map, and the payment
+        or order it carries is added to the store.
+
+        Args:
+            event: the Event, or the decoded request body of the webhook request
+
+        Returns:
+            The Event
+        Raises:
+            MissingFieldException: the request body is not a valid event
+        """
+        if not isinstance(event, Event):
+            event = Event.from_request_body(event)
+        cache = self.client.cache
+        if cache is not None:
+            cache.invalidate_for_event(event.event_type)
+        if self._identity_map is not None and isinstance(event.data, dict) and event.data.get('id'):
+            self._identity_map.invalidate(event.data['id'])
+        if self._store is not None:
+            self._store.upsert_event(event)
+        return event
+
+    def node_loader(self, max_batch_size: int = 100, wait: float = 0.005) -> NodeLoader:
+        """Returns a NodeLoader which batches node() lookups into nodes() queries. See NodeLoader for more details
+
+        Args:
+            max_batch_size: the maximum number of distinct IDs in one nodes() query
+            wait: the number of seconds a batch waits for more lookups before it is sent
+        """
+        return NodeLoader(self, max_batch_size=max_batch_size, wait=wait)
+
+    def market_book_poller(self, cryptocurrency: Cryptocurrency = Cryptocurrency.BITCOIN,
+                           **options: Any) -> MarketBookPoller:
+        """Returns a MarketBookPoller which keeps an OrderBook up to date with the market book of a cryptocurrency,
+        polling it at an interval that adapts to how often it changes. See MarketBookPoller for more details
+
+        Args:
+            cryptocurrency: the cryptocurrency of the market book
+            **options: page_size, max_pages, min_interval, max_interval and the other options of MarketBookPoller
+        """
+        return MarketBookPoller(self, cryptocurrency=cryptocurrency, **options)
+
+    def payment_sync(self, checkpoint: Union[str, CheckpointStore], page_size: int = 50) -> PaymentSync:
+        """Returns a PaymentSync which fetches only the payments made since its last sync. See PaymentSync for more
+        details
+
+        Args:
+            checkpoint: the path of the JSON file to keep the checkpoint in, or a CheckpointStore
+            page_size: the number of payments fetched per request
+        """
+        store = FileCheckpointStore(checkpoint) if isinstance(checkpoint, str) else checkpoint
+        return PaymentSync(self, store, page_size=page_size)
+
+    def exporter(self, path: str, export_format: ExportFormat = ExportFormat.CSV,
+                 checkpoint: Union[str, CheckpointStore] = None, **options: Any):
+        """Returns an Exporter which streams your payments or the market book into a file. See Exporter for more
+        details
+
+        Args:
+            path: the path of the file, or of the directory for Parquet
+            export_format: the format of the file
+            checkpoint: the path of the JSON file to keep the last cursor written in, or a CheckpointStore
+            **options: page_size, buffer_size and prefetch, passed on to Exporter
+        """
+        from buycoins_sdk.core.export import Exporter
+        return Exporter(self, path, export_format=export_format, checkpoint=checkpoint, **options)
+
+    def batch(self):
+        """Returns a BuycoinsSDKBatch which queues queries and sends them to the Buycoins API in a single request. See
+        BuycoinsSDKBatch for more details
+
+        """
+        from buycoins_sdk.core.batch import BuycoinsSDKBatch
+        return BuycoinsSDKBatch(self)
+
+    def _by_cryptocurrency(self, call: Callable[['BuycoinsSDK', Cryptocurrency], Any],
+                           cryptocurrencies: Optional[Iterable[Cryptocurrency]]) -> Dict[Cryptocurrency, Any]:
+        """Makes a call for every cryptocurrency and returns the results by cryptocurrency, or the exception a call
+        raised in place of its result. The calls are sent as one batch, so the API is only called once
+
+        Args:
+            call: a function which makes the call with the SDK it is given, for a cryptocurrency
+            cryptocurrencies: the cryptocurrencies, or None for every supported cryptocurrency
+        """
+        cryptocurrencies = _cryptocurrencies(cryptocurrencies)
+        with self.batch() as batch:
+            results = {cryptocurrency: call(batch, cryptocurrency) for cryptocurrency in cryptocurrencies}
+        return {cryptocurrency: result.exception() if result.exception() is not None else result.result()
+                for cryptocurrency, result in results.items()}
+
+    def _result(self, response: dict, convert: Callable[[Any], Any]) -> Any:
+        """Converts the data of a dict returned by a BuycoinsGraphqlClient method with the given function. Every method
+        of BuycoinsSDK which returns a native Python object goes through this method.
+
+        Args:
+            response: a dict returned by a BuycoinsGraphqlClient method
+            convert: a function which takes the data of the response and returns a native Python object
+
+        Returns:
+            The converted data
+        """
+        return self._keep(convert(response['data']))
+
+    def _keep(self, result: Any) -> Any:
+        """Adds the objects in a converted result to the store, if there is one, and returns the result
+
+        """
+        if self._store is not None:
+            self._store.upsert(result)
+        return result
 
     def get_balances(self, cryptocurrency: Cryptocurrency = None) -> Union[List[Account], Account]:
         """Retrieve supported cryptocurrencies account balance(s)
@@ -36,15 +400,7 @@ class BuycoinsSDK:
         Raises:
             BuycoinsException: An error occurred
         """
-        balances = self.client.get_balances(cryptocurrency)['data']
-        if len(balances) > 1:
-            result = []
-
-            for balance in balances:
-                result.append(Account.from_dict(balance))
-            return result
-        else:
-            return Account.from_dict(balances[0])
+        return self._result(self.client.get_balances(cryptocurrency), _one_or_many(Account.from_dict))
 
     def get_bank_accounts(self, account_number: str = None) -> Union[List[BankAccount], BankAccount]:
         """Retrieve bank accounts
@@ -57,15 +413,7 @@ class BuycoinsSDK:
         Raises:
             BuycoinsException: An error occurred
         """
-        bank_accounts = self.client.get_bank_accounts(account_number)['data']
-        if len(bank_accounts) > 1:
-            result = []
-
-            for account in bank_accounts:
-                result.append(BankAccount.from_dict(account))
-            return result
-        else:
-            return BankAccount.from_dict(bank_accounts[0])
+        return self._result(self.client.get_bank_accounts(account_number), _one_or_many(BankAccount.from_dict))
 
     def get_estimated_network_fee(self, amount: str,
                                   cryptocurrency: Cryptocurrency = Cryptocurrency.BITCOIN) -> EstimatedFee:
@@ -79,11 +427,31 @@ class BuycoinsSDK:
         Raises:
             BuycoinsException: An error occurred
         """
-        estimated_fee = self.client.get_estimated_network_fee(amount=amount, cryptocurrency=cryptocurrency)['data']
-        return EstimatedFee.from_dict(estimated_fee)
+        return self._result(self.client.get_estimated_network_fee(amount=amount, cryptocurrency=cryptocurrency),
+                            EstimatedFee.from_dict)
+
+    def get_estimated_network_fee_by_cryptocurrency(self, amount: str,
+                                                    cryptocurrencies: Iterable[Cryptocurrency] = None,
+                                                    partial: bool = False) -> Dict[Cryptocurrency, EstimatedFee]:
+        """Retrieve the estimated network fee to send an amount of several cryptocurrencies at once. See
+        get_market_book_by_cryptocurrency
+
+        Args:
+            amount: A string representing the amount of coins to calculate network fee for
+            cryptocurrencies: the cryptocurrencies to get the fee of. Defaults to every supported cryptocurrency
+            partial: whether to return the exception of a cryptocurrency which failed instead of raising it
+        Returns:
+            A dict mapping every cryptocurrency to its EstimatedFee
+        Raises:
+            BuycoinsException: An error occurred
+        """
+        return _partial_results(self._by_cryptocurrency(
+            lambda sdk, cryptocurrency: sdk.get_estimated_network_fee(amount=amount, cryptocurrency=cryptocurrency),
+            cryptocurrencies), partial)
 
     def get_market_book(self, first: int = None, last: int = None, after: str = None, before: str = None,
-                        cryptocurrency: Cryptocurrency = Cryptocurrency.BITCOIN) -> PostOrders:
+                        cryptocurrency: Cryptocurrency = Cryptocurrency.BITCOIN, columnar: bool = False,
+                        scale: int = None) -> Union[PostOrders, PostOrderArrays]:
         """Executes the getMarketBook query
 
             Args:
@@ -94,17 +462,47 @@ class BuycoinsSDK:
                 before: A string representing a cursor. Returns the elements in the list that come before the specified
                     cursor.
                 cryptocurrency: type of cryptocurrency.
+                columnar: return a PostOrderArrays with a NumPy array per field instead of a PostOrders. Needs NumPy
+                scale: with columnar, the number of decimal places of fixed point int64 prices and amounts, or None
+                    for float64 arrays
             Returns:
-                A dict representing the GraphQL response
+                A PostOrders object, or a PostOrderArrays object if columnar is True
             Raises:
                 BuycoinsException: An error occurred
         """
-        post_orders = self.client.get_market_book(first, last, after, before, cryptocurrency)['data']
-        return PostOrders.from_dict(post_orders)
+        return self._result(self.client.get_market_book(first, last, after, before, cryptocurrency),
+                            _post_orders_converter(columnar, scale))
+
+    def get_market_book_by_cryptocurrency(self, cryptocurrencies: Iterable[Cryptocurrency] = None, first: int = None,
+                                          last: int = None, partial: bool = False) -> Dict[Cryptocurrency, PostOrders]:
+        """Retrieve the market books of several cryptocurrencies at once. BuycoinsSDK sends every query in a single
+        batched request, and AsyncBuycoinsSDK sends a request per cryptocurrency, up to max_concurrency at a time.
+
+        Each cryptocurrency fails on its own. By default the first failure is raised, and in partial mode the exception
+        of a failed cryptocurrency is returned in place of its result, so that the others can still be used::
+
+            >>> market_books = buycoins_sdk.get_market_book_by_cryptocurrency(first=10, partial=True)
+            >>> market_books[enums.Cryptocurrency.ETHEREUM].post_order_edges
+
+        Args:
+            cryptocurrencies: the cryptocurrencies to get the market book of. Defaults to every supported
+                    cryptocurrency
+            first: For pagination. Returns the first n elements of every market book.
+            last: For pagination. Returns the last n elements of every market book.
+            partial: whether to return the exception of a cryptocurrency which failed instead of raising it
+        Returns:
+            A dict mapping every cryptocurrency to its PostOrders
+        Raises:
+            BuycoinsException: An error occurred
+        """
+        return _partial_results(self._by_cryptocurrency(
+            lambda sdk, cryptocurrency: sdk.get_market_book(first=first, last=last, cryptocurrency=cryptocurrency),
+            cryptocurrencies), partial)
 
     def get_orders(self, status: GetOrdersStatus, side: OrderSide = None, first: int = None, last: int = None,
                    after: str = None,
-                   before: str = None, cryptocurrency: Cryptocurrency = Cryptocurrency.BITCOIN) -> PostOrders:
+                   before: str = None, cryptocurrency: Cryptocurrency = Cryptocurrency.BITCOIN, columnar: bool = False,
+                   scale: int = None) -> Union[PostOrders, PostOrderArrays]:
         """Retrieve open orders
 
             Args:
@@ -117,12 +515,15 @@ class BuycoinsSDK:
                 before: A string representing a cursor. Returns the elements in the list that come before the specified
                     cursor.
                 cryptocurrency: type of cryptocurrency.
+                columnar: return a PostOrderArrays instead of a PostOrders. See get_market_book
+                scale: with columnar, the number of decimal places of fixed point prices and amounts
             Returns:
-                A PostOrders object representing the PostOrders type returned by the GraphQL API
+                A PostOrders object representing the PostOrders type returned by the GraphQL API, or a PostOrderArrays
+                object if columnar is True
             Raises:
                 BuycoinsException: An error occurred
         """
-        post_orders = self.client.get_orders(
+        return self._result(self.client.get_orders(
             side=side,
             first=first,
             last=last,
@@ -130,8 +531,29 @@ class BuycoinsSDK:
             before=before,
             cryptocurrency=cryptocurrency,
             status=status
-        )['data']
-        return PostOrders.from_dict(post_orders)
+        ), _post_orders_converter(columnar, scale))
+
+    def get_orders_by_cryptocurrency(self, status: GetOrdersStatus, cryptocurrencies: Iterable[Cryptocurrency] = None,
+                                     side: OrderSide = None, first: int = None, last: int = None,
+                                     partial: bool = False) -> Dict[Cryptocurrency, PostOrders]:
+        """Retrieve your orders in several cryptocurrencies at once. See get_market_book_by_cryptocurrency
+
+        Args:
+            status: the status of the orders to get
+            cryptocurrencies: the cryptocurrencies to get the orders of. Defaults to every supported cryptocurrency
+            side: the side of the orders to get
+            first: For pagination. Returns the first n orders of every cryptocurrency.
+            last: For pagination. Returns the last n orders of every cryptocurrency.
+            partial: whether to return the exception of a cryptocurrency which failed instead of raising it
+        Returns:
+            A dict mapping every cryptocurrency to its PostOrders
+        Raises:
+            BuycoinsException: An error occurred
+        """
+        return _partial_results(self._by_cryptocurrency(
+            lambda sdk, cryptocurrency: sdk.get_orders(status=status, side=side, first=first, last=last,
+                                                       cryptocurrency=cryptocurrency),
+            cryptocurrencies), partial)
 
     def get_payments(self, after: str = None, before: str = None, first: int = None,
                      last: int = None) -> PaymentConnection:
@@ -150,12 +572,83 @@ class BuycoinsSDK:
             BuycoinsException: An error occurred
 
         """
-        return PaymentConnection.from_dict(self.client.get_payments(
+        return self._result(self.client.get_payments(
             after=after,
             before=before,
             first=first,
             last=last
-        )['data'])
+        ), PaymentConnection.from_dict)
+
+    def iter_market_book(self, cryptocurrency: Cryptocurrency = Cryptocurrency.BITCOIN, page_size: int = 50,
+                         direction: PaginationDirection = PaginationDirection.FORWARD,
+                         until: Callable[[PostOrder], bool] = None, prefetch: int = 0) -> Iterator[PostOrder]:
+        """Iterates over the orders in the market book, fetching them one page at a time. Only one page is held in
+        memory, so the whole market book can be iterated over. Example::
+
+            >>> for order in buycoins_sdk.iter_market_book(cryptocurrency=enums.Cryptocurrency.ETHEREUM):
+            ...     print(order.price_per_coin)
+
+        Args:
+            cryptocurrency: type of cryptocurrency
+            page_size: the number of orders fetched per request
+            direction: FORWARD iterates from the first order, BACKWARD from the last
+            until: a function which returns True for the first order which must not be yielded, at which the iteration
+                    stops, e.g lambda order: order.created_at < cutoff
+            prefetch: the number of pages fetched on a background thread while the caller works through the current
+                    page, so that the requests overlap with the processing. At most prefetch pages are buffered
+
+        Returns:
+            An iterator of PostOrder objects
+        Raises:
+            BuycoinsException: An error occurred
+        """
+        return _paginate(lambda **page: self.get_market_book(cryptocurrency=cryptocurrency, **page),
+                         lambda post_orders: [edge.post_order for edge in post_orders.post_order_edges],
+                         direction, page_size, until, prefetch)
+
+    def iter_orders(self, status: GetOrdersStatus, side: OrderSide = None,
+                    cryptocurrency: Cryptocurrency = Cryptocurrency.BITCOIN, page_size: int = 50,
+                    direction: PaginationDirection = PaginationDirection.FORWARD,
+                    until: Callable[[PostOrder], bool] = None, prefetch: int = 0) -> Iterator[PostOrder]:
+        """Iterates over your orders, fetching them one page at a time. See iter_market_book
+
+        Args:
+            status: the status of the orders to get
+            side: the side of the orders to get
+            cryptocurrency: type of cryptocurrency
+            page_size: the number of orders fetched per request
+            direction: FORWARD iterates from the first order, BACKWARD from the last
+            until: a function which returns True for the first order which must not be yielded
+            prefetch: the number of pages fetched on a background thread ahead of the caller
+
+        Returns:
+            An iterator of PostOrder objects
+        Raises:
+            BuycoinsException: An error occurred
+        """
+        return _paginate(lambda **page: self.get_orders(status=status, side=side, cryptocurrency=cryptocurrency,
+                                                        **page),
+                         lambda post_orders: [edge.post_order for edge in post_orders.post_order_edges],
+                         direction, page_size, until, prefetch)
+
+    def iter_payments(self, page_size: int = 50, direction: PaginationDirection = PaginationDirection.FORWARD,
+                      until: Callable[[Payment], bool] = None, prefetch: int = 0) -> Iterator[Payment]:
+        """Iterates over your payments, fetching them one page at a time. See iter_market_book
+
+        Args:
+            page_size: the number of payments fetched per request
+            direction: FORWARD iterates from the first payment, BACKWARD from the last
+            until: a function which returns True for the first payment which must not be yielded
+            prefetch: the number of pages fetched on a background thread ahead of the caller
+
+        Returns:
+            An iterator of Payment objects
+        Raises:
+            BuycoinsException: An error occurred
+        """
+        return _paginate(lambda **page: self.get_payments(**page),
+                         lambda connection: [edge.payment for edge in connection.payment_edges],
+                         direction, page_size, until, prefetch)
 
     def get_prices(self, cryptocurrency: Cryptocurrency = None) \
             -> Union[List[BuycoinsPrice], BuycoinsPrice]:
@@ -171,18 +664,46 @@ class BuycoinsSDK:
             BuycoinsException: An error occurred
 
         """
-        prices = self.client.get_prices(cryptocurrency)['data']
-        if len(prices) > 1:
-            result = []
+        def convert(items: List[dict]):
+            prices = self._cache_prices(items)
+            return prices if len(prices) > 1 else prices[0]
+        return self._result(self.client.get_prices(cryptocurrency), convert)
 
-            for price in prices:
-                result.append(BuycoinsPrice.from_dict(price))
-            return result
-        else:
-            return BuycoinsPrice.from_dict(prices[0])
+    def quote(self, cryptocurrency: Cryptocurrency = Cryptocurrency.BITCOIN) -> BuycoinsPrice:
+        """Returns a live price of a cryptocurrency for buy or sell, from the price cache when it holds one
+
+        The price stays live for at least price_cache.safety_margin seconds, so its ID can be passed to buy() or sell()
+        straight away. Prices are fetched when the cache has no live price, and refreshed in the background shortly
+        before they expire. One getPrices query refreshes the prices of every cryptocurrency.
+
+        Args:
+            cryptocurrency: the cryptocurrency of the price
+
+        Returns:
+            A BuycoinsPrice object
+        Raises:
+            BuycoinsException: An error occurred
+
+        """
+        return self.price_cache.get(cryptocurrency)
+
+    def _fetch_prices(self):
+        """Fetches the prices of every cryptocurrency and adds them to the price cache
+
+        """
+        return self._result(self.client.get_prices(), self._cache_prices)
+
+    def _cache_prices(self, items: List[dict]) -> List[BuycoinsPrice]:
+        """Converts the data of a getPrices response to BuycoinsPrice objects and adds them to the price cache
+
+        """
+        prices = [BuycoinsPrice.from_dict(item) for item in items]
+        self.price_cache.update(prices)
+        return prices
 
     def node(self, node_id: str, gql_type: BuycoinsType) -> dict:
-        """Fetches an object given its ID.
+        """Fetches an object given its ID. With an identity map, a node which was fetched before is returned without
+        making a request while the identity map keeps it
 
         Args:
             node_id: the Global object ID of the node
@@ -196,29 +717,101 @@ class BuycoinsSDK:
 
         """
 
-        return self.client.node(
+        if self._identity_map is None:
+            return self.client.node(
+                node_id=node_id,
+                gql_type=gql_type
+            )
+        node = self._identity_map.get(node_id, (gql_type,))
+        if node is not None:
+            return {'data': node}
+
+        def remember(data: dict) -> dict:
+            self._identity_map.put(node_id, (gql_type,), data)
+            return {'data': data}
+
+        return self._result(self.client.node(
             node_id=node_id,
             gql_type=gql_type
-        )
+        ), remember)
+
+    def nodes(self, ids: List[str], gql_types: List[BuycoinsType], partial: bool = False, chunk_size: int = 100,
+              max_concurrency: int = 4) -> dict:
+        """Fetches a list of objects given a list of IDs. The IDs are fetched in chunks of at most chunk_size, up to
+        max_concurrency chunks at a time, and the nodes are returned in the order of ids. With an identity map, only the
+        IDs it does not keep are fetched.
 
-    def nodes(self, ids: List[str], gql_types: List[BuycoinsType]) -> dict:
-        """Fetches a list of objects given a list of IDs
+        In partial mode, a node which could not be looked up, or whose chunk failed, does not fail the whole call:
+        its place in the result is None and its ID is reported instead.
 
         Args:
             ids: the list of node IDs
             gql_types: the list of node types
+            partial: whether to return the nodes which were found when some of the IDs fail
+            chunk_size: the maximum number of IDs fetched in one request
+            max_concurrency: the maximum number of chunks fetched at the same time
 
         Returns:
-            A dict representing the GraphQL response
+            A dict representing the GraphQL response. In partial mode it also has failed_ids, the IDs which failed in
+            the order they were requested, and errors, the exception of every failed ID
         Raises:
             InvalidGraphQLNodeIDException: You tried to search for a node with the wrong ID or wrong GraphQL type
             BuycoinsException: An unspecified error occurred
 
         """
-        return self.client.nodes(
-            ids=ids,
-            gql_types=gql_types
-        )
+        cached, missing = self._cached_nodes(ids, gql_types)
+
+        def fetch(chunk: List[str]) -> Tuple[List[dict], Dict[str, Exception]]:
+            try:
+                return self.client.nodes(ids=chunk, gql_types=gql_types, partial=partial)['data'], {}
+            except Exception as err:
+                if not partial:
+                    raise
+                return [{}] * len(chunk), dict.fromkeys(chunk, err)
+
+        chunks = _chunks(missing, chunk_size)
+        if len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_concurrency, len(chunks))) as executor:
+                results = list(executor.map(fetch, chunks))
+        else:
+            results = [fetch(chunk) for chunk in chunks]
+        return self._nodes_response(ids, gql_types, cached, missing, results, partial)
+
+    def _cached_nodes(self, ids: List[str], gql_types: List[BuycoinsType]) -> Tuple[List[Optional[dict]], List[str]]:
+        """Returns the node the identity map keeps for every ID in ids, or None, and the distinct IDs to fetch
+
+        """
+        if self._identity_map is None:
+            cached = [None] * len(ids)
+        else:
+            cached = self._identity_map.get_many(ids, gql_types)
+        return cached, list(dict.fromkeys(node_id for node_id, node in zip(ids, cached) if node is None))
+
+    def _nodes_response(self, ids: List[str], gql_types: List[BuycoinsType], cached: List[Optional[dict]],
+                        fetched_ids: List[str], results: List[Tuple[List[dict], Dict[str, Exception]]],
+                        partial: bool) -> dict:
+        """Builds the response of nodes() from the cached nodes and the results of the chunks, in the order of ids
+
+        """
+        fetched = [node for nodes, _ in results for node in nodes]
+        if self._identity_map is not None:
+            nodes = self._identity_map.merge(ids, gql_types, cached, fetched_ids, fetched)
+        else:
+            by_id = dict(zip(fetched_ids, fetched))
+            nodes = [node if node is not None else by_id[node_id] for node_id, node in zip(ids, cached)]
+        if not partial:
+            return {'data': nodes}
+
+        chunk_errors = {}
+        for _, failures in results:
+            chunk_errors.update(failures)
+        gql_type = gql_types[0] if len(set(gql_types)) == 1 else None
+        failed = {}
+        for node_id, node in zip(ids, nodes):
+            if not node and node_id not in failed:
+                failed[node_id] = chunk_errors.get(node_id) or errors.InvalidGraphQLNodeIDException(
+                    node_id=node_id, gql_type=gql_type)
+        return {'data': [node or None for node in nodes], 'failed_ids': list(failed), 'errors': failed}
 
     def buy(self, price_id: str, coin_amount: str, cryptocurrency: Cryptocurrency = Cryptocurrency.BITCOIN) -> Order:
         """Buy supported cryptocurrencies
@@ -237,13 +830,11 @@ class BuycoinsSDK:
 
         """
 
-        return Order.from_dict(
-            self.client.buy(
-                price_id=price_id,
-                coin_amount=coin_amount,
-                cryptocurrency=cryptocurrency
-            )['data']
-        )
+        return self._result(self.client.buy(
+            price_id=price_id,
+            coin_amount=coin_amount,
+            cryptocurrency=cryptocurrency
+        ), Order.from_dict)
 
     def cancel_withdrawal(self, payment_id: str) -> Payment:
         """Cancel initiated withdrawal
@@ -259,11 +850,11 @@ class BuycoinsSDK:
              withdrawal
             BuycoinsException: An error occurred
         """
-        return Payment.from_dict(
-            self.client.cancel_withdrawal(
-                payment_id
-            )['data']
-        )
+        if self._identity_map is not None:
+            self._identity_map.invalidate(payment_id)
+        return self._result(self.client.cancel_withdrawal(
+            payment_id
+        ), Payment.from_dict)
 
     def create_address(self, cryptocurrency: Cryptocurrency = Cryptocurrency.BITCOIN) -> Address:
         """Create address to receive supported cryptocurrencies
@@ -277,11 +868,9 @@ class BuycoinsSDK:
         Raises:
             BuycoinsException: An error occurred
         """
-        return Address.from_dict(
-            self.client.create_address(
-                cryptocurrency=cryptocurrency
-            )['data']
-        )
+        return self._result(self.client.create_address(
+            cryptocurrency=cryptocurrency
+        ), Address.from_dict)
 
     def create_deposit_account(self, account_name: str) -> DepositAccount:
         """Generate deposit bank accounts to top up your NGNT account with Naira
@@ -295,11 +884,9 @@ class BuycoinsSDK:
         Raises:
             BuycoinsException: An error occurred
         """
-        return DepositAccount.from_dict(
-            self.client.create_deposit_account(
-                account_name=account_name
-            )['data']
-        )
+        return self._result(self.client.create_deposit_account(
+            account_name=account_name
+        ), DepositAccount.from_dict)
 
     def create_withdrawal(self, bank_account_id: str, amount: str) -> Payment:
         """Create a new withdrawal
@@ -314,12 +901,10 @@ class BuycoinsSDK:
         Raises:
             BuycoinsException: An error occurred
         """
-        return Payment.from_dict(
-            self.client.create_withdrawal(
-                bank_account_id=bank_account_id,
-                amount=amount
-            )['data']
-        )
+        return self._result(self.client.create_withdrawal(
+            bank_account_id=bank_account_id,
+            amount=amount
+        ), Payment.from_dict)
 
     # TODO: test
     def post_limit_order(self, order_side: OrderSide, coin_amount: str, static_price: str, price_type: PriceType,
@@ -342,16 +927,14 @@ class BuycoinsSDK:
             BuycoinsException: An error occurred
 
         """
-        return PostOrder.from_dict(
-            self.client.post_limit_order(
-                order_side=order_side,
-                coin_amount=coin_amount,
-                static_price=static_price,
-                price_type=price_type,
-                dynamic_exchange_rate=dynamic_exchange_rate,
-                cryptocurrency=cryptocurrency
-            )['data']
-        )
+        return self._result(self.client.post_limit_order(
+            order_side=order_side,
+            coin_amount=coin_amount,
+            static_price=static_price,
+            price_type=price_type,
+            dynamic_exchange_rate=dynamic_exchange_rate,
+            cryptocurrency=cryptocurrency
+        ), PostOrder.from_dict)
 
 
     # TODO: test o
@@ -372,13 +955,11 @@ class BuycoinsSDK:
 
         """
 
-        return PostOrder.from_dict(
-            self.client.post_market_order(
-                order_side=order_side,
-                coin_amount=coin_amount,
-                cryptocurrency=cryptocurrency
-            )['data']
-        )
+        return self._result(self.client.post_market_order(
+            order_side=order_side,
+            coin_amount=coin_amount,
+            cryptocurrency=cryptocurrency
+        ), PostOrder.from_dict)
 
     # TODO: test
     def sell(self, price_id: str, coin_amount: str, cryptocurrency: Cryptocurrency = Cryptocurrency.BITCOIN) -> Order:
@@ -398,13 +979,11 @@ class BuycoinsSDK:
 
         """
 
-        return Order.from_dict(
-            self.client.sell(
-                price_id=price_id,
-                cryptocurrency=cryptocurrency,
-                coin_amount=coin_amount
-            )['data']
-        )
+        return self._result(self.client.sell(
+            price_id=price_id,
+            cryptocurrency=cryptocurrency,
+            coin_amount=coin_amount
+        ), Order.from_dict)
 
     # TODO: TEST
     def send(self, address: str, amount: str, cryptocurrency: Cryptocurrency = Cryptocurrency.BITCOIN) -> OnchainTransferRequest:
@@ -421,13 +1000,11 @@ class BuycoinsSDK:
         Raises:
             BuycoinsException: An error occurred
         """
-        return OnchainTransferRequest.from_dict(
-            self.client.send(
-                address=address,
-                amount=amount,
-                cryptocurrency=cryptocurrency
-            )['data']
-        )
+        return self._result(self.client.send(
+            address=address,
+            amount=amount,
+            cryptocurrency=cryptocurrency
+        ), OnchainTransferRequest.from_dict)
 
     # TODO: TEST
     def send_offchain(self, recipient: str, amount: str,
@@ -445,10 +1022,10 @@ class BuycoinsSDK:
         Raises:
             BuycoinsException: An error occurred
         """
-        return self.client.send_offchain(
+        return self._result(self.client.send_offchain(
             recipient=recipient,
             amount=amount,
             cryptocurrency=cryptocurrency
-        )['data']['initiated']
+        ), lambda data: data['initiated'])
 
 
@@ -0,0 +1,214 @@
+"""
+This module contains the OrderBook class, which keeps a market book up to date from successive snapshots and reports
+what changed between them
+"""
+
+import bisect
+import threading
+from decimal import Decimal
+from buycoins_sdk.commons.enums import OrderSide
+from buycoins_sdk.core.types import PostOrder, PostOrders
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+__all__ = [
+    'BookDiff',
+    'OrderBook'
+]
+
+
+class BookDiff(NamedTuple):
+    """BookDiff is what changed in an OrderBook between two snapshots: the orders which were added, the orders which
+    were removed, and the new version of the orders whose price, amount or status changed
+
+    """
+    added: List[PostOrder]
+    removed: List[PostOrder]
+    changed: List[PostOrder]
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+
+def _key(post_order: PostOrder) -> tuple:
+    """Returns the fields of a post order which a snapshot can change
+
+    """
+    return post_order.price_per_coin, post_order.coin_amount, post_order.status, post_order.side
+
+
+class _Side:
+    """_Side holds the price levels of one side of the book: a sorted list of prices, and the total amount and the
+    number of orders at every price
+
+    """
+
+    def __init__(self):
+        self.prices: List[Decimal] = []
+        self.amounts: Dict[Decimal, Decimal] = {}
+        self.counts: Dict[Decimal, int] = {}
+
+    def add(self, price: Decimal, amount: Decimal):
+        if price not in self.counts:
+            bisect.insort(self.prices, price)
+            self.amounts[price] = Decimal(0)
+            self.counts[price] = 0
+        self.amounts[price] += amount
+        self.counts[price] += 1
+
+    def remove(self, price: Decimal, amount: Decimal):
+        self.counts[price] -= 1
+        if self.counts[price]:
+            self.amounts[price] -= amount
+            return
+        del self.prices[bisect.bisect_left(self.prices, price)]
+        del self.amounts[price]
+        del self.counts[price]
+
+
+class OrderBook:
+    """OrderBook keeps the post orders of a market book by ID, and the price levels of its bids and asks in sorted
+    order, so that a poller can apply each new snapshot and react to what changed instead of rescanning the whole book::
+
+        >>> order_book = OrderBook()
+        >>> order_book.add_listener(lambda diff: print(len(diff.added), 'new orders'))
+        >>> diff = order_book.apply(buycoins_sdk.get_market_book(first=100))
+        >>> order_book.best_ask()
+        (Decimal('17990000.0'), Decimal('0.5'))
+
+    Buy orders are bids and sell orders are asks. Prices and amounts are kept as Decimals. The best bid and ask are
+    found in O(1), a price is found in O(log n), and depth() returns the first levels without scanning the rest of the
+    book. Adding or removing a price level moves the levels after it, which is fast for books of a few thousand levels.
+
+    An OrderBook is safe to share between threads. Listeners are called with the diff of every snapshot which changed
+    the book, on the thread which applied it.
+
+    Attributes:
+        cryptocurrency: the cryptocurrency of the book, or None if it is not known yet
+    """
+
+    def __init__(self):
+        """Create a new, empty OrderBook
+
+        """
+        self.cryptocurrency = None
+        self._orders: Dict[str, PostOrder] = {}
+        self._sides = {OrderSide.BUY: _Side(), OrderSide.SELL: _Side()}
+        self._listeners: List[Callable[[BookDiff], None]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._orders)
+
+    def __contains__(self, order_id: str):
+        return order_id in self._orders
+
+    def get(self, order_id: str) -> Optional[PostOrder]:
+        """Returns the post order with an ID, or None if it is not in the book
+
+        """
+        return self._orders.get(order_id)
+
+    def add_listener(self, listener: Callable[[BookDiff], None]):
+        """Calls listener with the diff of every snapshot which changes the book
+
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[BookDiff], None]):
+        """Stops calling a listener added with add_listener
+
+        """
+        self._listeners.remove(listener)
+
+    def apply(self, snapshot: Union[PostOrders, Iterable[PostOrder]]) -> BookDiff:
+        """Replaces the book with a snapshot of the market book, and returns what changed. Orders which are not in the
+        snapshot are removed, so a snapshot must hold the whole book, such as the pages of iter_market_book
+
+        Args:
+            snapshot: a PostOrders returned by get_market_book, or the post orders of the whole book
+
+        Returns:
+            A BookDiff of the added, removed and changed orders
+        """
+        if isinstance(snapshot, PostOrders):
+            snapshot = [edge.post_order for edge in snapshot.post_order_edges]
+        orders = {post_order.id: post_order for post_order in snapshot}
+
+        with self._lock:
+            removed = [post_order for order_id, post_order in self._orders.items() if order_id not in orders]
+            added, changed = [], []
+            for order_id, post_order in orders.items():
+                current = self._orders.get(order_id)
+                if current is None:
+                    added.append(post_order)
+                elif _key(current) != _key(post_order):
+                    changed.append(post_order)
+                    self._unindex(current)
+                else:
+                    continue
+                self._index(post_order)
+            for post_order in removed:
+                self._unindex(post_order)
+                del self._orders[post_order.id]
+            self._orders.update((post_order.id, post_order) for post_order in added + changed)
+            if orders and self.cryptocurrency is None:
+                self.cryptocurrency = next(iter(orders.values())).cryptocurrency
+            diff = BookDiff(added=added, removed=removed, changed=changed)
+
+        if diff:
+            for listener in list(self._listeners):
+                listener(diff)
+        return diff
+
+    def _index(self, post_order: PostOrder):
+        self._sides[post_order.side].add(Decimal(post_order.price_per_coin), Decimal(post_order.coin_amount))
+
+    def _unindex(self, post_order: PostOrder):
+        self._sides[post_order.side].remove(Decimal(post_order.price_per_coin), Decimal(post_order.coin_amount))
+
+    def best_bid(self) -> Optional[Tuple[Decimal, Decimal]]:
+        """Returns the highest bid price and the total amount bid at it, or None if there are no bids
+
+        """
+        with self._lock:
+            bids = self._sides[OrderSide.BUY]
+            return (bids.prices[-1], bids.amounts[bids.prices[-1]]) if bids.prices else None
+
+    def best_ask(self) -> Optional[Tuple[Decimal, Decimal]]:
+        """Returns the lowest ask price and the total amount asked at it, or None if there are no asks
+
+        """
+        with self._lock:
+            asks = self._sides[OrderSide.SELL]
+            return (asks.prices[0], asks.amounts[asks.prices[0]]) if asks.prices else None
+
+    def spread(self) -> Optional[Decimal]:
+        """Returns the best ask price minus the best bid price, or None if either side is empty
+
+        """
+        best_bid, best_ask = self.best_bid(), self.best_ask()
+        if best_bid is None or best_ask is None:
+            return None
+        return best_ask[0] - best_bid[0]
+
+    def depth(self, side: OrderSide, levels: int = 10) -> List[Tuple[Decimal, Decimal]]:
+        """Returns the best price levels of a side of the book, best first
+
+        Args:
+            side: BUY for the bids, SELL for the asks
+            levels: the maximum number of levels to return
+
+        Returns:
+            A list of (price, total amount) tuples
+        """
+        with self._lock:
+            book_side = self._sides[side]
+            prices = book_side.prices[:-levels - 1:-1] if side is OrderSide.BUY else book_side.prices[:levels]
+            return [(price, book_side.amounts[price]) for price in prices]
+
+    def amount_at(self, side: OrderSide, price: Union[str, Decimal]) -> Decimal:
+        """Returns the total amount of the orders at a price on a side of the book, or 0
+
+        """
+        with self._lock:
+            return self._sides[side].amounts.get(Decimal(price), Decimal(0))
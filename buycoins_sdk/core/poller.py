@@ -0,0 +1,235 @@
+"""
+This module contains the MarketBookPoller class, which polls the market book at an interval that adapts to how often
+it changes
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from datetime import datetime, timezone
+from buycoins_sdk.commons import errors
+from buycoins_sdk.commons.enums import Cryptocurrency
+from buycoins_sdk.core.order_book import BookDiff, OrderBook
+from buycoins_sdk.core.types import PostOrder, PostOrders
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+__all__ = [
+    'MarketBookPoller'
+]
+
+
+_ISO_FORMATS = ('%Y-%m-%dT%H:%M:%S.%f%z', '%Y-%m-%dT%H:%M:%S%z', '%Y-%m-%dT%H:%M:%S.%f', '%Y-%m-%dT%H:%M:%S')
+
+
+def _digest(data: dict) -> bytes:
+    """Returns a hash of the orders of a getMarketBook response, which is the same for pages with the same orders. The
+    orders are hashed in the order the API returned their fields, since it does not change between responses
+
+    """
+    try:
+        edges = data['orders']['edges']
+    except KeyError as err:
+        raise errors.MissingFieldException(err.args[0])
+    return hashlib.blake2b(json.dumps(edges, separators=(',', ':')).encode(), digest_size=16).digest()
+
+
+def _expiry(value: Any) -> Optional[float]:
+    """Returns the Unix time in seconds of a dynamicPriceExpiry, given in seconds or milliseconds since the epoch or as
+    an ISO 8601 string, or None if it can't be parsed
+
+    """
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError:
+            text = value.strip().replace('Z', '+0000')
+            if len(text) > 6 and text[-3] == ':' and text[-6] in '+-':
+                text = text[:-3] + text[-2:]
+            for iso_format in _ISO_FORMATS:
+                try:
+                    parsed = datetime.strptime(text, iso_format)
+                except ValueError:
+                    continue
+                return (parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)).timestamp()
+            return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    # Unix times in seconds pass 1e11 in the year 5138, so larger values are milliseconds
+    return value / 1000 if value > 1e11 else float(value)
+
+
+def _next_cursor(data: dict) -> Optional[str]:
+    """Returns the cursor of the page after a page of the market book, or None if it is the last page
+
+    """
+    try:
+        page_info = data['orders']['pageInfo']
+        return page_info['endCursor'] if page_info['hasNextPage'] and data['orders']['edges'] else None
+    except KeyError as err:
+        raise errors.MissingFieldException(err.args[0])
+
+
+class MarketBookPoller:
+    """MarketBookPoller polls the market book of a cryptocurrency and keeps an OrderBook up to date with it, so that
+    consumers get the orders which changed instead of rescanning every snapshot.
+
+    Every page is hashed, and a poll whose pages are all unchanged is skipped without building PostOrder objects.
+    Changed pages are converted and applied to the OrderBook. The interval between polls adapts to the book: the
+    share of polls which changed the book is tracked as an exponentially weighted change rate, and the interval moves
+    from max_interval for a quiet book to min_interval for a busy one. A poll is also made no later than the
+    dynamicPriceExpiry of the book, when dynamic prices change.
+
+    Changes are delivered as BookDiffs, from stream() as a generator or stream_async() as an async generator, or to
+    the listeners of order_book::
+
+        >>> poller = buycoins_sdk.market_book_poller(enums.Cryptocurrency.ETHEREUM)
+        >>> for diff in poller.stream():
+        ...     print(poller.order_book.best_ask(), len(diff.added), len(diff.removed))
+
+    Attributes:
+        buycoins_sdk: the BuycoinsSDK or AsyncBuycoinsSDK the market book is polled with
+        cryptocurrency: the cryptocurrency of the market book
+        order_book: the OrderBook kept up to date with the market book
+        page_size: the number of orders fetched per request
+        max_pages: the maximum number of pages fetched per poll
+        min_interval: the number of seconds between polls of a busy book
+        max_interval: the number of seconds between polls of a quiet book
+        interval: the number of seconds until the next poll
+        change_rate: the exponentially weighted share of polls which changed the book, between 0 and 1
+        polls: the number of polls made
+        skipped: the number of polls whose pages were all unchanged
+    """
+
+    def __init__(self, buycoins_sdk, cryptocurrency: Cryptocurrency = Cryptocurrency.BITCOIN, page_size: int = 100,
+                 max_pages: int = 1, min_interval: float = 1.0, max_interval: float = 30.0, smoothing: float = 0.3,
+                 order_book: OrderBook = None, clock: Callable[[], float] = time.time,
+                 sleep: Callable[[float], None] = time.sleep):
+        """Create a new MarketBookPoller
+
+        Args:
+            buycoins_sdk: the BuycoinsSDK or AsyncBuycoinsSDK to poll the market book with
+            cryptocurrency: the cryptocurrency of the market book
+            page_size: the number of orders fetched per request
+            max_pages: the maximum number of pages fetched per poll. Orders after them are not in the order book
+            min_interval: the number of seconds between polls of a busy book
+            max_interval: the number of seconds between polls of a quiet book
+            smoothing: the weight of the latest poll in the change rate, between 0 and 1
+            order_book: the OrderBook to keep up to date. Defaults to a new OrderBook
+            clock: a function returning the current Unix time
+            sleep: the function stream() waits between polls with
+        """
+        self.buycoins_sdk = buycoins_sdk
+        self.cryptocurrency = cryptocurrency
+        self.order_book = order_book if order_book is not None else OrderBook()
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.change_rate = 1.0
+        self.polls = 0
+        self.skipped = 0
+        self._smoothing = smoothing
+        self._clock = clock
+        self._sleep = sleep
+        self._pages: Dict[int, Tuple[bytes, List[PostOrder]]] = {}
+        self._expiry = None
+
+    def _fetch(self, cursor: Optional[str]):
+        return self.buycoins_sdk.client.get_market_book(first=self.page_size, after=cursor,
+                                                        cryptocurrency=self.cryptocurrency)
+
+    def _page(self, index: int, data: dict) -> bool:
+        """Keeps a fetched page, converting it only if its hash changed, and returns whether it changed
+
+        """
+        if index == 0:
+            self._expiry = _expiry(data.get('dynamicPriceExpiry'))
+        digest = _digest(data)
+        cached = self._pages.get(index)
+        if cached is not None and cached[0] == digest:
+            return False
+        post_orders = PostOrders.from_dict(data)
+        self._pages[index] = (digest, [edge.post_order for edge in post_orders.post_order_edges])
+        if self.buycoins_sdk.store is not None:
+            self.buycoins_sdk.store.upsert(post_orders)
+        return True
+
+    def _finish(self, pages: int, changed: bool) -> BookDiff:
+        """Applies the pages of a poll to the order book and works out the interval until the next poll
+
+        """
+        for index in [index for index in self._pages if index >= pages]:
+            del self._pages[index]
+            changed = True
+        self.polls += 1
+        if changed:
+            diff = self.order_book.apply([post_order for index in sorted(self._pages)
+                                          for post_order in self._pages[index][1]])
+        else:
+            self.skipped += 1
+            diff = BookDiff(added=[], removed=[], changed=[])
+
+        self.change_rate += self._smoothing * ((1.0 if diff else 0.0) - self.change_rate)
+        interval = self.max_interval - (self.max_interval - self.min_interval) * self.change_rate
+        now = self._clock()
+        if self._expiry is not None and self._expiry > now:
+            interval = min(interval, self._expiry - now)
+        self.interval = max(self.min_interval, interval)
+        return diff
+
+    def poll(self) -> BookDiff:
+        """Polls the market book once and applies it to the order book
+
+        Returns:
+            The BookDiff of the poll, which is empty if the book did not change
+        Raises:
+            BuycoinsException: An error occurred
+        """
+        cursor, changed, pages = None, False, 0
+        while pages < self.max_pages:
+            data = self._fetch(cursor)['data']
+            changed = self._page(pages, data) or changed
+            pages += 1
+            cursor = _next_cursor(data)
+            if cursor is None:
+                break
+        return self._finish(pages, changed)
+
+    async def poll_async(self) -> BookDiff:
+        """The asyncio version of poll(), for use with an AsyncBuycoinsSDK
+
+        """
+        cursor, changed, pages = None, False, 0
+        while pages < self.max_pages:
+            data = (await self._fetch(cursor))['data']
+            changed = self._page(pages, data) or changed
+            pages += 1
+            cursor = _next_cursor(data)
+            if cursor is None:
+                break
+        return self._finish(pages, changed)
+
+    def stream(self) -> Iterator[BookDiff]:
+        """Polls the market book until the generator is closed, waiting interval seconds between polls, and yields the
+        diff of every poll which changed the book
+
+        Raises:
+            BuycoinsException: An error occurred
+        """
+        while True:
+            diff = self.poll()
+            if diff:
+                yield diff
+            self._sleep(self.interval)
+
+    async def stream_async(self) -> AsyncIterator[BookDiff]:
+        """The asyncio version of stream(), for use with an AsyncBuycoinsSDK. It waits with asyncio.sleep
+
+        """
+        while True:
+            diff = await self.poll_async()
+            if diff:
+                yield diff
+            await asyncio.sleep(self.interval)
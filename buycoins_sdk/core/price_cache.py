@@ -0,0 +1,196 @@
+"""
+This module contains the PriceCache class, which keeps the latest live price of every cryptocurrency
+"""
+
+import asyncio
+import threading
+import time
+from buycoins_sdk.commons import errors
+from buycoins_sdk.commons.enums import BuycoinsPriceStatus, Cryptocurrency
+from buycoins_sdk.core.types import BuycoinsPrice
+from typing import Awaitable, Callable, List, Optional
+
+__all__ = [
+    'PriceCache'
+]
+
+
+class PriceCache:
+    """PriceCache keeps the latest BuycoinsPrice of every cryptocurrency until shortly before it expires, so that a buy
+    or a sell can use a cached price ID instead of fetching prices first.
+
+    A price is live until safety_margin seconds before its expires_at. get() returns a live price straight away, and
+    once the price is within refresh_ahead seconds of expiring it also refreshes every price in a background thread,
+    so that callers rarely wait for a refresh. Every refresh fetches the prices of every cryptocurrency with a single
+    getPrices query. Prices returned by BuycoinsSDK.get_prices are added to the cache too.
+
+    A PriceCache is safe to share between threads.
+
+    Attributes:
+        safety_margin: the number of seconds before expires_at after which a price is no longer used
+        refresh_ahead: the number of seconds before a price stops being live at which a background refresh starts
+        last_refresh_error: the exception raised by the last background refresh, or None if it succeeded
+    """
+
+    def __init__(self, fetch: Callable[[], List[BuycoinsPrice]] = None, safety_margin: float = 5.0,
+                 refresh_ahead: float = 15.0, clock: Callable[[], float] = time.time):
+        """Create a new PriceCache
+
+        Args:
+            fetch: a function which fetches the prices of every cryptocurrency. Without it, the cache is only filled
+                    with update()
+            safety_margin: the number of seconds before expires_at after which a price is no longer used
+            refresh_ahead: the number of seconds before a price stops being live at which a background refresh starts
+            clock: a function returning the current Unix time
+        """
+        self.safety_margin = safety_margin
+        self.refresh_ahead = refresh_ahead
+        self.last_refresh_error = None
+        self._fetch = fetch
+        self._clock = clock
+        self._prices = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+        self._async_refresh = None
+
+    def update(self, prices: List[BuycoinsPrice]):
+        """Adds prices to the cache, replacing older prices of the same cryptocurrencies
+
+        Args:
+            prices: the prices to add
+        """
+        with self._lock:
+            for price in prices:
+                current = self._prices.get(price.cryptocurrency)
+                if current is None or price.expires_at >= current.expires_at:
+                    self._prices[price.cryptocurrency] = price
+
+    def invalidate(self, cryptocurrency: Cryptocurrency = None):
+        """Removes the price of a cryptocurrency from the cache, or every price if no cryptocurrency is given
+
+        """
+        with self._lock:
+            if cryptocurrency is None:
+                self._prices.clear()
+            else:
+                self._prices.pop(cryptocurrency, None)
+
+    def peek(self, cryptocurrency: Cryptocurrency) -> Optional[BuycoinsPrice]:
+        """Returns the cached price of a cryptocurrency if it is live, else None. Never makes a request
+
+        """
+        price = self._prices.get(cryptocurrency)
+        if price is None or price.status is not BuycoinsPriceStatus.ACTIVE:
+            return None
+        if self._clock() >= price.expires_at - self.safety_margin:
+            return None
+        return price
+
+    def needs_refresh(self, cryptocurrency: Cryptocurrency) -> bool:
+        """Returns whether the price of a cryptocurrency is missing, expired or about to stop being live
+
+        """
+        price = self.peek(cryptocurrency)
+        return price is None or self._clock() >= price.expires_at - self.safety_margin - self.refresh_ahead
+
+    def get(self, cryptocurrency: Cryptocurrency) -> BuycoinsPrice:
+        """Returns a live price of a cryptocurrency, fetching the prices if the cache has no live price
+
+        Args:
+            cryptocurrency: the cryptocurrency of the price
+
+        Returns:
+            A BuycoinsPrice which stays live for at least safety_margin seconds
+
+        Raises:
+            BuycoinsException: the prices could not be fetched, or the API did not return a live price
+        """
+        price = self.peek(cryptocurrency)
+        if price is not None:
+            if self.needs_refresh(cryptocurrency):
+                self._refresh_in_background()
+            return price
+
+        # only one thread fetches, the others wait for it and use its prices
+        with self._refresh_lock:
+            price = self.peek(cryptocurrency)
+            if price is None:
+                self.refresh()
+                price = self.peek(cryptocurrency)
+        if price is None:
+            raise errors.BuycoinsException(f"The Buycoins API did not return a live price for {cryptocurrency.value}")
+        return price
+
+    async def get_async(self, cryptocurrency: Cryptocurrency,
+                        fetch: Callable[[], Awaitable[List[BuycoinsPrice]]]) -> BuycoinsPrice:
+        """The asyncio version of get(), which fetches the prices with a coroutine function instead of the fetch
+        function of the cache. Refreshes are shared by every coroutine waiting for one
+
+        Args:
+            cryptocurrency: the cryptocurrency of the price
+            fetch: a coroutine function which fetches the prices of every cryptocurrency
+
+        Returns:
+            A BuycoinsPrice which stays live for at least safety_margin seconds
+
+        Raises:
+            BuycoinsException: the prices could not be fetched, or the API did not return a live price
+        """
+        price = self.peek(cryptocurrency)
+        if price is not None:
+            if self.needs_refresh(cryptocurrency):
+                self._refresh_async(fetch)
+            return price
+
+        await self._refresh_async(fetch)
+        price = self.peek(cryptocurrency)
+        if price is None:
+            raise errors.BuycoinsException(f"The Buycoins API did not return a live price for {cryptocurrency.value}")
+        return price
+
+    def refresh(self):
+        """Fetches the prices of every cryptocurrency and adds them to the cache
+
+        """
+        if self._fetch is None:
+            raise errors.BuycoinsException("This PriceCache has no function to fetch prices with")
+        self.update(self._fetch())
+
+    def _refresh_in_background(self):
+        """Starts a background refresh unless one is already running
+
+        """
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._background_refresh, daemon=True).start()
+
+    def _refresh_async(self, fetch: Callable[[], Awaitable[List[BuycoinsPrice]]]) -> asyncio.Future:
+        """Starts a refresh on the event loop unless one is already running, and returns it
+
+        """
+        if self._async_refresh is None or self._async_refresh.done():
+            async def refresh():
+                self.update(await fetch())
+
+            def done(future: asyncio.Future):
+                if not future.cancelled():
+                    self.last_refresh_error = future.exception()
+
+            self._async_refresh = asyncio.ensure_future(refresh())
+            self._async_refresh.add_done_callback(done)
+        return self._async_refresh
+
+    def _background_refresh(self):
+        try:
+            with self._refresh_lock:
+                self.refresh()
+            self.last_refresh_error = None
+        except Exception as err:
+            # the next get() after the price expires refreshes in the foreground and raises
+            self.last_refresh_error = err
+        finally:
+            with self._lock:
+                self._refreshing = False
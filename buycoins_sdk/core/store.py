@@ -0,0 +1,240 @@
+"""
+This module contains the SQLiteStore class, which keeps payments, orders and transfers in a local SQLite database
+"""
+
+import json
+import sqlite3
+import threading
+from enum import Enum
+from buycoins_sdk.commons import errors
+from buycoins_sdk.commons.enums import Cryptocurrency, EventType, OnchainTransferRequestStatus, OrderSide, \
+    OrderStatus, PaymentStatus, PaymentTypes, PostOrderStatus
+from buycoins_sdk.core.types import BuycoinsPrice, Event, OnchainTransferRequest, Order, Payment, PaymentConnection, \
+    PostOrder, PostOrders
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+__all__ = [
+    'SQLiteStore'
+]
+
+
+class _Table(NamedTuple):
+    """_Table is how the objects of a type are kept: the table they are kept in, the columns they are queried by and
+    the function which rebuilds an object from its fields
+
+    """
+    name: str
+    columns: Tuple[str, ...]
+    decode: Callable[[dict], Any]
+
+
+def _encode(obj: Any) -> dict:
+    """Returns the arguments the constructor of an object was called with, so that they can be stored as JSON
+
+    """
+    fields = {}
+    for name, value in vars(obj).items():
+        if isinstance(value, Enum):
+            value = value.value
+        elif isinstance(value, BuycoinsPrice):
+            value = _encode(value)
+        fields['node_id' if name == 'id' else name] = value
+    return fields
+
+
+def _decode_order(fields: dict) -> Order:
+    return Order(**dict(fields, price=BuycoinsPrice(**fields['price'])))
+
+
+_TABLES = {
+    Payment: _Table('payments', ('created_at', 'status', 'payment_type', 'amount'), lambda fields: Payment(**fields)),
+    PostOrder: _Table('post_orders', ('created_at', 'status', 'cryptocurrency', 'side'),
+                      lambda fields: PostOrder(**fields)),
+    Order: _Table('orders', ('created_at', 'status', 'cryptocurrency', 'side'), _decode_order),
+    OnchainTransferRequest: _Table('onchain_transfer_requests', ('created_at', 'status', 'cryptocurrency'),
+                                   lambda fields: OnchainTransferRequest(**fields))
+}
+
+_EVENT_TYPES = {
+    EventType.BANK_DEPOSIT_INCOMING: Payment,
+    EventType.ORDER_SUCCEEDED: Order,
+    EventType.ORDER_FAILED: Order
+}
+
+
+def _column(name: str, value: Any) -> Any:
+    """Returns the value of an indexed column. Amounts are kept as numbers so that they can be compared
+
+    """
+    if isinstance(value, Enum):
+        return value.value
+    if name == 'amount':
+        return float(value)
+    return value
+
+
+class SQLiteStore:
+    """SQLiteStore keeps the payments, post orders, orders and onchain transfer requests the SDK gets from the Buycoins
+    API in a SQLite database, so that questions such as "all withdrawals over N naira last week" or "open sell orders
+    for ETH" are answered without making a request.
+
+    Pass it to BuycoinsSDK and every such object returned by the SDK, including the items of the market book, your
+    orders and your payments, is added to the store, replacing the older copy of the same node. The payments and
+    orders of webhook events given to BuycoinsSDK.handle_event are added too::
+
+        >>> store = SQLiteStore('buycoins.db')
+        >>> buycoins_sdk = BuycoinsSDK(public_key, secret_key, store=store)
+        >>> buycoins_sdk.get_payments(first=100)
+        >>> store.payments(payment_type=enums.PaymentTypes.WITHDRAWAL, min_amount=50000, since=last_week)
+
+    The queries return the same objects as the SDK. Objects are kept by their ID, and the columns they are queried by
+    are indexed. A SQLiteStore is safe to share between threads.
+
+    Attributes:
+        path: the path of the database file, or ':memory:' for a database which is not saved
+    """
+
+    def __init__(self, path: str = ':memory:'):
+        """Create a new SQLiteStore, creating the database if it does not exist
+
+        Args:
+            path: the path of the database file, or ':memory:' for a database which is not saved
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            for table in _TABLES.values():
+                self._connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table.name} "
+                    f"(id TEXT PRIMARY KEY, {', '.join(table.columns)}, fields TEXT NOT NULL)")
+                for column in table.columns:
+                    if column != 'amount':
+                        self._connection.execute(f"CREATE INDEX IF NOT EXISTS {table.name}_{column} "
+                                                 f"ON {table.name} ({column})")
+
+    def close(self):
+        """Close the database
+
+        """
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def upsert(self, result: Any):
+        """Adds the objects in the result of an SDK method to the store, replacing the stored objects with the same IDs.
+        Objects which are not kept, such as balances, are ignored
+
+        Args:
+            result: a Payment, PostOrder, Order or OnchainTransferRequest, a PostOrders, a PaymentConnection or a list
+                    of them
+        """
+        rows = {}
+        self._collect(result, rows)
+        with self._lock, self._connection:
+            for table, table_rows in rows.items():
+                self._connection.executemany(
+                    f"INSERT OR REPLACE INTO {table.name} (id, {', '.join(table.columns)}, fields) "
+                    f"VALUES ({', '.join('?' * (len(table.columns) + 2))})", table_rows)
+
+    def upsert_event(self, event: Event):
+        """Adds the payment or the order a webhook event is about to the store. Events whose data is not a complete node
+        are ignored
+
+        Args:
+            event: the webhook Event
+        """
+        cls = _EVENT_TYPES.get(event.event_type)
+        if cls is None or not isinstance(event.data, dict):
+            return
+        try:
+            node = cls.from_dict(event.data)
+        except (errors.MissingFieldException, TypeError, ValueError):
+            return
+        self.upsert(node)
+
+    def _collect(self, result: Any, rows: Dict[_Table, List[tuple]]):
+        if isinstance(result, list):
+            for item in result:
+                self._collect(item, rows)
+        elif isinstance(result, PostOrders):
+            self._collect([edge.post_order for edge in result.post_order_edges], rows)
+        elif isinstance(result, PaymentConnection):
+            self._collect([edge.payment for edge in result.payment_edges], rows)
+        elif type(result) in _TABLES:
+            table = _TABLES[type(result)]
+            rows.setdefault(table, []).append(
+                (result.id, *(_column(column, getattr(result, column)) for column in table.columns),
+                 json.dumps(_encode(result))))
+
+    def _query(self, cls: type, filters: Dict[str, Any], since: Optional[int], until: Optional[int],
+               limit: Optional[int], min_amount: float = None) -> List[Any]:
+        """Returns the stored objects of a type whose columns are equal to the filters which are not None, created
+        between since and until, oldest first
+
+        """
+        table = _TABLES[cls]
+        conditions, parameters = [], []
+        for column, value in filters.items():
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                parameters.append(_column(column, value))
+        for condition, value in (('created_at >= ?', since), ('created_at < ?', until), ('amount >= ?', min_amount)):
+            if value is not None:
+                conditions.append(condition)
+                parameters.append(value)
+        sql = f"SELECT fields FROM {table.name}"
+        if conditions:
+            sql += f" WHERE {' AND '.join(conditions)}"
+        sql += " ORDER BY created_at, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(limit)
+        with self._lock:
+            rows = self._connection.execute(sql, parameters).fetchall()
+        return [table.decode(json.loads(fields)) for fields, in rows]
+
+    def payments(self, status: PaymentStatus = None, payment_type: PaymentTypes = None, min_amount: float = None,
+                 since: int = None, until: int = None, limit: int = None) -> List[Payment]:
+        """Returns the stored payments, oldest first
+
+        Args:
+            status: only return payments with this status
+            payment_type: only return deposits or withdrawals
+            min_amount: only return payments of at least this amount
+            since: only return payments created at or after this Unix time
+            until: only return payments created before this Unix time
+            limit: the maximum number of payments to return
+        """
+        return self._query(Payment, {'status': status, 'payment_type': payment_type}, since, until, limit,
+                           min_amount=min_amount)
+
+    def post_orders(self, status: PostOrderStatus = None, cryptocurrency: Cryptocurrency = None,
+                    side: OrderSide = None, since: int = None, until: int = None,
+                    limit: int = None) -> List[PostOrder]:
+        """Returns the stored post orders, oldest first. See payments
+
+        """
+        return self._query(PostOrder, {'status': status, 'cryptocurrency': cryptocurrency, 'side': side}, since,
+                           until, limit)
+
+    def orders(self, status: OrderStatus = None, cryptocurrency: Cryptocurrency = None, side: OrderSide = None,
+               since: int = None, until: int = None, limit: int = None) -> List[Order]:
+        """Returns the stored orders, oldest first. See payments
+
+        """
+        return self._query(Order, {'status': status, 'cryptocurrency': cryptocurrency, 'side': side}, since, until,
+                           limit)
+
+    def onchain_transfer_requests(self, status: OnchainTransferRequestStatus = None,
+                                  cryptocurrency: Cryptocurrency = None, since: int = None, until: int = None,
+                                  limit: int = None) -> List[OnchainTransferRequest]:
+        """Returns the stored onchain transfer requests, oldest first. See payments
+
+        """
+        return self._query(OnchainTransferRequest, {'status': status, 'cryptocurrency': cryptocurrency}, since,
+                           until, limit)
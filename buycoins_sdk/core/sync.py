@@ -0,0 +1,225 @@
+"""
+This module contains the PaymentSync class, which fetches the payments made since the last sync, and the stores it
+keeps its checkpoint in
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+from buycoins_sdk.commons import errors
+from buycoins_sdk.commons.enums import BuycoinsType, PaymentStatus
+from buycoins_sdk.core.types import Payment, PaymentConnection
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+__all__ = [
+    'Checkpoint',
+    'CheckpointStore',
+    'FileCheckpointStore',
+    'PaymentSync',
+    'SyncResult',
+    'PENDING_PAYMENT_STATUSES'
+]
+
+PENDING_PAYMENT_STATUSES = frozenset([PaymentStatus.PENDING, PaymentStatus.INITIATED,
+                                      PaymentStatus.READY_FOR_PROCESSING])
+
+
+class Checkpoint(NamedTuple):
+    """Checkpoint is how far a PaymentSync got: the cursor of the last payment it fetched, and the status of every
+    payment it fetched which was still pending, by payment ID. pending is None when no payment is pending
+
+    """
+    cursor: Optional[str] = None
+    pending: Optional[Dict[str, str]] = None
+
+
+class SyncResult(NamedTuple):
+    """SyncResult holds the payments a sync found: new are the payments made since the last sync, in the order of the
+    connection, and updated are the pending payments from earlier syncs whose status changed
+
+    """
+    new: List[Payment]
+    updated: List[Payment]
+
+
+class CheckpointStore:
+    """CheckpointStore is the interface of the stores a PaymentSync keeps its checkpoint in. Subclass it to keep the
+    checkpoint in a database shared by the machines running the sync job
+
+    """
+
+    def load(self) -> Checkpoint:
+        """Returns the saved checkpoint, or an empty Checkpoint if none was saved
+
+        """
+        raise NotImplementedError
+
+    def save(self, checkpoint: Checkpoint):
+        """Saves a checkpoint, replacing the saved one. A checkpoint must either be saved whole or not at all
+
+        """
+        raise NotImplementedError
+
+
+class FileCheckpointStore(CheckpointStore):
+    """FileCheckpointStore keeps the checkpoint in a JSON file. The file is replaced atomically, so a sync which is
+    interrupted while saving leaves the previous checkpoint in place
+
+    Attributes:
+        path: the path of the checkpoint file
+    """
+
+    def __init__(self, path: str):
+        """Create a new FileCheckpointStore
+
+        Args:
+            path: the path of the checkpoint file. It is created on the first save
+        """
+        self.path = path
+
+    def load(self) -> Checkpoint:
+        try:
+            with open(self.path) as file:
+                fields = json.load(file)
+        except FileNotFoundError:
+            return Checkpoint(pending={})
+        return Checkpoint(cursor=fields.get('cursor'), pending=fields.get('pending') or {})
+
+    def save(self, checkpoint: Checkpoint):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.checkpoint-')
+        try:
+            with os.fdopen(fd, 'w') as file:
+                json.dump({'cursor': checkpoint.cursor, 'pending': checkpoint.pending or {}}, file)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+def _add_page(checkpoint: Checkpoint, connection: PaymentConnection) -> Checkpoint:
+    """Returns the checkpoint after a page of new payments
+
+    """
+    if not connection.payment_edges:
+        return checkpoint
+    pending = dict(checkpoint.pending or {})
+    for edge in connection.payment_edges:
+        if edge.payment.status in PENDING_PAYMENT_STATUSES:
+            pending[edge.payment.id] = edge.payment.status.value
+    return Checkpoint(cursor=connection.payment_edges[-1].cursor, pending=pending)
+
+
+def _recheck(checkpoint: Checkpoint, response: dict) -> Tuple[Checkpoint, List[Payment]]:
+    """Returns the checkpoint after re-checking its pending payments with the partial nodes() response for them, and
+    the payments whose status changed. A payment which could not be fetched stays pending, unless its ID is no longer
+    valid
+
+    """
+    ids = list(checkpoint.pending)
+    pending = {}
+    updated = []
+    for node_id, node in zip(ids, response['data']):
+        if node is None:
+            if not isinstance(response['errors'][node_id], errors.InvalidGraphQLNodeIDException):
+                pending[node_id] = checkpoint.pending[node_id]
+            continue
+        payment = Payment.from_dict(node)
+        if payment.status.value != checkpoint.pending[node_id]:
+            updated.append(payment)
+        if payment.status in PENDING_PAYMENT_STATUSES:
+            pending[node_id] = payment.status.value
+    return Checkpoint(cursor=checkpoint.cursor, pending=pending), updated
+
+
+class PaymentSync:
+    """PaymentSync fetches only the payments made since it last ran, instead of every payment, so that a job which keeps
+    a ledger of payments up to date makes a number of requests proportional to the new payments.
+
+    The cursor of the last payment fetched is kept in a CheckpointStore, and each sync fetches the payments after it
+    with getPayments. Payments which were still pending, initiated or ready for processing when they were fetched are
+    kept in the checkpoint too, and re-checked with a single nodes() query on the next sync until they reach another
+    status::
+
+        >>> payment_sync = buycoins_sdk.payment_sync('payments.checkpoint.json')
+        >>> result = payment_sync.sync()
+        >>> ledger.add(result.new)
+        >>> ledger.update(result.updated)
+
+    The checkpoint is saved after every page, so a sync which fails part way through resumes where it stopped. Only one
+    sync runs at a time on a PaymentSync: sync() holds a threading.Lock and sync_async() an asyncio.Lock, so a
+    PaymentSync must not be shared between sync() and sync_async(), or used with more than one event loop.
+
+    Attributes:
+        buycoins_sdk: the BuycoinsSDK or AsyncBuycoinsSDK the payments are fetched with
+        store: the CheckpointStore the checkpoint is kept in
+        page_size: the number of payments fetched per request
+    """
+
+    def __init__(self, buycoins_sdk, store: CheckpointStore, page_size: int = 50):
+        """Create a new PaymentSync
+
+        Args:
+            buycoins_sdk: the BuycoinsSDK or AsyncBuycoinsSDK to fetch the payments with
+            store: the CheckpointStore to keep the checkpoint in
+            page_size: the number of payments fetched per request
+        """
+        self.buycoins_sdk = buycoins_sdk
+        self.store = store
+        self.page_size = page_size
+        self._lock = threading.Lock()
+        self._async_lock = None
+
+    def sync(self) -> SyncResult:
+        """Fetches the payments made since the last sync and re-checks the payments which were pending
+
+        Returns:
+            A SyncResult with the new and the updated payments
+        Raises:
+            BuycoinsException: An error occurred. The checkpoint keeps the pages fetched before the error
+        """
+        with self._lock:
+            checkpoint = self.store.load()
+            updated = []
+            if checkpoint.pending:
+                checkpoint, updated = _recheck(checkpoint, self.buycoins_sdk.nodes(
+                    ids=list(checkpoint.pending), gql_types=[BuycoinsType.PAYMENT], partial=True))
+                self.store.save(checkpoint)
+
+            new = []
+            while True:
+                connection = self.buycoins_sdk.get_payments(first=self.page_size, after=checkpoint.cursor)
+                checkpoint = _add_page(checkpoint, connection)
+                self.store.save(checkpoint)
+                new.extend(edge.payment for edge in connection.payment_edges)
+                if not connection.payment_edges or not connection.page_info.has_next_page:
+                    return SyncResult(new=new, updated=updated)
+
+    async def sync_async(self) -> SyncResult:
+        """The asyncio version of sync(), for use with an AsyncBuycoinsSDK. The checkpoint is loaded and saved on the
+        event loop, so the store should be fast
+
+        """
+        if self._async_lock is None:
+            # created on first use, since an asyncio.Lock belongs to the event loop it is created on
+            self._async_lock = asyncio.Lock()
+        async with self._async_lock:
+            checkpoint = self.store.load()
+            updated = []
+            if checkpoint.pending:
+                checkpoint, updated = _recheck(checkpoint, await self.buycoins_sdk.nodes(
+                    ids=list(checkpoint.pending), gql_types=[BuycoinsType.PAYMENT], partial=True))
+                self.store.save(checkpoint)
+
+            new = []
+            while True:
+                connection = await self.buycoins_sdk.get_payments(first=self.page_size, after=checkpoint.cursor)
+                checkpoint = _add_page(checkpoint, connection)
+                self.store.save(checkpoint)
+                new.extend(edge.payment for edge in connection.payment_edges)
+                if not connection.payment_edges or not connection.page_info.has_next_page:
+                    return SyncResult(new=new, updated=updated)
@@ -792,6 +792,17 @@ class PostOrders:
         except KeyError as err:
             raise errors.MissingFieldException(err.args[0])
 
+    def to_arrays(self, scale: int = None):
+        """Returns the post orders as a PostOrderArrays, with a NumPy array per field. Needs NumPy
+
+        Args:
+            scale: the number of decimal places of fixed point prices and amounts, or None for float64 arrays
+        Returns:
+            A PostOrderArrays object
+        """
+        from buycoins_sdk.core.columnar import PostOrderArrays
+        return PostOrderArrays.from_post_orders(self, scale=scale)
+
 
 class PaymentEdge:
     """This class represents the Buycoins PaymentEdge type
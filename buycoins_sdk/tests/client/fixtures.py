@@ -1,3 +1,5 @@
+from buycoins_sdk.tests.core.fixtures import Clock
+
 get_market_book_success = {
     'data': {
         'getMarketBook': {
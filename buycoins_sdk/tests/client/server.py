@@ -0,0 +1,85 @@
+"""A small local GraphQL server used as a stand-in for the Buycoins API in tests"""
+
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class StandInServer:
+    """StandInServer runs an HTTP/1.1 server on localhost in a background thread.
+
+    Every POST body is decoded and passed to the handler, which returns a (status_code, response_dict) tuple. The
+    server records every request body it receives and the client address of every connection it accepted.
+    """
+
+    def __init__(self, handler=None):
+        self.handler = handler or (lambda body: (200, {'data': {}}))
+        self.requests = []
+        self.connections = set()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length).decode() or '{}')
+                server.requests.append(body)
+                server.connections.add(self.client_address)
+                status, response = server.handler(body)
+                payload = json.dumps(response).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = _ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}/api/graphql"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, kwargs={'poll_interval': 0.05},
+                                        daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+class PersistedQueryHandler:
+    """A StandInServer handler implementing the automatic persisted queries handshake.
+
+    Requests that only carry a hash are answered with PersistedQueryNotFound until the full query has been sent once
+    with its hash. The resolved query and variables are passed on to the wrapped handler.
+    """
+
+    def __init__(self, handler=None):
+        self.handler = handler or (lambda query, variables: {'data': {}})
+        self.store = {}
+
+    def __call__(self, body):
+        persisted = (body.get('extensions') or {}).get('persistedQuery')
+        query = body.get('query')
+        if persisted is not None:
+            sha256_hash = persisted['sha256Hash']
+            if query is not None:
+                if hashlib.sha256(query.encode()).hexdigest() != sha256_hash:
+                    return 200, {'errors': [{'message': 'provided sha does not match query'}]}
+                self.store[sha256_hash] = query
+            elif sha256_hash in self.store:
+                query = self.store[sha256_hash]
+            else:
+                return 200, {'errors': [{'message': 'PersistedQueryNotFound',
+                                         'extensions': {'code': 'PERSISTED_QUERY_NOT_FOUND'}}]}
+        return 200, self.handler(query, body.get('variables'))
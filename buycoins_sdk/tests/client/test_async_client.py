@@ -0,0 +1,69 @@
+import asyncio
+from unittest import TestCase
+from buycoins_sdk import AsyncBuycoinsGraphqlClient, enums, errors
+from buycoins_sdk.client.retry import RetryBudget, RetryPolicy
+from .fixtures import *
+from .server import StandInServer
+
+
+class TestAsyncClient(TestCase):
+    """This is the TestCase for the AsyncBuycoinsGraphqlClient class
+
+    """
+
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.bc_client = AsyncBuycoinsGraphqlClient(public_key='public_key', secret_key='secret_key')
+
+    def tearDown(self) -> None:
+        self.loop.run_until_complete(self.bc_client.close())
+        self.loop.close()
+
+    def _run(self, server: StandInServer, coroutine):
+        self.bc_client.client.endpoint = server.url
+        return self.loop.run_until_complete(coroutine)
+
+    def test_get_market_book(self):
+        with StandInServer(lambda body: (200, get_market_book_success)) as server:
+            result = self._run(server, self.bc_client.get_market_book(first=1))
+
+        self.assertEqual(get_market_book_success['data']['getMarketBook'], result['data'])
+        self.assertEqual({'cryptocurrency': 'bitcoin', 'first': 1}, server.requests[0]['variables'])
+
+    def test_sync_usage(self):
+        with self.assertRaises(TypeError):
+            with self.bc_client:
+                pass
+        with self.assertRaises(TypeError):
+            self.bc_client.batch()
+
+    def test_concurrent_calls_share_connections(self):
+        with StandInServer(lambda body: (200, get_market_book_success)) as server:
+            self.bc_client.client.limit = 4
+
+            async def gather():
+                return await asyncio.gather(*[self.bc_client.get_market_book() for _ in range(50)])
+
+            results = self._run(server, gather())
+
+        self.assertEqual(50, len(results))
+        self.assertTrue(len(server.connections) <= 4, 'SHOULD NOT OPEN MORE THAN limit CONNECTIONS')
+
+    def test_error_mapping(self):
+        response = {'data': {'buy': None}, 'errors': [{'message': 'Your balance is insufficient for this purchase'}]}
+        with StandInServer(lambda body: (200, response)) as server:
+            with self.assertRaises(errors.InsufficientBalanceToBuyException):
+                self._run(server, self.bc_client.buy(price_id='price', coin_amount='1'))
+
+    def test_http_error(self):
+        bc_client = self.bc_client.with_options(retry=RetryPolicy(max_retries=0, budget=RetryBudget()))
+        with StandInServer(lambda body: (500, {})) as server:
+            with self.assertRaises(errors.BuycoinsHTTPException) as context:
+                self._run(server, bc_client.get_prices())
+
+        self.assertEqual(500, context.exception.status_code)
+
+    def test_node(self):
+        with StandInServer(lambda body: (200, {'data': {'node': {}}})) as server:
+            with self.assertRaises(errors.InvalidGraphQLNodeIDException):
+                self._run(server, self.bc_client.node(node_id='id', gql_type=enums.BuycoinsType.PAYMENT))
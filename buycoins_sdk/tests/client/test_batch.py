@@ -0,0 +1,63 @@
+from unittest import TestCase
+from unittest.mock import Mock
+from buycoins_sdk import BuycoinsGraphqlClient, enums, errors
+from .fixtures import *
+
+
+class TestBatchGraphqlClient(TestCase):
+    """This is the TestCase for the BatchGraphqlClient class
+
+    """
+
+    def setUp(self) -> None:
+        self.bc_client = BuycoinsGraphqlClient(public_key='public_key', secret_key='secret_key')
+        self.bc_client.client = Mock()
+
+    def test_single_request(self):
+        self.bc_client.client.execute.return_value = {
+            'data': {
+                'op0': get_market_book_success['data']['getMarketBook'],
+                'op1': get_payments_success['data']['getPayments']
+            }
+        }
+        with self.bc_client.batch() as batch:
+            market_book = batch.get_market_book(first=1, cryptocurrency=enums.Cryptocurrency.ETHEREUM)
+            payments = batch.get_payments(first=2)
+            self.assertFalse(market_book.done(), 'SHOULD NOT BE DONE BEFORE THE BATCH IS EXECUTED')
+
+        self.assertEqual(1, self.bc_client.client.execute.call_count, 'SHOULD SEND ONE REQUEST')
+        kwargs = self.bc_client.client.execute.call_args[1]
+        self.assertIn('op0:getMarketBook(cryptocurrency:$op0_cryptocurrency)', kwargs['query'])
+        self.assertIn('orders(first:$op0_first)', kwargs['query'])
+        self.assertIn('op1:getPayments(first:$op1_first)', kwargs['query'])
+        self.assertEqual({'op0_cryptocurrency': 'ethereum', 'op0_first': 1, 'op1_first': 2}, kwargs['variables'])
+        self.assertEqual(get_market_book_success['data']['getMarketBook'], market_book.result()['data'])
+        self.assertEqual(get_payments_success['data']['getPayments'], payments.result()['data'])
+
+    def test_error_isolation(self):
+        self.bc_client.client.execute.return_value = {
+            'data': {'op0': None, 'op1': get_market_book_success['data']['getMarketBook'], 'op2': {}},
+            'errors': [{'message': 'Test error', 'path': ['op0']}]
+        }
+        with self.bc_client.batch() as batch:
+            prices = batch.get_prices()
+            market_book = batch.get_market_book()
+            node = batch.node(node_id='id', gql_type=enums.BuycoinsType.PAYMENT)
+
+        with self.assertRaises(errors.BuycoinsException):
+            prices.result()
+        with self.assertRaises(errors.InvalidGraphQLNodeIDException):
+            node.result()
+        self.assertEqual(get_market_book_success['data']['getMarketBook'], market_book.result()['data'])
+
+    def test_mutations_can_not_be_batched(self):
+        with self.assertRaises(errors.BuycoinsException):
+            with self.bc_client.batch() as batch:
+                batch.create_address()
+        self.bc_client.client.execute.assert_not_called()
+
+    def test_result_before_execute(self):
+        batch = self.bc_client.batch()
+        prices = batch.get_prices()
+        with self.assertRaises(errors.BuycoinsException):
+            prices.result()
@@ -0,0 +1,105 @@
+import time
+from unittest import TestCase
+from unittest.mock import Mock
+from requests import exceptions
+from buycoins_sdk import BuycoinsGraphqlClient, errors
+from buycoins_sdk.client.breaker import CircuitBreaker
+from buycoins_sdk.client.retry import RetryBudget, RetryPolicy
+from buycoins_sdk.commons.enums import CircuitState
+from .server import StandInServer
+
+
+def _http_error(status_code: int) -> errors.BuycoinsHTTPException:
+    return errors.BuycoinsHTTPException(response=Mock(status_code=status_code), message=f"{status_code} Error")
+
+
+class TestCircuitBreaker(TestCase):
+    """This is the TestCase for the circuit breaker
+
+    """
+
+    def setUp(self) -> None:
+        self.on_state_change = Mock()
+        self.breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.05,
+                                      on_state_change=self.on_state_change)
+
+    def _fail(self, times: int):
+        for _ in range(times):
+            self.breaker.before_call()
+            self.breaker.record(exceptions.ConnectionError())
+
+    def test_opens_after_consecutive_failures(self):
+        self._fail(1)
+        self.breaker.before_call()
+        self.breaker.record()
+        self._fail(1)
+        self.assertIs(CircuitState.CLOSED, self.breaker.state, 'A SUCCESS SHOULD RESET THE FAILURES')
+
+        self._fail(1)
+        self.assertIs(CircuitState.OPEN, self.breaker.state)
+        with self.assertRaises(errors.CircuitOpenException) as context:
+            self.breaker.before_call()
+        self.assertGreater(context.exception.retry_after, 0)
+        self.assertEqual({'state': 'open', 'consecutive_failures': 0, 'times_opened': 1, 'rejected': 1},
+                         self.breaker.stats())
+
+    def test_half_open_probe(self):
+        self._fail(2)
+        time.sleep(0.06)
+        self.assertIs(CircuitState.HALF_OPEN, self.breaker.state)
+
+        probe = self.breaker.before_call()
+        self.assertIsNotNone(probe)
+        with self.assertRaises(errors.CircuitOpenException):
+            self.breaker.before_call()
+        self.breaker.record(exceptions.Timeout(), probe=probe)
+        self.assertIs(CircuitState.OPEN, self.breaker.state, 'A FAILED PROBE SHOULD OPEN THE BREAKER AGAIN')
+
+        time.sleep(0.06)
+        self.breaker.record(exceptions.Timeout(), probe=probe)
+        self.assertIs(CircuitState.HALF_OPEN, self.breaker.state, 'A PROBE OF AN EARLIER PERIOD SHOULD NOT COUNT')
+        self.breaker.record(probe=self.breaker.before_call())
+        self.assertIs(CircuitState.CLOSED, self.breaker.state)
+        self.assertEqual([
+            (CircuitState.CLOSED, CircuitState.OPEN),
+            (CircuitState.OPEN, CircuitState.HALF_OPEN),
+            (CircuitState.HALF_OPEN, CircuitState.OPEN),
+            (CircuitState.OPEN, CircuitState.HALF_OPEN),
+            (CircuitState.HALF_OPEN, CircuitState.CLOSED)
+        ], [call[0] for call in self.on_state_change.call_args_list])
+
+    def test_calls_sent_before_opening_are_not_probes(self):
+        self.assertIsNone(self.breaker.before_call(), 'A CALL THROUGH A CLOSED BREAKER SHOULD NOT BE A PROBE')
+        self._fail(2)
+        time.sleep(0.06)
+        probe = self.breaker.before_call()
+
+        self.breaker.record()
+        self.assertIs(CircuitState.HALF_OPEN, self.breaker.state)
+        with self.assertRaises(errors.CircuitOpenException, msg='A CALL WHICH WAS NOT A PROBE SHOULD NOT FREE A PROBE'):
+            self.breaker.before_call()
+        self.breaker.record(probe=probe)
+        self.assertIs(CircuitState.CLOSED, self.breaker.state)
+
+    def test_failures(self):
+        breaker = CircuitBreaker(slow_call_threshold=1)
+        self.assertTrue(breaker.is_failure(_http_error(503)))
+        self.assertTrue(breaker.is_failure(_http_error(429)))
+        self.assertFalse(breaker.is_failure(_http_error(400)))
+        self.assertFalse(breaker.is_failure(errors.BuycoinsException('Invalid cryptocurrency')))
+        self.assertTrue(breaker.is_failure(None, latency=1.5), 'A SLOW CALL SHOULD BE A FAILURE')
+        self.assertFalse(breaker.is_failure(None, latency=0.5))
+
+    def test_client_fails_fast(self):
+        bc_client = BuycoinsGraphqlClient(public_key='public_key', secret_key='secret_key',
+                                          retry=RetryPolicy(backoff_factor=0, budget=RetryBudget()),
+                                          circuit_breaker=self.breaker)
+        with StandInServer(lambda body: (503, {})) as server:
+            bc_client.client.endpoint = server.url
+            with self.assertRaises(errors.CircuitOpenException):
+                bc_client.get_prices()
+            with self.assertRaises(errors.CircuitOpenException):
+                bc_client.get_prices()
+        bc_client.close()
+
+        self.assertEqual(2, len(server.requests), 'NO REQUEST SHOULD BE SENT WHILE THE BREAKER IS OPEN')
@@ -0,0 +1,198 @@
+import asyncio
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import Mock
+from buycoins_sdk import AsyncBuycoinsGraphqlClient, BuycoinsGraphqlClient, enums
+from buycoins_sdk.client.cache import CacheBackend, MemoryCacheBackend, ResponseCache
+from .fixtures import Clock
+
+balances_response = {'data': {'getBalances': [{'id': 'QWNjb3VudC0=', 'cryptocurrency': 'bitcoin',
+                                               'confirmedBalance': '0.0'}]}}
+
+
+class DictBackend(CacheBackend):
+    """A backend standing in for an external store"""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, entry, ttl):
+        self.store[key] = entry
+
+    def delete(self, key):
+        self.store.pop(key, None)
+
+    def clear(self):
+        self.store.clear()
+
+    def delete_prefix(self, prefix):
+        for key in [key for key in self.store if key.startswith(prefix)]:
+            del self.store[key]
+
+
+class TestResponseCache(TestCase):
+    """This is the TestCase for the response cache
+
+    """
+
+    def setUp(self) -> None:
+        self.clock = Clock()
+        self.cache = ResponseCache(ttls={'getBalances': 5, 'getMarketBook': 1}, stale_while_revalidate=10,
+                                   clock=self.clock)
+        self.bc_client = BuycoinsGraphqlClient(public_key='public_key', secret_key='secret_key', cache=self.cache)
+        self.bc_client.client = Mock()
+        self.bc_client.client.execute.return_value = balances_response
+
+    def test_lru_eviction(self):
+        backend = MemoryCacheBackend(maxsize=2)
+        cache = ResponseCache(backend=backend, ttls={'getBalances': 5})
+        cache.get_or_fetch('getBalances', 'a', lambda: 1)
+        cache.get_or_fetch('getBalances', 'b', lambda: 2)
+        cache.get_or_fetch('getBalances', 'a', lambda: 1)
+        cache.get_or_fetch('getBalances', 'c', lambda: 3)
+
+        self.assertEqual(2, len(backend))
+        self.assertIsNone(backend.get('b'), 'THE LEAST RECENTLY USED ENTRY SHOULD BE EVICTED')
+        self.assertEqual({'hits': 1, 'stale_hits': 0, 'misses': 3, 'evictions': 1}, cache.stats())
+
+    def test_read_through(self):
+        first = self.bc_client.get_balances(None)
+        second = self.bc_client.get_balances(None)
+        self.assertEqual(first, second)
+        self.bc_client.get_balances(cryptocurrency=enums.Cryptocurrency.ETHEREUM)
+        self.assertEqual(2, self.bc_client.client.execute.call_count, 'VARIABLES SHOULD BE PART OF THE KEY')
+
+        self.clock.now += 20
+        self.bc_client.get_balances(None)
+        self.assertEqual(3, self.bc_client.client.execute.call_count, 'AN EXPIRED RESPONSE SHOULD BE FETCHED AGAIN')
+        self.assertEqual({'hits': 1, 'stale_hits': 0, 'misses': 3, 'evictions': 0}, self.cache.stats())
+
+    def test_stale_while_revalidate(self):
+        self.bc_client.get_balances(None)
+        refreshed = threading.Event()
+        self.bc_client.client.execute.side_effect = lambda **kwargs: refreshed.set() or {
+            'data': {'getBalances': []}}
+
+        self.clock.now += 6
+        self.assertEqual(balances_response['data']['getBalances'], self.bc_client.get_balances(None)['data'],
+                         'A STALE RESPONSE SHOULD BE RETURNED STRAIGHT AWAY')
+        self.assertTrue(refreshed.wait(1))
+        self.assertEqual(1, self.cache.stale_hits)
+
+        while self.cache._refreshing:
+            time.sleep(0.01)
+        self.assertEqual([], self.bc_client.get_balances(None)['data'], 'THE REFRESHED RESPONSE SHOULD BE CACHED')
+
+    def test_uncached_operations(self):
+        self.bc_client.client.execute.return_value = {'data': {'getPayments': {}, 'sendOffchain': {}}}
+        self.bc_client.get_payments()
+        self.bc_client.get_payments()
+        self.bc_client.send_offchain(recipient='recipient', amount='0.01')
+        self.bc_client.send_offchain(recipient='recipient', amount='0.01')
+        self.assertEqual(4, self.bc_client.client.execute.call_count)
+
+    def test_external_backend(self):
+        backend = DictBackend()
+        bc_client = BuycoinsGraphqlClient(public_key='public_key', secret_key='secret_key',
+                                          cache=ResponseCache(backend=backend))
+        bc_client.client = Mock()
+        bc_client.client.execute.return_value = balances_response
+        bc_client.get_balances(None)
+        bc_client.get_balances(None)
+
+        bc_client.client.execute.assert_called_once()
+        self.assertTrue(next(iter(backend.store)).startswith('getBalances:'))
+
+    def test_async_read_through(self):
+        async def execute_async(**kwargs):
+            return balances_response
+
+        loop = asyncio.new_event_loop()
+        bc_client = AsyncBuycoinsGraphqlClient(public_key='public_key', secret_key='secret_key', cache=self.cache)
+        bc_client.client = Mock()
+        bc_client.client.execute_async = Mock(side_effect=execute_async)
+        loop.run_until_complete(bc_client.get_balances(None))
+        result = loop.run_until_complete(bc_client.get_balances(None))
+        loop.close()
+
+        self.assertEqual(balances_response['data']['getBalances'], result['data'])
+        bc_client.client.execute_async.assert_called_once()
+
+    def test_async_stale_while_revalidate(self):
+        responses = [balances_response, {'data': {'getBalances': []}}]
+
+        async def execute_async(**kwargs):
+            await asyncio.sleep(0)
+            return responses.pop(0)
+
+        async def get_stale_balances():
+            self.clock.now += 6
+            stale = await bc_client.get_balances(None)
+            self.assertEqual(1, len(self.cache._refresh_tasks), 'THE CACHE SHOULD KEEP THE REFRESH TASK')
+            await asyncio.gather(*self.cache._refresh_tasks)
+            return stale
+
+        loop = asyncio.new_event_loop()
+        bc_client = AsyncBuycoinsGraphqlClient(public_key='public_key', secret_key='secret_key', cache=self.cache)
+        bc_client.client = Mock()
+        bc_client.client.execute_async = Mock(side_effect=execute_async)
+        loop.run_until_complete(bc_client.get_balances(None))
+        stale = loop.run_until_complete(get_stale_balances())
+        refreshed = loop.run_until_complete(bc_client.get_balances(None))
+        loop.close()
+
+        self.assertEqual(balances_response['data']['getBalances'], stale['data'],
+                         'A STALE RESPONSE SHOULD BE RETURNED STRAIGHT AWAY')
+        self.assertEqual([], refreshed['data'], 'THE REFRESHED RESPONSE SHOULD BE CACHED')
+        self.assertEqual(set(), self.cache._refresh_tasks, 'THE TASK SHOULD BE DROPPED ONCE IT IS DONE')
+
+    def test_mutation_invalidates(self):
+        self.bc_client.get_balances(None)
+        self.bc_client.client.execute.return_value = {'data': {'buy': {}}}
+        self.bc_client.buy(price_id='price_id', coin_amount='0.01')
+        self.bc_client.client.execute.return_value = balances_response
+        self.bc_client.get_balances(None)
+        self.assertEqual(3, self.bc_client.client.execute.call_count, 'A BUY SHOULD INVALIDATE THE BALANCES')
+
+        self.bc_client.client.execute.side_effect = Exception('timed out')
+        with self.assertRaises(Exception):
+            self.bc_client.sell(price_id='price_id', coin_amount='0.01')
+        self.bc_client.client.execute.side_effect = None
+        self.bc_client.get_balances(None)
+        self.assertEqual(5, self.bc_client.client.execute.call_count, 'A FAILED SELL SHOULD INVALIDATE THE BALANCES')
+
+    def test_invalidation_during_fetch(self):
+        def fetch():
+            self.cache.invalidate('getBalances')
+            return 'out of date'
+
+        self.assertEqual('out of date', self.cache.get_or_fetch('getBalances', 'getBalances:a', fetch))
+        self.assertEqual('up to date', self.cache.get_or_fetch('getBalances', 'getBalances:a', lambda: 'up to date'),
+                         'A RESPONSE FETCHED BEFORE AN INVALIDATION SHOULD NOT BE CACHED')
+
+    def test_invalidation_during_store(self):
+        cache = self.cache
+
+        class RacingBackend(DictBackend):
+            def set(self, key, entry, ttl):
+                invalidation = threading.Thread(target=cache.invalidate, args=('getBalances',))
+                invalidation.start()
+                invalidation.join(0.1)
+                super().set(key, entry, ttl)
+
+        self.cache.backend = RacingBackend()
+        self.cache.get_or_fetch('getBalances', 'getBalances:a', lambda: 'out of date')
+        time.sleep(0.1)
+        self.assertIsNone(self.cache.backend.get('getBalances:a'),
+                          'AN INVALIDATION DURING A WRITE SHOULD REMOVE THE WRITTEN RESPONSE')
+
+    def test_invalidate_for_event(self):
+        self.cache.get_or_fetch('getBalances', 'getBalances:a', lambda: 1)
+        self.cache.get_or_fetch('getMarketBook', 'getMarketBook:a', lambda: 1)
+        self.cache.invalidate_for_event(enums.EventType.COINS_INCOMING)
+        self.assertIsNone(self.cache.backend.get('getBalances:a'))
+        self.assertIsNotNone(self.cache.backend.get('getMarketBook:a'))
@@ -1,5 +1,5 @@
 from unittest import TestCase, main
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 from buycoins_sdk import BuycoinsGraphqlClient, enums, errors, client
 from .fixtures import *
 
@@ -19,7 +19,9 @@ class TestClient(TestCase):
     """
 
     def setUp(self) -> None:
-        BuycoinsGraphqlClient.__init__ = Mock(side_effect=lambda public_key, secret_key: None)
+        patcher = patch.object(BuycoinsGraphqlClient, '__init__', Mock(side_effect=lambda public_key, secret_key: None))
+        patcher.start()
+        self.addCleanup(patcher.stop)
         self.bc_client = BuycoinsGraphqlClient(secret_key="secret_key", public_key="public_key")
         self.bc_client.client = Mock()
 
@@ -224,6 +226,17 @@ class TestClient(TestCase):
                 gql_types=[enums.BuycoinsType.ADDRESS]  # random type
             )
 
+    def test_nodes_partial(self):
+        self.bc_client.client.execute.return_value = {'data': {'nodes': [{}, {'id': 'random id'}]}}
+        client_result = self.bc_client.nodes(
+            ids=['wrong id', 'random id'],
+            gql_types=[enums.BuycoinsType.ADDRESS, enums.BuycoinsType.ADDRESS],
+            partial=True
+        )
+        self.assertEqual([{}, {'id': 'random id'}], client_result['data'], 'MISSING NODES SHOULD NOT RAISE')
+        query = self.bc_client.client.execute.call_args[1]['query']
+        self.assertEqual(1, query.count('Address'), 'EVERY TYPE SHOULD HAVE ONE FRAGMENT')
+
     def test_buy(self):
         # test for success
         val = buy_success
@@ -0,0 +1,66 @@
+import asyncio
+from unittest import TestCase, skipIf
+from unittest.mock import Mock
+from buycoins_sdk import AsyncBuycoinsGraphqlClient, BuycoinsGraphqlClient, errors
+from buycoins_sdk.client import codecs
+from .server import StandInServer
+
+prices_response = {'data': {'getPrices': [{'id': 'QnV5Y29pbnNQcmljZS0z', 'cryptocurrency': 'bitcoin',
+                                           'buyPricePerCoin': '17100000.0', 'name': 'Naira ₦'}]}}
+
+
+class TestCodecs(TestCase):
+    """This is the TestCase for the JSON codecs
+
+    """
+
+    def test_json_codec(self):
+        codec = codecs.get_codec()
+        self.assertIsInstance(codec, codecs.JSONCodec)
+        encoded = codec.dumps({'query': 'query{a}', 'variables': {'name': 'Naira ₦'}})
+        self.assertIsInstance(encoded, bytes)
+        self.assertNotIn(b', ', encoded)
+        self.assertEqual({'query': 'query{a}', 'variables': {'name': 'Naira ₦'}}, codec.loads(encoded))
+
+    def test_get_codec(self):
+        codec = codecs.JSONCodec()
+        self.assertIs(codec, codecs.get_codec(codec))
+        self.assertIsInstance(codecs.get_codec('auto'), codecs.JSONCodec)
+        with self.assertRaises(errors.BuycoinsException):
+            codecs.get_codec('yaml')
+
+    @skipIf(codecs.orjson is None, 'orjson is not installed')
+    def test_orjson_codec(self):
+        codec = codecs.get_codec('orjson')
+        self.assertEqual('orjson', codec.name)
+        self.assertEqual('orjson', codecs.get_codec('auto').name)
+        self.assertEqual(prices_response, codec.loads(codec.dumps(prices_response)))
+
+    @skipIf(codecs.ujson is None, 'ujson is not installed')
+    def test_ujson_codec(self):
+        codec = codecs.get_codec('ujson')
+        self.assertEqual(prices_response, codec.loads(codec.dumps(prices_response)))
+
+    def test_client_codec(self):
+        codec = codecs.JSONCodec()
+        codec.loads = Mock(side_effect=codec.loads)
+        bc_client = BuycoinsGraphqlClient(public_key='public_key', secret_key='secret_key', json_codec=codec)
+        with StandInServer(lambda body: (200, prices_response)) as server:
+            bc_client.client.endpoint = server.url
+            result = bc_client.get_prices()
+        bc_client.close()
+
+        self.assertEqual(prices_response['data']['getPrices'], result['data'])
+        self.assertIn('getPrices', server.requests[0]['query'])
+        self.assertIsInstance(codec.loads.call_args[0][0], bytes, 'SHOULD DECODE THE RESPONSE BYTES')
+
+    def test_async_client_codec(self):
+        loop = asyncio.new_event_loop()
+        bc_client = AsyncBuycoinsGraphqlClient(public_key='public_key', secret_key='secret_key', json_codec='auto')
+        with StandInServer(lambda body: (200, prices_response)) as server:
+            bc_client.client.endpoint = server.url
+            result = loop.run_until_complete(bc_client.get_prices())
+            loop.run_until_complete(bc_client.close())
+        loop.close()
+
+        self.assertEqual(prices_response['data']['getPrices'], result['data'])
@@ -0,0 +1,70 @@
+import asyncio
+from unittest import TestCase
+from buycoins_sdk import AsyncBuycoinsGraphqlClient, BuycoinsGraphqlClient, enums
+from .server import PersistedQueryHandler, StandInServer
+
+market_book_response = {'data': {'getMarketBook': {'dynamicPriceExpiry': 1612756694, 'orders': {'edges': []}}}}
+
+
+def _market_book(query, variables):
+    return market_book_response
+
+
+class TestPersistedQueries(TestCase):
+    """This is the TestCase for automatic persisted queries
+
+    """
+
+    def setUp(self) -> None:
+        self.bc_client = BuycoinsGraphqlClient(public_key='public_key', secret_key='secret_key',
+                                               persisted_queries=True)
+
+    def tearDown(self) -> None:
+        self.bc_client.close()
+
+    def test_handshake(self):
+        handler = PersistedQueryHandler(_market_book)
+        with StandInServer(handler) as server:
+            self.bc_client.client.endpoint = server.url
+            for _ in range(3):
+                result = self.bc_client.get_market_book(first=1)
+                self.assertEqual(market_book_response['data']['getMarketBook'], result['data'])
+
+        # the first call needs the hash-only request and the full query, the others send only the hash
+        self.assertEqual(4, len(server.requests))
+        self.assertNotIn('query', server.requests[0])
+        self.assertIn('query', server.requests[1])
+        for request in server.requests[2:]:
+            self.assertNotIn('query', request)
+            self.assertEqual({'cryptocurrency': 'bitcoin', 'first': 1}, request['variables'])
+        self.assertEqual(1, len(handler.store))
+
+    def test_persisted_query_not_supported(self):
+        def handler(body):
+            if 'query' not in body:
+                return 200, {'errors': [{'message': 'PersistedQueryNotSupported'}]}
+            return 200, market_book_response
+
+        with StandInServer(handler) as server:
+            self.bc_client.client.endpoint = server.url
+            self.bc_client.get_market_book()
+            self.bc_client.get_market_book()
+
+        self.assertFalse(self.bc_client.client.persisted_queries, 'SHOULD STOP USING PERSISTED QUERIES')
+        self.assertEqual(3, len(server.requests))
+        self.assertNotIn('extensions', server.requests[2])
+
+    def test_async_handshake(self):
+        loop = asyncio.new_event_loop()
+        bc_client = AsyncBuycoinsGraphqlClient(public_key='public_key', secret_key='secret_key',
+                                               persisted_queries=True)
+        handler = PersistedQueryHandler(lambda query, variables: {'data': {'getPrices': [variables]}})
+        with StandInServer(handler) as server:
+            bc_client.client.endpoint = server.url
+            loop.run_until_complete(bc_client.get_prices(enums.Cryptocurrency.BITCOIN))
+            result = loop.run_until_complete(bc_client.get_prices(enums.Cryptocurrency.ETHEREUM))
+            loop.run_until_complete(bc_client.close())
+        loop.close()
+
+        self.assertEqual([{'cryptocurrency': 'ethereum'}], result['data'])
+        self.assertEqual(3, len(server.requests))
@@ -0,0 +1,48 @@
+from unittest import TestCase
+from unittest.mock import Mock
+from buycoins_sdk import BuycoinsGraphqlClient, enums
+from buycoins_sdk.client import queries
+
+
+class TestQueries(TestCase):
+    """This is the TestCase for the query registry
+
+    """
+
+    def test_minify_query(self):
+        query = """
+            query getPrices($cryptocurrency: Cryptocurrency){
+              getPrices(cryptocurrency: $cryptocurrency){
+                id
+                status
+              }
+            }
+        """
+        self.assertEqual('query getPrices($cryptocurrency:Cryptocurrency){getPrices(cryptocurrency:$cryptocurrency)'
+                         '{id status}}', queries.minify_query(query))
+
+    def test_registry_builds_once(self):
+        registry = queries.QueryRegistry()
+        build = Mock(return_value='query a { b }')
+
+        self.assertEqual('query a{b}', registry.get('a', build, True, False))
+        self.assertEqual('query a{b}', registry.get('a', build, True, False))
+        build.assert_called_once_with(True, False)
+
+        registry.get('a', build, False, False)
+        self.assertEqual(2, build.call_count, 'A NEW SHAPE SHOULD BE BUILT')
+        self.assertEqual(2, len(registry))
+
+    def test_client_variables(self):
+        bc_client = BuycoinsGraphqlClient(public_key='public_key', secret_key='secret_key')
+        bc_client.client = Mock()
+        bc_client.client.execute.return_value = {'data': {'getMarketBook': {}}}
+
+        bc_client.get_market_book(first=2, before='MQ', cryptocurrency=enums.Cryptocurrency.ETHEREUM)
+        kwargs = bc_client.client.execute.call_args[1]
+        self.assertEqual({'cryptocurrency': 'ethereum', 'first': 2, 'before': 'MQ'}, kwargs['variables'])
+        self.assertIn('query getMarketBook($cryptocurrency:Cryptocurrency,$first:Int,$before:String)', kwargs['query'])
+        self.assertIn('orders(first:$first,before:$before)', kwargs['query'])
+
+        bc_client.get_market_book(first=5, before='Mg')
+        self.assertIs(kwargs['query'], bc_client.client.execute.call_args[1]['query'], 'SHOULD REUSE THE QUERY')
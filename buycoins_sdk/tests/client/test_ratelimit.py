@@ -0,0 +1,67 @@
+import multiprocessing
+import os
+import tempfile
+import time
+from unittest import TestCase, skipIf
+from buycoins_sdk import BuycoinsGraphqlClient
+from buycoins_sdk.client import ratelimit
+from buycoins_sdk.client.ratelimit import FileTokenBucket, RateLimiter, TokenBucket
+from .server import StandInServer
+
+prices_response = {'data': {'getPrices': []}}
+
+
+def _reserve_from_file(path: str, times: int):
+    bucket = FileTokenBucket(path, rate=0.001, capacity=4)
+    for _ in range(times):
+        bucket.reserve()
+    bucket.close()
+
+
+class TestRateLimit(TestCase):
+    """This is the TestCase for the rate limiter
+
+    """
+
+    def test_token_bucket(self):
+        bucket = TokenBucket(rate=10, capacity=2)
+        self.assertEqual(0, bucket.reserve())
+        self.assertEqual(0, bucket.reserve())
+        self.assertAlmostEqual(0.1, bucket.reserve(), places=2)
+        self.assertAlmostEqual(0.2, bucket.reserve(), places=2)
+
+    def test_separate_budgets(self):
+        limiter = RateLimiter(queries=TokenBucket(rate=1, capacity=1), mutations=TokenBucket(rate=1, capacity=1))
+        self.assertEqual(0, limiter.reserve('query getPrices{getPrices{id}}'))
+        self.assertEqual(0, limiter.reserve('mutation buy{buy{id}}'), 'MUTATIONS SHOULD HAVE THEIR OWN BUDGET')
+        self.assertGreater(limiter.reserve('query getPrices{getPrices{id}}'), 0)
+        self.assertEqual(0, RateLimiter(queries=TokenBucket(rate=1)).reserve('mutation buy{buy{id}}'))
+
+    def test_client_is_paced(self):
+        limiter = RateLimiter(queries=TokenBucket(rate=20, capacity=1))
+        bc_client = BuycoinsGraphqlClient(public_key='public_key', secret_key='secret_key', rate_limiter=limiter)
+        with StandInServer(lambda body: (200, prices_response)) as server:
+            bc_client.client.endpoint = server.url
+            started = time.monotonic()
+            for _ in range(4):
+                bc_client.get_prices()
+            elapsed = time.monotonic() - started
+        bc_client.close()
+
+        self.assertGreaterEqual(elapsed, 0.14, 'REQUESTS AFTER THE BURST SHOULD WAIT FOR A TOKEN')
+
+    @skipIf(ratelimit.fcntl is None or not hasattr(os, 'fork'), 'FileTokenBucket needs fcntl and fork')
+    def test_file_token_bucket_is_shared_between_processes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'bucket')
+            context = multiprocessing.get_context('fork')
+            processes = [context.Process(target=_reserve_from_file, args=(path, 3)) for _ in range(2)]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+
+            bucket = FileTokenBucket(path, rate=0.001, capacity=4)
+            # 6 tokens were taken from a bucket of 4, so the bucket is 2 tokens in debt
+            self.assertAlmostEqual(2 / 0.001, bucket.reserve(0), delta=1)
+            bucket.close()
@@ -0,0 +1,113 @@
+import asyncio
+import time
+from unittest import TestCase
+from buycoins_sdk import AsyncBuycoinsGraphqlClient, BuycoinsGraphqlClient, BuycoinsSDK, errors
+from buycoins_sdk.client.retry import RetryBudget, RetryPolicy
+from .server import StandInServer
+
+prices_response = {'data': {'getPrices': [{'id': 'QnV5Y29pbnNQcmljZS0z', 'cryptocurrency': 'bitcoin'}]}}
+send_offchain_response = {'data': {'sendOffchain': {'initiated': True}}}
+
+
+def _failing(times: int, response: dict, status: int = 503):
+    calls = []
+
+    def handler(body):
+        calls.append(body)
+        if len(calls) <= times:
+            return status, {}
+        return 200, response
+    return handler
+
+
+class TestRetry(TestCase):
+    """This is the TestCase for timeouts and retries
+
+    """
+
+    def setUp(self) -> None:
+        self.budget = RetryBudget()
+        self.bc_client = BuycoinsGraphqlClient(public_key='public_key', secret_key='secret_key',
+                                               retry=RetryPolicy(backoff_factor=0, budget=self.budget))
+
+    def tearDown(self) -> None:
+        self.bc_client.close()
+
+    def test_query_is_retried(self):
+        with StandInServer(_failing(2, prices_response)) as server:
+            self.bc_client.client.endpoint = server.url
+            result = self.bc_client.get_prices()
+
+        self.assertEqual(prices_response['data']['getPrices'], result['data'])
+        self.assertEqual(3, len(server.requests))
+        self.assertAlmostEqual(8.1, self.budget.tokens)
+
+    def test_client_error_is_not_retried(self):
+        with StandInServer(_failing(1, prices_response, status=400)) as server:
+            self.bc_client.client.endpoint = server.url
+            with self.assertRaises(errors.BuycoinsHTTPException) as context:
+                self.bc_client.get_prices()
+
+        self.assertEqual(400, context.exception.status_code)
+        self.assertEqual(1, len(server.requests))
+
+    def test_mutation_is_not_retried(self):
+        with StandInServer(_failing(1, send_offchain_response)) as server:
+            self.bc_client.client.endpoint = server.url
+            with self.assertRaises(errors.BuycoinsHTTPException):
+                self.bc_client.send_offchain(recipient='recipient', amount='0.01')
+            self.assertEqual(1, len(server.requests), 'MUTATIONS SHOULD NOT BE RETRIED')
+
+            result = self.bc_client.with_options(retry_mutations=True).send_offchain(recipient='recipient',
+                                                                                     amount='0.01')
+        self.assertEqual({'initiated': True}, result['data'])
+        self.assertFalse(self.bc_client._call_options, 'with_options SHOULD NOT CHANGE THE CLIENT')
+
+    def test_retry_budget(self):
+        with StandInServer(_failing(100, prices_response)) as server:
+            self.bc_client.client.endpoint = server.url
+            for _ in range(3):
+                with self.assertRaises(errors.BuycoinsHTTPException):
+                    self.bc_client.get_prices()
+
+        # 4 attempts for the first call, then the budget is spent and later calls are not retried
+        self.assertEqual(6, len(server.requests))
+        self.assertFalse(self.budget.can_retry())
+
+    def test_timeout(self):
+        def slow(body):
+            time.sleep(0.5)
+            return 200, prices_response
+
+        with StandInServer(slow) as server:
+            self.bc_client.client.endpoint = server.url
+            started = time.monotonic()
+            with self.assertRaises(errors.BuycoinsException):
+                self.bc_client.with_options(timeout=(1, 0.1), retry=RetryPolicy(max_retries=0)).get_prices()
+
+        self.assertLess(time.monotonic() - started, 0.5)
+
+    def test_backoff(self):
+        policy = RetryPolicy(backoff_factor=1, max_backoff=3)
+        for attempt in range(5):
+            self.assertTrue(0 <= policy.backoff(attempt) <= min(3, 2 ** attempt))
+
+    def test_sdk_with_options(self):
+        sdk = BuycoinsSDK(public_key='public_key', secret_key='secret_key')
+        clone = sdk.with_options(timeout=2)
+        self.assertEqual({'timeout': 2}, clone.client._call_options)
+        self.assertIs(sdk.client.client, clone.client.client)
+        sdk.close()
+
+    def test_async_query_is_retried(self):
+        loop = asyncio.new_event_loop()
+        bc_client = AsyncBuycoinsGraphqlClient(public_key='public_key', secret_key='secret_key',
+                                               retry=RetryPolicy(backoff_factor=0, budget=RetryBudget()))
+        with StandInServer(_failing(1, prices_response)) as server:
+            bc_client.client.endpoint = server.url
+            result = loop.run_until_complete(bc_client.get_prices())
+            loop.run_until_complete(bc_client.close())
+        loop.close()
+
+        self.assertEqual(prices_response['data']['getPrices'], result['data'])
+        self.assertEqual(2, len(server.requests))
@@ -0,0 +1,101 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+from buycoins_sdk import AsyncBuycoinsGraphqlClient, BuycoinsGraphqlClient, enums, errors
+from buycoins_sdk.client.retry import RetryPolicy
+from buycoins_sdk.client.singleflight import SingleFlight, _call_key, _request_key
+from .server import StandInServer
+
+prices_response = {'data': {'getPrices': [{'id': 'QnV5Y29pbnNQcmljZS0z', 'cryptocurrency': 'bitcoin'}]}}
+
+
+def _slow(status: int, response: dict):
+    def handler(body):
+        time.sleep(0.2)
+        return status, response
+    return handler
+
+
+class TestSingleFlight(TestCase):
+    """This is the TestCase for coalescing identical concurrent requests
+
+    """
+
+    def setUp(self) -> None:
+        self.bc_client = BuycoinsGraphqlClient(public_key='public_key', secret_key='secret_key', coalesce_reads=True,
+                                               retry=RetryPolicy(max_retries=0))
+
+    def tearDown(self) -> None:
+        self.bc_client.close()
+
+    def _concurrently(self, function, times: int = 8) -> list:
+        with ThreadPoolExecutor(max_workers=times) as executor:
+            futures = [executor.submit(function) for _ in range(times)]
+        return futures
+
+    def test_request_key(self):
+        self.assertEqual(_request_key('query', {'first': 1, 'after': 'MQ'}),
+                         _request_key('query', {'after': 'MQ', 'first': 1}))
+        self.assertNotEqual(_request_key('query', {'first': 1}), _request_key('query', {'first': 2}))
+
+    def test_reads_are_coalesced(self):
+        with StandInServer(_slow(200, prices_response)) as server:
+            self.bc_client.client.endpoint = server.url
+            futures = self._concurrently(self.bc_client.get_prices)
+
+        self.assertEqual(1, len(server.requests))
+        for future in futures:
+            self.assertEqual(prices_response['data']['getPrices'], future.result()['data'])
+        self.assertEqual(7, self.bc_client._singleflight.shared)
+
+    def test_errors_are_shared(self):
+        with StandInServer(_slow(500, {})) as server:
+            self.bc_client.client.endpoint = server.url
+            futures = self._concurrently(self.bc_client.get_prices)
+
+        self.assertEqual(1, len(server.requests))
+        for future in futures:
+            self.assertIsInstance(future.exception(), errors.BuycoinsHTTPException)
+
+    def test_different_variables_and_mutations_are_not_coalesced(self):
+        with StandInServer(_slow(200, {'data': {'getPrices': [], 'sendOffchain': {'initiated': True}}})) as server:
+            self.bc_client.client.endpoint = server.url
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                executor.submit(self.bc_client.get_prices, enums.Cryptocurrency.BITCOIN)
+                executor.submit(self.bc_client.get_prices, enums.Cryptocurrency.ETHEREUM)
+                executor.submit(self.bc_client.send_offchain, recipient='recipient', amount='0.01')
+                executor.submit(self.bc_client.send_offchain, recipient='recipient', amount='0.01')
+
+        self.assertEqual(4, len(server.requests))
+
+    def test_calls_with_different_options_are_not_coalesced(self):
+        self.assertNotEqual(_call_key('query', {}, {'timeout': 1}), _call_key('query', {}, {'timeout': 2}))
+        with StandInServer(_slow(200, prices_response)) as server:
+            self.bc_client.client.endpoint = server.url
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                executor.submit(self.bc_client.get_prices)
+                executor.submit(self.bc_client.with_options(timeout=5).get_prices)
+
+        self.assertEqual(2, len(server.requests), 'A with_options() CLONE SHOULD NOT SHARE CALLS MADE WITH OTHER OPTIONS')
+
+    def test_calls_are_not_cached(self):
+        flight = SingleFlight()
+        self.assertEqual(1, flight.do('key', lambda: 1))
+        self.assertEqual(2, flight.do('key', lambda: 2))
+        self.assertEqual(0, flight.shared)
+
+    def test_async_reads_are_coalesced(self):
+        async def get_prices():
+            return await asyncio.gather(*[bc_client.get_prices() for _ in range(8)])
+
+        loop = asyncio.new_event_loop()
+        bc_client = AsyncBuycoinsGraphqlClient(public_key='public_key', secret_key='secret_key', coalesce_reads=True)
+        with StandInServer(_slow(200, prices_response)) as server:
+            bc_client.client.endpoint = server.url
+            results = loop.run_until_complete(get_prices())
+            loop.run_until_complete(bc_client.close())
+        loop.close()
+
+        self.assertEqual(1, len(server.requests))
+        self.assertEqual([prices_response['data']['getPrices']] * 8, [result['data'] for result in results])
@@ -0,0 +1,59 @@
+import threading
+from unittest import TestCase
+from concurrent.futures import ThreadPoolExecutor
+from buycoins_sdk import BuycoinsGraphqlClient
+from buycoins_sdk.client import PooledGraphqlClient
+from .server import StandInServer
+
+
+class TestPooledGraphqlClient(TestCase):
+    """This is the TestCase for the PooledGraphqlClient class
+
+    """
+
+    def test_reuses_connection(self):
+        with StandInServer(lambda body: (200, {'data': {'ok': True}})) as server:
+            client = PooledGraphqlClient(server.url)
+            for _ in range(5):
+                self.assertEqual({'data': {'ok': True}}, client.execute(query='query{ok}'))
+            client.close()
+
+        self.assertEqual(5, len(server.requests))
+        self.assertEqual(1, len(server.connections), 'ALL REQUESTS SHOULD SHARE ONE CONNECTION')
+
+    def test_threads_share_pool(self):
+        with StandInServer() as server:
+            client = PooledGraphqlClient(server.url, pool_maxsize=2, pool_block=True)
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(lambda _: client.execute(query='query{ok}'), range(40)))
+            client.close()
+
+        self.assertEqual(40, len(server.requests))
+        self.assertTrue(len(server.connections) <= 2, 'SHOULD NOT OPEN MORE THAN pool_maxsize CONNECTIONS')
+
+    def test_sessions_of_exited_threads_are_dropped(self):
+        client = PooledGraphqlClient('http://localhost')
+        for _ in range(10):
+            thread = threading.Thread(target=client._get_session)
+            thread.start()
+            thread.join()
+        client._get_session()
+
+        self.assertLessEqual(len(client._sessions), 2, 'SESSIONS OF EXITED THREADS SHOULD NOT BE KEPT')
+        self.assertIs(client._get_session(), client._sessions[threading.get_ident()])
+        client.close()
+
+    def test_close(self):
+        with StandInServer() as server:
+            client = PooledGraphqlClient(server.url)
+            client.execute(query='query{ok}')
+            client.close()
+            client.execute(query='query{ok}')
+            client.close()
+
+        self.assertEqual(2, len(server.connections), 'A CLOSED CLIENT SHOULD OPEN A NEW CONNECTION')
+
+    def test_buycoins_graphql_client_uses_pool(self):
+        with BuycoinsGraphqlClient(public_key='public_key', secret_key='secret_key', pool_maxsize=3) as bc_client:
+            self.assertIsInstance(bc_client.client, PooledGraphqlClient)
+            self.assertEqual(3, bc_client.client.pool_maxsize)
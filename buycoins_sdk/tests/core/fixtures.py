@@ -218,3 +218,20 @@ event_fixture = {
         }
     }
 }
+
+
+def make_payment(index: int, status: str = 'success', **fields) -> dict:
+    """Returns payment_fixture as the payment with the ID payment-<index>, created at index. Any other field can be
+    overridden by keyword"""
+    fields.setdefault('id', f"payment-{index}")
+    return dict(payment_fixture, createdAt=index, status=status, **fields)
+
+
+class Clock:
+    """A clock standing in for time.time, which only moves when a test sets now"""
+
+    def __init__(self, now: float = 1612759000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
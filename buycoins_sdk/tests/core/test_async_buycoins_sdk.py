@@ -0,0 +1,43 @@
+import asyncio
+from unittest import TestCase, mock
+from buycoins_sdk import AsyncBuycoinsSDK, enums, types
+from .fixtures import *
+
+
+def _returning(value):
+    async def coroutine(*args, **kwargs):
+        return value
+    return mock.Mock(side_effect=coroutine)
+
+
+class TestAsyncBuycoinsSDK(TestCase):
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.buycoins_sdk = AsyncBuycoinsSDK(public_key='test', secret_key='test')
+        self.buycoins_sdk.client = mock.Mock()
+
+    def tearDown(self) -> None:
+        self.loop.close()
+
+    def test_get_balances(self):
+        self.buycoins_sdk.client.get_balances = _returning({'data': [account_fixture, account_fixture]})
+        result = self.loop.run_until_complete(self.buycoins_sdk.get_balances())
+
+        self.assertIsInstance(result, list, 'RESULT SHOULD BE A LIST')
+        for i in result:
+            self.assertIsInstance(i, types.Account, 'RESULT SHOULD CONTAIN ONLY ACCOUNT OBJECTS')
+
+    def test_get_payments(self):
+        self.buycoins_sdk.client.get_payments = _returning({'data': payment_connection_fixture})
+        result = self.loop.run_until_complete(self.buycoins_sdk.get_payments(first=1))
+
+        self.assertIsInstance(result, types.PaymentConnection, 'RESULT SHOULD BE A PaymentConnection OBJECT')
+        self.buycoins_sdk.client.get_payments.assert_called_once_with(after=None, before=None, first=1, last=None)
+
+    def test_send_offchain(self):
+        self.buycoins_sdk.client.send_offchain = _returning({'data': {'initiated': True}})
+        result = self.loop.run_until_complete(self.buycoins_sdk.send_offchain(
+            recipient='recipient', amount='1', cryptocurrency=enums.Cryptocurrency.BITCOIN
+        ))
+
+        self.assertTrue(result, 'SHOULD BE TRUE')
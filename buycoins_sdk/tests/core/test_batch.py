@@ -0,0 +1,112 @@
+import asyncio
+from unittest import TestCase, mock
+from buycoins_sdk import AsyncBuycoinsSDK, BuycoinsSDK, enums, errors, types
+from .fixtures import *
+
+
+class TestBuycoinsSDKBatch(TestCase):
+    def setUp(self) -> None:
+        self.buycoins_sdk = BuycoinsSDK(public_key='test', secret_key='test')
+        self.buycoins_sdk.client.client = mock.Mock()
+
+    def test_typed_results(self):
+        self.buycoins_sdk.client.client.execute.return_value = {
+            'data': {
+                'op0': [account_fixture, account_fixture],
+                'op1': [buycoins_price_fixture],
+                'op2': post_orders_fixture,
+                'op3': None
+            },
+            'errors': [{'message': 'Test error', 'path': ['op3', 'orders']}]
+        }
+        with self.buycoins_sdk.batch() as batch:
+            balances = batch.get_balances()
+            prices = batch.get_prices(cryptocurrency=enums.Cryptocurrency.BITCOIN)
+            market_book = batch.get_market_book()
+            orders = batch.get_orders(status=enums.GetOrdersStatus.OPEN)
+
+        self.assertEqual(1, self.buycoins_sdk.client.client.execute.call_count, 'SHOULD SEND ONE REQUEST')
+        for i in balances.result():
+            self.assertIsInstance(i, types.Account, 'RESULT SHOULD CONTAIN ONLY ACCOUNT OBJECTS')
+        self.assertIsInstance(prices.result(), types.BuycoinsPrice, 'RESULT SHOULD BE A BuycoinsPrice OBJECT')
+        self.assertIsInstance(market_book.result(), types.PostOrders, 'RESULT SHOULD BE A PostOrders OBJECT')
+        self.assertIsInstance(orders.exception(), errors.BuycoinsException, 'SHOULD HOLD THE ERROR')
+
+    def test_by_cryptocurrency(self):
+        cryptocurrencies = [enums.Cryptocurrency.BITCOIN, enums.Cryptocurrency.ETHEREUM, enums.Cryptocurrency.BITCOIN]
+        self.buycoins_sdk.client.client.execute.return_value = {
+            'data': {'op0': estimated_fee_fixture, 'op1': estimated_fee_fixture}
+        }
+        fees = self.buycoins_sdk.get_estimated_network_fee_by_cryptocurrency(amount='100',
+                                                                             cryptocurrencies=cryptocurrencies)
+
+        self.assertEqual(1, self.buycoins_sdk.client.client.execute.call_count, 'SHOULD SEND ONE REQUEST')
+        self.assertEqual([enums.Cryptocurrency.BITCOIN, enums.Cryptocurrency.ETHEREUM], list(fees))
+        for fee in fees.values():
+            self.assertIsInstance(fee, types.EstimatedFee, 'RESULT SHOULD CONTAIN ONLY EstimatedFee OBJECTS')
+
+    def test_by_cryptocurrency_partial(self):
+        cryptocurrencies = [enums.Cryptocurrency.BITCOIN, enums.Cryptocurrency.NAIRA_TOKEN]
+        self.buycoins_sdk.client.client.execute.return_value = {
+            'data': {'op0': estimated_fee_fixture, 'op1': None},
+            'errors': [{'message': 'Invalid cryptocurrency', 'path': ['op1', 'getEstimatedNetworkFee']}]
+        }
+        fees = self.buycoins_sdk.get_estimated_network_fee_by_cryptocurrency(amount='100',
+                                                                             cryptocurrencies=cryptocurrencies,
+                                                                             partial=True)
+
+        self.assertIsInstance(fees[enums.Cryptocurrency.BITCOIN], types.EstimatedFee,
+                              'A FAILED CRYPTOCURRENCY SHOULD NOT AFFECT THE OTHERS')
+        self.assertIsInstance(fees[enums.Cryptocurrency.NAIRA_TOKEN], errors.BuycoinsException,
+                              'A FAILED CRYPTOCURRENCY SHOULD MAP TO ITS EXCEPTION')
+        with self.assertRaises(errors.BuycoinsException, msg='SHOULD RAISE THE FAILURE OUTSIDE PARTIAL MODE'):
+            self.buycoins_sdk.get_estimated_network_fee_by_cryptocurrency(amount='100',
+                                                                          cryptocurrencies=cryptocurrencies)
+
+    def test_by_cryptocurrency_async_partial(self):
+        async def get_market_book(first, last, after, before, cryptocurrency):
+            if cryptocurrency == enums.Cryptocurrency.NAIRA_TOKEN:
+                raise errors.BuycoinsException('Invalid cryptocurrency')
+            return {'data': post_orders_fixture}
+
+        buycoins_sdk = AsyncBuycoinsSDK(public_key='test', secret_key='test')
+        buycoins_sdk.client = mock.Mock()
+        buycoins_sdk.client.get_market_book = mock.Mock(side_effect=get_market_book)
+
+        loop = asyncio.new_event_loop()
+        market_books = loop.run_until_complete(buycoins_sdk.get_market_book_by_cryptocurrency(partial=True))
+        with self.assertRaises(errors.BuycoinsException, msg='SHOULD RAISE THE FAILURE OUTSIDE PARTIAL MODE'):
+            loop.run_until_complete(buycoins_sdk.get_market_book_by_cryptocurrency())
+        loop.close()
+
+        self.assertIsInstance(market_books.pop(enums.Cryptocurrency.NAIRA_TOKEN), errors.BuycoinsException,
+                              'A FAILED CRYPTOCURRENCY SHOULD MAP TO ITS EXCEPTION')
+        for market_book in market_books.values():
+            self.assertIsInstance(market_book, types.PostOrders, 'A FAILED CRYPTOCURRENCY SHOULD NOT AFFECT THE OTHERS')
+
+    def test_by_cryptocurrency_async(self):
+        in_flight = []
+        peak = []
+        calls = []
+
+        async def get_market_book(first, last, after, before, cryptocurrency):
+            calls.append(cryptocurrency)
+            in_flight.append(cryptocurrency)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(cryptocurrency)
+            return {'data': post_orders_fixture}
+
+        buycoins_sdk = AsyncBuycoinsSDK(public_key='test', secret_key='test')
+        buycoins_sdk.client = mock.Mock()
+        buycoins_sdk.client.get_market_book = mock.Mock(side_effect=get_market_book)
+
+        loop = asyncio.new_event_loop()
+        market_books = loop.run_until_complete(buycoins_sdk.get_market_book_by_cryptocurrency(max_concurrency=2))
+        loop.close()
+
+        self.assertEqual(list(enums.Cryptocurrency), list(market_books), 'SHOULD DEFAULT TO EVERY CRYPTOCURRENCY')
+        self.assertEqual(list(enums.Cryptocurrency), calls)
+        self.assertLessEqual(max(peak), 2, 'AT MOST max_concurrency REQUESTS SHOULD BE IN FLIGHT')
+        for market_book in market_books.values():
+            self.assertIsInstance(market_book, types.PostOrders, 'RESULT SHOULD CONTAIN ONLY PostOrders OBJECTS')
@@ -0,0 +1,52 @@
+from unittest import TestCase, mock, skipIf
+from buycoins_sdk import BuycoinsSDK, enums, errors, types
+from buycoins_sdk.core import columnar
+from .fixtures import *
+
+
+def _market_book(*orders) -> dict:
+    return dict(post_orders_fixture, orders=dict(post_orders_fixture['orders'], edges=[
+        {'cursor': str(i), 'node': dict(post_orders_fixture['orders']['edges'][0]['node'], id=str(i), side=side,
+                                        pricePerCoin=price, coinAmount=amount)}
+        for i, (side, price, amount) in enumerate(orders)]))
+
+
+@skipIf(columnar.numpy is None, 'numpy is not installed')
+class TestPostOrderArrays(TestCase):
+    """This is the TestCase for the PostOrderArrays class
+
+    """
+
+    def setUp(self) -> None:
+        self.market_book = _market_book(('sell', '17990000.0', '0.5'), ('buy', '17000000.5', '0.25'),
+                                        ('sell', '18000000.0', '0.1'))
+        self.buycoins_sdk = BuycoinsSDK(public_key='public_key', secret_key='secret_key')
+        self.buycoins_sdk.client = mock.Mock()
+        self.buycoins_sdk.client.get_market_book.return_value = {'data': self.market_book}
+
+    def test_from_dict(self):
+        book = self.buycoins_sdk.get_market_book(columnar=True)
+        self.assertIsInstance(book, columnar.PostOrderArrays)
+        self.assertEqual(3, len(book))
+        self.assertEqual(columnar.numpy.float64, book.price_per_coin.dtype)
+        asks = book.mask(side=enums.OrderSide.SELL, status=enums.PostOrderStatus.ACTIVE)
+        self.assertEqual(['0', '2'], [book.ids[i] for i in asks.nonzero()[0]])
+        self.assertAlmostEqual(0.6, book.coin_amount[asks].sum())
+
+    def test_fixed_point(self):
+        book = self.buycoins_sdk.get_market_book(columnar=True, scale=2)
+        self.assertEqual(columnar.numpy.int64, book.price_per_coin.dtype)
+        self.assertEqual([1799000000, 1700000050, 1800000000], book.price_per_coin.tolist())
+        self.assertEqual([50, 25, 10], book.coin_amount.tolist(), 'FIXED POINT VALUES SHOULD BE EXACT')
+
+    def test_to_arrays(self):
+        book = types.PostOrders.from_dict(self.market_book).to_arrays()
+        expected = columnar.PostOrderArrays.from_dict(self.market_book)
+        self.assertEqual(expected.ids, book.ids)
+        self.assertEqual(expected.price_per_coin.tolist(), book.price_per_coin.tolist())
+        self.assertEqual(expected.side.tolist(), book.side.tolist())
+        self.assertEqual(expected.status.tolist(), book.status.tolist())
+
+    def test_missing_field(self):
+        with self.assertRaises(errors.MissingFieldException):
+            columnar.PostOrderArrays.from_dict({'orders': {'edges': [{'cursor': '0', 'node': {}}]}})
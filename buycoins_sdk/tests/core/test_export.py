@@ -0,0 +1,76 @@
+import csv
+import json
+import os
+import tempfile
+from unittest import TestCase, mock, skipIf
+from buycoins_sdk import AsyncBuycoinsSDK, BuycoinsSDK, enums, errors
+from buycoins_sdk.core import export
+from .test_pagination import Connection
+
+
+class TestExporter(TestCase):
+    """This is the TestCase for the Exporter class
+
+    """
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'payments')
+        self.checkpoint = os.path.join(self.directory.name, 'checkpoint.json')
+        self.buycoins_sdk = BuycoinsSDK(public_key='public_key', secret_key='secret_key')
+        self.buycoins_sdk.client = mock.Mock()
+        self.connection = Connection(total=7)
+        self.buycoins_sdk.client.get_payments.side_effect = self.connection
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_csv(self):
+        exporter = self.buycoins_sdk.exporter(self.path, page_size=3, buffer_size=2)
+        self.assertEqual(7, exporter.payments())
+        with open(self.path, newline='') as file:
+            rows = list(csv.DictReader(file))
+        self.assertEqual(list(export.PAYMENT_COLUMNS), list(rows[0]))
+        self.assertEqual([str(i) for i in range(7)], [row['created_at'] for row in rows])
+        self.assertEqual('deposit', rows[0]['payment_type'])
+
+    def test_async_sdk(self):
+        buycoins_sdk = AsyncBuycoinsSDK(public_key='public_key', secret_key='secret_key')
+        buycoins_sdk.client = mock.Mock()
+        with self.assertRaises(errors.BuycoinsException):
+            buycoins_sdk.exporter(self.path)
+        buycoins_sdk.client.get_payments.assert_not_called()
+
+    def test_resume(self):
+        def get_payments(**kwargs):
+            if kwargs['after'] == '2':
+                raise errors.BuycoinsException('error')
+            return self.connection(**kwargs)
+
+        self.buycoins_sdk.client.get_payments.side_effect = get_payments
+        exporter = self.buycoins_sdk.exporter(self.path, export_format=enums.ExportFormat.JSON_LINES,
+                                              checkpoint=self.checkpoint, page_size=3, buffer_size=2, prefetch=0)
+        with self.assertRaises(errors.BuycoinsException):
+            exporter.payments()
+
+        self.buycoins_sdk.client.get_payments.side_effect = self.connection
+        self.assertEqual(5, exporter.payments(), 'THE EXPORT SHOULD RESUME AFTER THE LAST ROW WRITTEN')
+        with open(self.path) as file:
+            rows = [json.loads(line) for line in file]
+        self.assertEqual(list(range(7)), [row['created_at'] for row in rows])
+
+        self.connection.total = 8
+        self.assertEqual(1, exporter.payments(), 'ONLY NEW PAYMENTS SHOULD BE EXPORTED')
+
+    @skipIf(export.pyarrow is None, 'pyarrow is not installed')
+    def test_parquet(self):
+        exporter = self.buycoins_sdk.exporter(self.path, export_format=enums.ExportFormat.PARQUET, page_size=3)
+        exporter.payments()
+        exporter.payments()
+        table = export.pyarrow.parquet.read_table(self.path)
+        self.assertEqual(14, table.num_rows)
+
+    @skipIf(export.pyarrow is not None, 'pyarrow is installed')
+    def test_parquet_missing(self):
+        with self.assertRaises(errors.BuycoinsException):
+            self.buycoins_sdk.exporter(self.path, export_format=enums.ExportFormat.PARQUET).payments()
@@ -0,0 +1,95 @@
+import asyncio
+import base64
+from unittest import TestCase, mock
+from buycoins_sdk import AsyncBuycoinsSDK, BuycoinsSDK, enums
+from buycoins_sdk.core import IdentityMap
+from .fixtures import Clock, make_payment
+
+
+def _global_id(type_name: str, uuid: str) -> str:
+    return base64.b64encode(f"{type_name}-{uuid}".encode()).decode()
+
+
+def _address(node_id: str) -> dict:
+    return {'id': node_id, 'address': 'address', 'createdAt': 1612759000, 'cryptocurrency': 'bitcoin'}
+
+
+class TestIdentityMap(TestCase):
+    """This is the TestCase for the IdentityMap class and its use by node() and nodes()
+
+    """
+
+    def setUp(self) -> None:
+        self.clock = Clock()
+        self.identity_map = IdentityMap(pending_ttl=5, clock=self.clock)
+        self.buycoins_sdk = BuycoinsSDK(public_key='public_key', secret_key='secret_key',
+                                        identity_map=self.identity_map)
+        self.buycoins_sdk.client = mock.Mock()
+        self.done = _global_id('Payment', 'done')
+        self.pending = _global_id('Payment', 'pending')
+        self.address = _global_id('Address', 'address')
+
+    def test_ttl(self):
+        self.assertEqual(float('inf'), self.identity_map.ttl(enums.BuycoinsType.ADDRESS, _address(self.address)))
+        self.assertEqual(float('inf'), self.identity_map.ttl(enums.BuycoinsType.PAYMENT,
+                                                             make_payment(0, 'success', id=self.done)))
+        self.assertEqual(5, self.identity_map.ttl(enums.BuycoinsType.PAYMENT,
+                                                  make_payment(0, 'pending', id=self.pending)))
+        self.assertEqual(30, self.identity_map.ttl(enums.BuycoinsType.BUYCOINS_PRICE,
+                                                   {'status': 'active', 'expiresAt': self.clock.now + 30}))
+        self.assertEqual(0, self.identity_map.ttl(enums.BuycoinsType.ACCOUNT, {'confirmedBalance': '0.0'}),
+                         'ACCOUNTS SHOULD NEVER BE KEPT')
+
+    def test_node(self):
+        self.buycoins_sdk.client.node.return_value = {'data': make_payment(0, 'pending', id=self.pending)}
+        self.buycoins_sdk.node(self.pending, enums.BuycoinsType.PAYMENT)
+        result = self.buycoins_sdk.node(self.pending, enums.BuycoinsType.PAYMENT)
+        self.assertEqual('pending', result['data']['status'])
+        self.buycoins_sdk.client.node.assert_called_once()
+
+        self.clock.now += 6
+        self.buycoins_sdk.node(self.pending, enums.BuycoinsType.PAYMENT)
+        self.assertEqual(2, self.buycoins_sdk.client.node.call_count, 'A PENDING NODE SHOULD EXPIRE')
+
+        self.buycoins_sdk.node(self.pending, enums.BuycoinsType.ORDER)
+        self.assertEqual(3, self.buycoins_sdk.client.node.call_count, 'THE TYPE SHOULD MATCH')
+
+    def test_nodes(self):
+        self.identity_map.put(self.done, [enums.BuycoinsType.PAYMENT], make_payment(0, 'success', id=self.done))
+        self.buycoins_sdk.client.nodes.return_value = {'data': [make_payment(0, 'pending', id=self.pending),
+                                                                _address(self.address)]}
+        gql_types = [enums.BuycoinsType.PAYMENT, enums.BuycoinsType.ADDRESS]
+        result = self.buycoins_sdk.nodes(ids=[self.pending, self.done, self.address, self.pending],
+                                         gql_types=gql_types)
+
+        self.buycoins_sdk.client.nodes.assert_called_once_with(ids=[self.pending, self.address], gql_types=gql_types,
+                                                                partial=False)
+        self.assertEqual([self.pending, self.done, self.address, self.pending], [node['id'] for node in result['data']],
+                         'NODES SHOULD BE IN THE REQUESTED ORDER')
+
+        self.clock.now += 6
+        result = self.buycoins_sdk.nodes(ids=[self.done, self.address], gql_types=gql_types)
+        self.assertEqual(1, self.buycoins_sdk.client.nodes.call_count, 'TERMINAL AND IMMUTABLE NODES SHOULD BE KEPT')
+        self.assertEqual([self.done, self.address], [node['id'] for node in result['data']])
+
+    def test_cancel_withdrawal_invalidates(self):
+        self.identity_map.put(self.done, [enums.BuycoinsType.PAYMENT], make_payment(0, 'success', id=self.done))
+        self.buycoins_sdk.client.cancel_withdrawal.return_value = {'data': make_payment(0, 'canceled', id=self.done)}
+        self.buycoins_sdk.cancel_withdrawal(self.done)
+        self.assertEqual(0, len(self.identity_map))
+
+    def test_async_nodes(self):
+        async def nodes(ids, gql_types, partial=False):
+            return {'data': [_address(node_id) for node_id in ids]}
+
+        loop = asyncio.new_event_loop()
+        buycoins_sdk = AsyncBuycoinsSDK(public_key='public_key', secret_key='secret_key',
+                                        identity_map=self.identity_map)
+        buycoins_sdk.client = mock.Mock()
+        buycoins_sdk.client.nodes = mock.Mock(side_effect=nodes)
+        loop.run_until_complete(buycoins_sdk.nodes(ids=[self.address], gql_types=[enums.BuycoinsType.ADDRESS]))
+        result = loop.run_until_complete(buycoins_sdk.node(self.address, enums.BuycoinsType.ADDRESS))
+        loop.close()
+
+        self.assertEqual(self.address, result['data']['id'])
+        buycoins_sdk.client.nodes.assert_called_once()
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+from unittest import TestCase, mock
+from buycoins_sdk import AsyncBuycoinsSDK, BuycoinsSDK, enums, errors
+from buycoins_sdk.core import NodeLoader
+
+
+def _nodes(ids, gql_types, partial=False):
+    return {'data': [{} if node_id == 'wrong' else {'id': node_id} for node_id in ids]}
+
+
+class TestNodeLoader(TestCase):
+    """This is the TestCase for the NodeLoader class
+
+    """
+
+    def setUp(self) -> None:
+        self.buycoins_sdk = BuycoinsSDK(public_key='public_key', secret_key='secret_key')
+        self.buycoins_sdk.client = mock.Mock()
+        self.buycoins_sdk.client.nodes.side_effect = _nodes
+
+    def test_load_many(self):
+        loader = self.buycoins_sdk.node_loader(max_batch_size=2)
+        results = loader.load_many(['a', 'b', 'a', 'c'], enums.BuycoinsType.PAYMENT)
+
+        self.assertEqual(['a', 'b', 'a', 'c'], [result['data']['id'] for result in results])
+        self.assertEqual([mock.call(ids=['a', 'b'], gql_types=[enums.BuycoinsType.PAYMENT], partial=True),
+                          mock.call(ids=['c'], gql_types=[enums.BuycoinsType.PAYMENT], partial=True)],
+                         self.buycoins_sdk.client.nodes.call_args_list, 'BATCHES SHOULD HOLD AT MOST max_batch_size IDS')
+
+    def test_concurrent_loads(self):
+        loader = NodeLoader(self.buycoins_sdk, wait=0.5)
+        results = {}
+        barrier = threading.Barrier(5)
+
+        def load(node_id):
+            barrier.wait()
+            results[node_id] = loader.load(node_id, enums.BuycoinsType.PAYMENT)
+
+        threads = [threading.Thread(target=load, args=(str(i),)) for i in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.buycoins_sdk.client.nodes.assert_called_once()
+        self.assertEqual({str(i): {'data': {'id': str(i)}} for i in range(5)}, results)
+
+    def test_invalid_node(self):
+        loader = NodeLoader(self.buycoins_sdk, wait=0.5)
+        errors_raised = []
+
+        def load(node_id):
+            try:
+                loader.load(node_id, enums.BuycoinsType.PAYMENT)
+            except errors.InvalidGraphQLNodeIDException as err:
+                errors_raised.append(err.node_id)
+
+        threads = [threading.Thread(target=load, args=(node_id,)) for node_id in ('a', 'wrong', 'b')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(['wrong'], errors_raised, 'ONLY THE LOOKUP OF THE WRONG ID SHOULD FAIL')
+        self.buycoins_sdk.client.nodes.assert_called_once()
+
+    def test_load_async(self):
+        dispatching = []
+
+        async def nodes(ids, gql_types, partial=False):
+            dispatching.append(len(loader._async_tasks))
+            return _nodes(ids, gql_types, partial)
+
+        buycoins_sdk = AsyncBuycoinsSDK(public_key='public_key', secret_key='secret_key')
+        buycoins_sdk.client = mock.Mock()
+        buycoins_sdk.client.nodes = mock.Mock(side_effect=nodes)
+        loader = buycoins_sdk.node_loader(wait=0)
+
+        async def load_all():
+            return await asyncio.gather(loader.load_async('a', enums.BuycoinsType.PAYMENT),
+                                        loader.load_async('b', enums.BuycoinsType.PAYMENT),
+                                        loader.load_async('c', enums.BuycoinsType.ORDER),
+                                        loader.load_async('wrong', enums.BuycoinsType.ORDER),
+                                        return_exceptions=True)
+
+        loop = asyncio.new_event_loop()
+        results = loop.run_until_complete(load_all())
+        loop.close()
+
+        self.assertEqual([{'data': {'id': 'a'}}, {'data': {'id': 'b'}}, {'data': {'id': 'c'}}], results[:3])
+        self.assertIsInstance(results[3], errors.InvalidGraphQLNodeIDException)
+        self.assertEqual(2, buycoins_sdk.client.nodes.call_count, 'EVERY GRAPHQL TYPE SHOULD BE ONE QUERY')
+        self.assertEqual([1, 1], dispatching, 'THE LOADER SHOULD KEEP THE TASK OF A BATCH IT IS DISPATCHING')
+        self.assertEqual(set(), loader._async_tasks, 'THE TASK SHOULD BE DROPPED ONCE IT IS DONE')
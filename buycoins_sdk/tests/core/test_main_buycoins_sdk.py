@@ -1,12 +1,14 @@
 from unittest import TestCase, mock
-from buycoins_sdk import BuycoinsSDK, enums, types
+from buycoins_sdk import BuycoinsSDK, enums, errors, types
 from typing import List
 from .fixtures import *
 
 
 class TestMainBuycoinsSDK(TestCase):
     def setUp(self) -> None:
-        BuycoinsSDK.__init__ = mock.Mock(side_effect=lambda public_key, secret_key: None)
+        patcher = mock.patch.object(BuycoinsSDK, '__init__', mock.Mock(side_effect=lambda public_key, secret_key: None))
+        patcher.start()
+        self.addCleanup(patcher.stop)
         self.buycoins_sdk = BuycoinsSDK(public_key='test', secret_key='test')
         self.buycoins_sdk.client = mock.Mock()
 
@@ -143,6 +145,25 @@ class TestMainBuycoinsSDK(TestCase):
         self.assertIsInstance(result['data'], list, 'RESULT SHOULD BE A LIST')
         self.assertDictEqual(result, client_result_fixture, 'SHOULD RETURN RESULT FROM BuycoinsGraphqlClient')
 
+    def test_nodes_chunked(self):
+        def nodes(ids, gql_types, partial):
+            if 'failing id' in ids:
+                raise errors.BuycoinsException('error')
+            return {'data': [{} if node_id == 'wrong id' else {'id': node_id} for node_id in ids]}
+
+        self.buycoins_sdk.client.nodes.side_effect = nodes
+        ids = [str(i) for i in range(5)] + ['wrong id', 'failing id']
+        result = self.buycoins_sdk.nodes(ids=ids, gql_types=[enums.BuycoinsType.PAYMENT], partial=True, chunk_size=2)
+
+        self.assertEqual(4, self.buycoins_sdk.client.nodes.call_count, 'THE IDS SHOULD BE SENT IN CHUNKS')
+        self.assertEqual([{'id': str(i)} for i in range(5)] + [None, None], result['data'])
+        self.assertEqual(['wrong id', 'failing id'], result['failed_ids'])
+        self.assertIsInstance(result['errors']['wrong id'], errors.InvalidGraphQLNodeIDException)
+        self.assertIsInstance(result['errors']['failing id'], errors.BuycoinsException)
+
+        with self.assertRaises(errors.BuycoinsException):
+            self.buycoins_sdk.nodes(ids=ids, gql_types=[enums.BuycoinsType.PAYMENT], chunk_size=2)
+
     def test_buy(self):
         # prepare fixture
         client_result_fixture = {'data': order_fixture}
@@ -288,3 +309,16 @@ class TestMainBuycoinsSDK(TestCase):
 
         # test for Payment object
         self.assertTrue(result, 'should be True as is in fixture')
+
+    def test_handle_event(self):
+        request_body = {
+            'hook_id': 1,
+            'hook_key': 'hook key',
+            'hook_time': 1612759000,
+            'hook_signature': 'signature',
+            'payload': {'event': 'coins.incoming', 'data': {}}
+        }
+        result = self.buycoins_sdk.handle_event(request_body)
+
+        self.assertIsInstance(result, types.Event, 'RESULT SHOULD BE AN EVENT OBJECT')
+        self.buycoins_sdk.client.cache.invalidate_for_event.assert_called_once_with(enums.EventType.COINS_INCOMING)
@@ -0,0 +1,55 @@
+from decimal import Decimal
+from unittest import TestCase
+from buycoins_sdk import enums, types
+from buycoins_sdk.core import OrderBook
+from .fixtures import *
+
+
+def _post_order(order_id: str, side: str, price: str, amount: str, status: str = 'active') -> types.PostOrder:
+    return types.PostOrder.from_dict(dict(post_orders_fixture['orders']['edges'][0]['node'], id=order_id, side=side,
+                                          pricePerCoin=price, coinAmount=amount, status=status))
+
+
+class TestOrderBook(TestCase):
+    """This is the TestCase for the OrderBook class
+
+    """
+
+    def setUp(self) -> None:
+        self.order_book = OrderBook()
+        self.diffs = []
+        self.order_book.add_listener(self.diffs.append)
+        self.order_book.apply([_post_order('a', 'buy', '100', '1'), _post_order('b', 'buy', '101', '2'),
+                               _post_order('c', 'buy', '101', '0.5'), _post_order('d', 'sell', '105', '3'),
+                               _post_order('e', 'sell', '103', '1')])
+
+    def test_levels(self):
+        self.assertEqual((Decimal('101'), Decimal('2.5')), self.order_book.best_bid(), 'LEVELS SHOULD BE AGGREGATED')
+        self.assertEqual((Decimal('103'), Decimal('1')), self.order_book.best_ask())
+        self.assertEqual(Decimal('2'), self.order_book.spread())
+        self.assertEqual([Decimal('101'), Decimal('100')],
+                         [price for price, _ in self.order_book.depth(enums.OrderSide.BUY)])
+        self.assertEqual([(Decimal('103'), Decimal('1'))], self.order_book.depth(enums.OrderSide.SELL, levels=1))
+
+    def test_diff(self):
+        diff = self.order_book.apply(types.PostOrders.from_dict(dict(post_orders_fixture, orders=dict(
+            post_orders_fixture['orders'], edges=[
+                {'cursor': '0', 'node': dict(post_orders_fixture['orders']['edges'][0]['node'], **node)}
+                for node in ({'id': 'a', 'side': 'buy', 'pricePerCoin': '100', 'coinAmount': '1'},
+                             {'id': 'b', 'side': 'buy', 'pricePerCoin': '101', 'coinAmount': '1.5'},
+                             {'id': 'f', 'side': 'sell', 'pricePerCoin': '104', 'coinAmount': '2'})]))))
+
+        self.assertEqual(['f'], [post_order.id for post_order in diff.added])
+        self.assertEqual(['c', 'd', 'e'], sorted(post_order.id for post_order in diff.removed))
+        self.assertEqual(['b'], [post_order.id for post_order in diff.changed])
+        self.assertEqual([diff], self.diffs[1:], 'LISTENERS SHOULD GET THE DIFF')
+        self.assertEqual((Decimal('101'), Decimal('1.5')), self.order_book.best_bid())
+        self.assertEqual((Decimal('104'), Decimal('2')), self.order_book.best_ask())
+        self.assertEqual(3, len(self.order_book))
+        self.assertEqual(Decimal(0), self.order_book.amount_at(enums.OrderSide.SELL, '103'),
+                         'EMPTY LEVELS SHOULD BE REMOVED')
+
+    def test_unchanged(self):
+        diff = self.order_book.apply(list(map(self.order_book.get, 'abcde')))
+        self.assertFalse(diff)
+        self.assertEqual(1, len(self.diffs), 'LISTENERS SHOULD ONLY BE CALLED FOR CHANGES')
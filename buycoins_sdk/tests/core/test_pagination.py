@@ -0,0 +1,126 @@
+import asyncio
+import threading
+from unittest import TestCase, mock
+from buycoins_sdk import AsyncBuycoinsSDK, BuycoinsSDK, enums, errors
+from buycoins_sdk.core import main_buycoins_sdk
+from .fixtures import make_payment
+
+
+class Connection:
+    """Serves the pages of a connection of payments created at 0, 1, ... total - 1, like the API does"""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.calls = []
+
+    def __call__(self, after=None, before=None, first=None, last=None):
+        self.calls.append({'after': after, 'before': before, 'first': first, 'last': last})
+        if first is not None:
+            start = int(after) + 1 if after is not None else 0
+            end = min(self.total, start + first)
+        else:
+            end = int(before) if before is not None else self.total
+            start = max(0, end - last)
+        edges = [{'cursor': str(i), 'node': make_payment(i, type='deposit')} for i in range(start, end)]
+        return {'data': {
+            'edges': edges,
+            'pageInfo': {'startCursor': str(start), 'endCursor': str(end - 1), 'hasPreviousPage': start > 0,
+                         'hasNextPage': end < self.total}
+        }}
+
+
+class TestPagination(TestCase):
+    """This is the TestCase for the iter_* methods of BuycoinsSDK
+
+    """
+
+    def setUp(self) -> None:
+        self.buycoins_sdk = BuycoinsSDK(public_key='public_key', secret_key='secret_key')
+        self.buycoins_sdk.client = mock.Mock()
+        self.connection = Connection(total=7)
+        self.buycoins_sdk.client.get_payments.side_effect = self.connection
+
+    def test_forward(self):
+        payments = self.buycoins_sdk.iter_payments(page_size=3)
+        self.assertEqual(0, len(self.connection.calls), 'PAGES SHOULD ONLY BE FETCHED WHEN THEY ARE NEEDED')
+        self.assertEqual(list(range(7)), [payment.created_at for payment in payments])
+        self.assertEqual([None, '2', '5'], [call['after'] for call in self.connection.calls])
+
+    def test_backward(self):
+        payments = self.buycoins_sdk.iter_payments(page_size=3, direction=enums.PaginationDirection.BACKWARD)
+        self.assertEqual(list(range(6, -1, -1)), [payment.created_at for payment in payments])
+        self.assertEqual([None, '4', '1'], [call['before'] for call in self.connection.calls])
+
+    def test_until(self):
+        payments = self.buycoins_sdk.iter_payments(page_size=3, direction=enums.PaginationDirection.BACKWARD,
+                                                   until=lambda payment: payment.created_at < 5)
+        self.assertEqual([6, 5], [payment.created_at for payment in payments])
+        self.assertEqual(1, len(self.connection.calls), 'NO PAGE SHOULD BE FETCHED AFTER THE CUTOFF')
+
+    def test_prefetch(self):
+        fetched = threading.Semaphore(0)
+
+        def get_payments(**kwargs):
+            page = self.connection(**kwargs)
+            fetched.release()
+            return page
+
+        self.buycoins_sdk.client.get_payments.side_effect = get_payments
+        payments = self.buycoins_sdk.iter_payments(page_size=1, prefetch=2)
+        self.assertEqual(0, next(payments).created_at)
+        for _ in range(4):
+            self.assertTrue(fetched.acquire(timeout=1))
+        self.assertFalse(fetched.acquire(timeout=0.3), 'AT MOST prefetch PAGES SHOULD BE BUFFERED')
+        self.assertEqual(list(range(1, 7)), [payment.created_at for payment in payments])
+
+    def test_prefetch_error(self):
+        self.buycoins_sdk.client.get_payments.side_effect = errors.BuycoinsException('error')
+        with self.assertRaises(errors.BuycoinsException):
+            list(self.buycoins_sdk.iter_payments(prefetch=2))
+
+    def test_prefetch_closes_pages(self):
+        closed = threading.Event()
+
+        def pages():
+            try:
+                while True:
+                    yield [self.connection]
+            finally:
+                closed.set()
+
+        generator = pages()
+        prefetched = main_buycoins_sdk._prefetch(generator, 1)
+        next(prefetched)
+        prefetched.close()
+        self.assertTrue(closed.wait(timeout=1), 'THE PRODUCER SHOULD CLOSE THE PAGES IT FETCHES')
+
+    def test_prefetch_producer_died(self):
+        with mock.patch.object(main_buycoins_sdk.queue.Queue, 'put', side_effect=RuntimeError), \
+                mock.patch('threading.excepthook', create=True):
+            with self.assertRaises(errors.BuycoinsException, msg='THE CALLER SHOULD NOT WAIT FOR A DEAD PRODUCER'):
+                list(self.buycoins_sdk.iter_payments(prefetch=2))
+
+    def test_batch(self):
+        with self.assertRaises(errors.BuycoinsException):
+            self.buycoins_sdk.batch().iter_payments()
+
+    def test_async(self):
+        async def get_payments(**kwargs):
+            return self.connection(**kwargs)
+
+        buycoins_sdk = AsyncBuycoinsSDK(public_key='public_key', secret_key='secret_key')
+        buycoins_sdk.client = mock.Mock()
+        buycoins_sdk.client.get_payments = mock.Mock(side_effect=get_payments)
+
+        async def collect():
+            return [payment.created_at async for payment in buycoins_sdk.iter_payments(page_size=3)]
+
+        async def collect_prefetched():
+            return [payment.created_at async for payment in buycoins_sdk.iter_payments(
+                page_size=3, prefetch=1, direction=enums.PaginationDirection.BACKWARD,
+                until=lambda payment: payment.created_at < 2)]
+
+        loop = asyncio.new_event_loop()
+        self.assertEqual(list(range(7)), loop.run_until_complete(collect()))
+        self.assertEqual([6, 5, 4, 3, 2], loop.run_until_complete(collect_prefetched()))
+        loop.close()
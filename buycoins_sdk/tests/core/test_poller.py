@@ -0,0 +1,104 @@
+import asyncio
+from unittest import TestCase, mock
+from buycoins_sdk import AsyncBuycoinsSDK, BuycoinsSDK, enums
+from .fixtures import *
+
+
+def _market_book(*amounts, expiry: int = 1612756694) -> dict:
+    return {'data': dict(post_orders_fixture, dynamicPriceExpiry=expiry, orders=dict(
+        post_orders_fixture['orders'], pageInfo=dict(post_orders_fixture['orders']['pageInfo'], hasNextPage=False),
+        edges=[{'cursor': str(i), 'node': dict(post_orders_fixture['orders']['edges'][0]['node'], id=str(i),
+                                               coinAmount=amount)}
+               for i, amount in enumerate(amounts)]))}
+
+
+class TestMarketBookPoller(TestCase):
+    """This is the TestCase for the MarketBookPoller class
+
+    """
+
+    def setUp(self) -> None:
+        self.buycoins_sdk = BuycoinsSDK(public_key='public_key', secret_key='secret_key')
+        self.buycoins_sdk.client = mock.Mock()
+        self.clock = Clock(1612756000.0)
+        self.poller = self.buycoins_sdk.market_book_poller(min_interval=1, max_interval=31, smoothing=0.5,
+                                                           clock=self.clock)
+
+    def test_change_detection(self):
+        self.buycoins_sdk.client.get_market_book.return_value = _market_book('0.1', '0.2')
+        self.assertEqual(2, len(self.poller.poll().added))
+
+        with mock.patch('buycoins_sdk.core.types.PostOrders.from_dict') as from_dict:
+            self.assertFalse(self.poller.poll())
+            from_dict.assert_not_called()
+        self.assertEqual(1, self.poller.skipped)
+
+        self.buycoins_sdk.client.get_market_book.return_value = _market_book('0.1', '0.3')
+        diff = self.poller.poll()
+        self.assertEqual(['1'], [post_order.id for post_order in diff.changed])
+        self.assertEqual('0.3', self.poller.order_book.get('1').coin_amount)
+
+    def test_unchanged_orders_skip_conversion(self):
+        self.buycoins_sdk.client.get_market_book.return_value = _market_book('0.1', '0.2')
+        self.poller.poll()
+        self.buycoins_sdk.client.get_market_book.return_value = _market_book('0.1', '0.2', expiry=1612756999)
+        with mock.patch('buycoins_sdk.core.types.PostOrders.from_dict') as from_dict:
+            self.assertFalse(self.poller.poll(), 'A NEW EXPIRY ALONE SHOULD NOT CHANGE THE BOOK')
+            from_dict.assert_not_called()
+
+    def test_expiry_formats(self):
+        for expiry in [int(self.clock.now * 1000) + 5000, '2021-02-08T03:46:45Z', '2021-02-08T04:46:45.000+01:00',
+                       str(int(self.clock.now) + 5)]:
+            self.buycoins_sdk.client.get_market_book.return_value = _market_book('0.1', expiry=expiry)
+            self.poller.poll()
+            self.poller.poll()
+            self.assertEqual(5, self.poller.interval, f"{expiry} SHOULD BE 5 SECONDS AWAY")
+
+        self.buycoins_sdk.client.get_market_book.return_value = _market_book('0.1', expiry='soon')
+        self.poller.poll()
+        self.assertLess(5, self.poller.interval, 'AN EXPIRY WHICH CAN NOT BE PARSED SHOULD BE IGNORED')
+
+    def test_interval(self):
+        self.buycoins_sdk.client.get_market_book.return_value = _market_book('0.1')
+        self.poller.poll()
+        self.assertEqual(1, self.poller.interval, 'A BUSY BOOK SHOULD BE POLLED OFTEN')
+        self.poller.poll()
+        self.poller.poll()
+        self.assertEqual(23.5, self.poller.interval, 'A QUIET BOOK SHOULD BE POLLED LESS OFTEN')
+
+        self.buycoins_sdk.client.get_market_book.return_value = _market_book('0.2', expiry=int(self.clock.now) + 5)
+        self.poller.poll()
+        self.assertEqual(5, self.poller.interval, 'THE BOOK SHOULD BE POLLED WHEN DYNAMIC PRICES EXPIRE')
+
+    def test_stream(self):
+        self.buycoins_sdk.client.get_market_book.side_effect = [_market_book('0.1'), _market_book('0.1'),
+                                                               _market_book('0.2')]
+        sleeps = []
+        self.poller._sleep = sleeps.append
+        stream = self.poller.stream()
+        self.assertEqual(1, len(next(stream).added))
+        self.assertEqual(1, len(next(stream).changed), 'UNCHANGED POLLS SHOULD NOT BE YIELDED')
+        self.assertEqual(2, len(sleeps))
+        stream.close()
+
+    def test_stream_async(self):
+        async def get_market_book(**kwargs):
+            return _market_book('0.1', '0.2')
+
+        buycoins_sdk = AsyncBuycoinsSDK(public_key='public_key', secret_key='secret_key')
+        buycoins_sdk.client = mock.Mock()
+        buycoins_sdk.client.get_market_book = mock.Mock(side_effect=get_market_book)
+        poller = buycoins_sdk.market_book_poller(enums.Cryptocurrency.ETHEREUM)
+
+        async def first_diff():
+            stream = poller.stream_async()
+            diff = await stream.__anext__()
+            await stream.aclose()
+            return diff
+
+        loop = asyncio.new_event_loop()
+        diff = loop.run_until_complete(first_diff())
+        loop.close()
+        self.assertEqual(2, len(diff.added))
+        buycoins_sdk.client.get_market_book.assert_called_once_with(first=100, after=None,
+                                                                   cryptocurrency=enums.Cryptocurrency.ETHEREUM)
@@ -0,0 +1,118 @@
+import asyncio
+import threading
+from unittest import TestCase, mock
+from buycoins_sdk import AsyncBuycoinsSDK, BuycoinsSDK, enums, errors
+from buycoins_sdk.core import PriceCache, types
+from .fixtures import Clock
+
+NOW = 1612759000
+
+
+def _price(cryptocurrency: str, expires_at: int, status: str = 'active', price_id: str = None) -> dict:
+    return {
+        'buyPricePerCoin': '17779805.68',
+        'cryptocurrency': cryptocurrency,
+        'expiresAt': expires_at,
+        'id': price_id or f"{cryptocurrency}-{expires_at}",
+        'maxBuy': '0.00768501',
+        'maxSell': '4.98935757',
+        'minBuy': '0.001',
+        'minCoinAmount': '0.001',
+        'minSell': '0.001',
+        'sellPricePerCoin': '17427685.275',
+        'status': status
+    }
+
+
+class TestPriceCache(TestCase):
+    """This is the TestCase for the PriceCache class and BuycoinsSDK.quote
+
+    """
+
+    def setUp(self) -> None:
+        self.clock = Clock(NOW)
+        self.fetched = threading.Event()
+
+        def fetch():
+            self.fetched.set()
+            return [types.BuycoinsPrice.from_dict(_price(coin, self.clock.now + 60))
+                    for coin in ('bitcoin', 'ethereum')]
+
+        self.fetch = mock.Mock(side_effect=fetch)
+        self.cache = PriceCache(fetch=self.fetch, safety_margin=5, refresh_ahead=15, clock=self.clock)
+
+    def test_live_price_is_cached(self):
+        price = self.cache.get(enums.Cryptocurrency.BITCOIN)
+        self.assertEqual(f"bitcoin-{NOW + 60}", price.id)
+        self.assertIs(price, self.cache.get(enums.Cryptocurrency.BITCOIN))
+        self.cache.get(enums.Cryptocurrency.ETHEREUM)
+        self.fetch.assert_called_once_with()
+
+    def test_refresh_ahead_of_expiry(self):
+        price = self.cache.get(enums.Cryptocurrency.BITCOIN)
+        self.fetched.clear()
+
+        self.clock.now += 45
+        self.assertIs(price, self.cache.get(enums.Cryptocurrency.BITCOIN), 'SHOULD NOT WAIT FOR THE REFRESH')
+        self.assertTrue(self.fetched.wait(1), 'SHOULD REFRESH IN THE BACKGROUND')
+        self.assertEqual(2, self.fetch.call_count)
+
+        self.clock.now += 60
+        self.assertEqual(f"bitcoin-{self.clock.now + 60}", self.cache.get(enums.Cryptocurrency.BITCOIN).id)
+
+    def test_price_within_safety_margin_is_not_live(self):
+        self.cache.update([types.BuycoinsPrice.from_dict(_price('bitcoin', NOW + 4))])
+        self.assertIsNone(self.cache.peek(enums.Cryptocurrency.BITCOIN))
+        self.cache.update([types.BuycoinsPrice.from_dict(_price('litecoin', NOW + 60, status='expired'))])
+        self.assertIsNone(self.cache.peek(enums.Cryptocurrency.LITECOIN))
+
+        with self.assertRaises(errors.BuycoinsException):
+            self.cache.get(enums.Cryptocurrency.LITECOIN)
+
+    def test_sdk_shares_one_cache(self):
+        buycoins_sdk = BuycoinsSDK(public_key='test', secret_key='test')
+        caches = []
+        threads = [threading.Thread(target=lambda: caches.append(buycoins_sdk.price_cache)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(1, len({id(cache) for cache in caches}), 'EVERY THREAD SHOULD GET THE SAME CACHE')
+        self.assertIs(buycoins_sdk.price_cache, buycoins_sdk.with_options(timeout=1).price_cache,
+                      'A COPY OF THE SDK SHOULD SHARE ITS CACHE')
+
+    def test_sdk_quote(self):
+        with mock.patch.object(BuycoinsSDK, '__init__', mock.Mock(side_effect=lambda public_key, secret_key: None)):
+            buycoins_sdk = BuycoinsSDK(public_key='test', secret_key='test')
+        buycoins_sdk.client = mock.Mock()
+        buycoins_sdk.client.get_prices.return_value = {'data': [_price('bitcoin', 2 ** 40), _price('ethereum', 2 ** 40)]}
+
+        self.assertEqual(f"bitcoin-{2 ** 40}", buycoins_sdk.quote(enums.Cryptocurrency.BITCOIN).id)
+        self.assertEqual(f"ethereum-{2 ** 40}", buycoins_sdk.quote(enums.Cryptocurrency.ETHEREUM).id)
+        buycoins_sdk.client.get_prices.assert_called_once_with()
+
+        buycoins_sdk.client.get_prices.return_value = {'data': [_price('bitcoin', 2 ** 41)]}
+        buycoins_sdk.get_prices(enums.Cryptocurrency.BITCOIN)
+        self.assertEqual(f"bitcoin-{2 ** 41}", buycoins_sdk.quote(enums.Cryptocurrency.BITCOIN).id,
+                         'get_prices SHOULD FILL THE CACHE')
+
+        with self.assertRaises(errors.BuycoinsException):
+            buycoins_sdk.batch().quote(enums.Cryptocurrency.BITCOIN)
+
+    def test_async_sdk_quote(self):
+        async def get_prices(*args, **kwargs):
+            return {'data': [_price('bitcoin', 2 ** 40), _price('ethereum', 2 ** 40)]}
+
+        async def quote_many():
+            return await asyncio.gather(*[buycoins_sdk.quote(enums.Cryptocurrency.BITCOIN) for _ in range(5)])
+
+        loop = asyncio.new_event_loop()
+        buycoins_sdk = AsyncBuycoinsSDK(public_key='test', secret_key='test')
+        buycoins_sdk.client = mock.Mock()
+        buycoins_sdk.client.get_prices = mock.Mock(side_effect=get_prices)
+        prices = loop.run_until_complete(quote_many())
+        loop.close()
+
+        self.assertEqual({f"bitcoin-{2 ** 40}"}, {price.id for price in prices})
+        buycoins_sdk.client.get_prices.assert_called_once_with()
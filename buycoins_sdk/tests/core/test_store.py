@@ -0,0 +1,68 @@
+import os
+import tempfile
+from unittest import TestCase, mock
+from buycoins_sdk import BuycoinsSDK, enums, types
+from buycoins_sdk.core import SQLiteStore
+from .fixtures import *
+
+
+def _payment(node_id: str, amount: str, created_at: int, payment_type: str = 'withdrawal') -> dict:
+    return dict(payment_fixture, id=node_id, amount=amount, createdAt=created_at, type=payment_type)
+
+
+class TestSQLiteStore(TestCase):
+    """This is the TestCase for the SQLiteStore class and its use by BuycoinsSDK
+
+    """
+
+    def setUp(self) -> None:
+        self.store = SQLiteStore()
+        self.buycoins_sdk = BuycoinsSDK(public_key='public_key', secret_key='secret_key', store=self.store)
+        self.buycoins_sdk.client = mock.Mock()
+
+    def tearDown(self) -> None:
+        self.store.close()
+
+    def test_payments(self):
+        self.store.upsert([types.Payment.from_dict(_payment('a', '100.0', 10)),
+                           types.Payment.from_dict(_payment('b', '5000.0', 20)),
+                           types.Payment.from_dict(_payment('c', '9000.0', 30, 'deposit'))])
+        self.store.upsert(types.Payment.from_dict(_payment('a', '7000.0', 10)))
+
+        payments = self.store.payments(payment_type=enums.PaymentTypes.WITHDRAWAL, min_amount=1000)
+        self.assertEqual(['a', 'b'], [payment.id for payment in payments], 'AN UPSERT SHOULD REPLACE THE NODE')
+        self.assertIsInstance(payments[0], types.Payment, 'RESULT SHOULD CONTAIN ONLY Payment OBJECTS')
+        self.assertEqual(enums.PaymentStatus.SUCCESS, payments[0].status)
+        self.assertEqual(['b'], [payment.id for payment in self.store.payments(since=15, until=30)])
+        self.assertEqual(['a'], [payment.id for payment in self.store.payments(limit=1)])
+
+    def test_sdk_results(self):
+        self.buycoins_sdk.client.get_market_book.return_value = {'data': post_orders_fixture}
+        self.buycoins_sdk.client.buy.return_value = {'data': order_fixture}
+        self.buycoins_sdk.client.send.return_value = {'data': onchain_transfer_request_fixture}
+        self.buycoins_sdk.client.get_balances.return_value = {'data': [account_fixture]}
+        self.buycoins_sdk.get_market_book()
+        self.buycoins_sdk.buy(price_id='price_id', coin_amount='0.01')
+        self.buycoins_sdk.send(cryptocurrency=enums.Cryptocurrency.BITCOIN, amount='0.01', address='address')
+        self.buycoins_sdk.get_balances()
+
+        post_orders = self.store.post_orders(cryptocurrency=enums.Cryptocurrency.BITCOIN)
+        self.assertEqual(len(post_orders_fixture['orders']['edges']), len(post_orders))
+        order, = self.store.orders(side=enums.OrderSide.SELL, status=enums.OrderStatus.DONE)
+        self.assertEqual(order_fixture['price']['id'], order.price.id, 'NESTED PRICES SHOULD BE KEPT')
+        self.assertIsInstance(self.store.onchain_transfer_requests()[0], types.OnchainTransferRequest)
+
+    def test_handle_event(self):
+        self.buycoins_sdk.handle_event(dict(event_fixture, payload={'event': 'bank_deposit.incoming',
+                                                                    'data': _payment('a', '100.0', 10, 'deposit')}))
+        self.buycoins_sdk.handle_event(dict(event_fixture, payload={'event': 'order.failed', 'data': {'id': 'b'}}))
+        self.assertEqual(['a'], [payment.id for payment in self.store.payments()])
+        self.assertEqual([], self.store.orders(), 'INCOMPLETE NODES SHOULD BE IGNORED')
+
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'buycoins.db')
+            with SQLiteStore(path) as store:
+                store.upsert(types.Payment.from_dict(payment_fixture))
+            with SQLiteStore(path) as store:
+                self.assertEqual([payment_fixture['id']], [payment.id for payment in store.payments()])
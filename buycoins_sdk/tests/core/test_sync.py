@@ -0,0 +1,128 @@
+import asyncio
+import os
+import tempfile
+from unittest import TestCase, mock
+from buycoins_sdk import AsyncBuycoinsSDK, BuycoinsSDK, enums, errors
+from buycoins_sdk.core import FileCheckpointStore
+from .fixtures import make_payment
+
+
+class Ledger:
+    """Serves the getPayments connection and the nodes of a list of payments, like the API does"""
+
+    def __init__(self, payments):
+        self.payments = payments
+        self.calls = []
+
+    def get_payments(self, after=None, before=None, first=None, last=None):
+        self.calls.append(after)
+        start = int(after) + 1 if after is not None else 0
+        end = min(len(self.payments), start + first)
+        return {'data': {
+            'edges': [{'cursor': str(i), 'node': self.payments[i]} for i in range(start, end)],
+            'pageInfo': {'startCursor': str(start), 'endCursor': str(end - 1), 'hasPreviousPage': start > 0,
+                         'hasNextPage': end < len(self.payments)}
+        }}
+
+    def nodes(self, ids, gql_types, partial=False):
+        by_id = {payment['id']: payment for payment in self.payments}
+        return {'data': [by_id.get(node_id) for node_id in ids]}
+
+
+class TestPaymentSync(TestCase):
+    """This is the TestCase for the PaymentSync class
+
+    """
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'checkpoint.json')
+        self.ledger = Ledger([make_payment(0), make_payment(1, 'pending'), make_payment(2)])
+        self.buycoins_sdk = BuycoinsSDK(public_key='public_key', secret_key='secret_key')
+        self.buycoins_sdk.client = mock.Mock()
+        self.buycoins_sdk.client.get_payments.side_effect = self.ledger.get_payments
+        self.buycoins_sdk.client.nodes.side_effect = self.ledger.nodes
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_sync(self):
+        result = self.buycoins_sdk.payment_sync(self.path, page_size=2).sync()
+        self.assertEqual(['payment-0', 'payment-1', 'payment-2'], [payment.id for payment in result.new])
+        self.assertEqual([], result.updated)
+        checkpoint = FileCheckpointStore(self.path).load()
+        self.assertEqual('2', checkpoint.cursor)
+        self.assertEqual({'payment-1': 'pending'}, checkpoint.pending)
+
+        self.ledger.payments[1] = make_payment(1, 'success')
+        self.ledger.payments.append(make_payment(3))
+        del self.ledger.calls[:]
+        result = self.buycoins_sdk.payment_sync(self.path, page_size=2).sync()
+        self.assertEqual(['2'], self.ledger.calls, 'ONLY PAYMENTS AFTER THE CHECKPOINT SHOULD BE FETCHED')
+        self.assertEqual(['payment-3'], [payment.id for payment in result.new])
+        self.assertEqual([enums.PaymentStatus.SUCCESS], [payment.status for payment in result.updated])
+        self.assertEqual({}, FileCheckpointStore(self.path).load().pending)
+
+    def test_nothing_new(self):
+        payment_sync = self.buycoins_sdk.payment_sync(self.path)
+        payment_sync.sync()
+        result = payment_sync.sync()
+        self.assertEqual(([], []), result)
+        self.assertEqual('2', FileCheckpointStore(self.path).load().cursor, 'AN EMPTY PAGE SHOULD KEEP THE CURSOR')
+
+    def test_resume_after_error(self):
+        def get_payments(after=None, **kwargs):
+            if after is not None:
+                raise errors.BuycoinsException('error')
+            return self.ledger.get_payments(after=after, **kwargs)
+
+        self.buycoins_sdk.client.get_payments.side_effect = get_payments
+        with self.assertRaises(errors.BuycoinsException):
+            self.buycoins_sdk.payment_sync(self.path, page_size=2).sync()
+        self.assertEqual('1', FileCheckpointStore(self.path).load().cursor, 'FETCHED PAGES SHOULD BE CHECKPOINTED')
+
+        self.buycoins_sdk.client.get_payments.side_effect = self.ledger.get_payments
+        result = self.buycoins_sdk.payment_sync(self.path, page_size=2).sync()
+        self.assertEqual(['payment-2'], [payment.id for payment in result.new])
+
+    def test_sync_async(self):
+        async def get_payments(**kwargs):
+            return self.ledger.get_payments(**kwargs)
+
+        async def nodes(**kwargs):
+            return self.ledger.nodes(**kwargs)
+
+        buycoins_sdk = AsyncBuycoinsSDK(public_key='public_key', secret_key='secret_key')
+        buycoins_sdk.client = mock.Mock()
+        buycoins_sdk.client.get_payments = mock.Mock(side_effect=get_payments)
+        buycoins_sdk.client.nodes = mock.Mock(side_effect=nodes)
+        payment_sync = buycoins_sdk.payment_sync(self.path)
+
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(payment_sync.sync_async())
+        self.ledger.payments[1] = make_payment(1, 'failed')
+        result = loop.run_until_complete(payment_sync.sync_async())
+        loop.close()
+
+        self.assertEqual([], result.new)
+        self.assertEqual(['payment-1'], [payment.id for payment in result.updated])
+
+    def test_concurrent_sync_async(self):
+        async def get_payments(**kwargs):
+            await asyncio.sleep(0)
+            return self.ledger.get_payments(**kwargs)
+
+        buycoins_sdk = AsyncBuycoinsSDK(public_key='public_key', secret_key='secret_key')
+        buycoins_sdk.client = mock.Mock()
+        buycoins_sdk.client.get_payments = mock.Mock(side_effect=get_payments)
+        payment_sync = buycoins_sdk.payment_sync(self.path)
+
+        async def sync_twice():
+            return await asyncio.gather(payment_sync.sync_async(), payment_sync.sync_async())
+
+        loop = asyncio.new_event_loop()
+        results = loop.run_until_complete(sync_twice())
+        loop.close()
+
+        self.assertEqual([3, 0], [len(result.new) for result in results], 'CONCURRENT SYNCS SHOULD RUN ONE AT A TIME')
+        self.assertEqual([None, '2'], self.ledger.calls)